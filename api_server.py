@@ -0,0 +1,372 @@
+"""
+祝日サービスをJSONで返すローカルのHTTP API
+
+画面と同じサービス層（と共通のキャッシュ）を使うため、cronジョブや他のサービスが
+Nager.Date APIを直接呼ばずに、1つのキャッシュを共有できる。
+レスポンスはURLごとにキャッシュし、gzip圧縮とETagによる304 Not Modifiedに対応する。
+
+エンドポイント:
+    GET /holidays/{年}/{国コード}                   祝日一覧
+    GET /is-holiday/{国コード}?date=YYYY-MM-DD      祝日かの判定
+        （dateを省略すると今日。offset=UTCからの時間, subdivision=州・県のコード）
+    GET /next/{国コード}                            今後の祝日
+    GET /favorites/stats                            お気に入りの統計
+    GET /cache/stats                                キャッシュの統計
+
+使い方:
+    python api_server.py [--host 127.0.0.1] [--port 8000] [--verbose]
+"""
+
+import argparse
+import dataclasses
+import gzip
+import hashlib
+import json
+import re
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from urllib.parse import parse_qsl, urlsplit
+import requests
+from services import favorite_service, holiday_service
+from services.cache import ApiCache, api_cache, http_negative_cause
+from constants import (
+    YEAR_MIN,
+    YEAR_MAX,
+    API_SERVER_HOST,
+    API_SERVER_PORT,
+    API_SERVER_CACHE_TTL,
+    API_SERVER_CACHE_MAX_ENTRIES,
+    API_SERVER_CACHE_MAX_BYTES,
+    API_SERVER_GZIP_MIN_BYTES,
+)
+
+
+class ApiError(Exception):
+    """リクエストが不正な場合の例外（HTTPステータスコードを持つ）"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiResponse(NamedTuple):
+    """エンコード済みのレスポンス（キャッシュから参照渡しで共有する）"""
+
+    status: int
+    body: bytes
+    gzip_body: Optional[bytes]  # 小さいレスポンスは圧縮しない
+    etag: str
+    max_age: int
+
+
+class Route(NamedTuple):
+    """エンドポイントの定義"""
+
+    pattern: "re.Pattern[str]"
+    handler: Callable[[Dict[str, str], Dict[str, str]], Any]
+    cacheable: bool = True
+
+
+# レスポンスのキャッシュ（URLごとのエンコード済みのJSON）
+response_cache = ApiCache(
+    ttl=API_SERVER_CACHE_TTL,
+    max_entries=API_SERVER_CACHE_MAX_ENTRIES,
+    max_bytes=API_SERVER_CACHE_MAX_BYTES,
+)
+
+
+def holiday_to_dict(holiday) -> dict:
+    """祝日をJSON用の辞書に変換する"""
+    return dataclasses.asdict(holiday)
+
+
+def parse_country_code(value: str) -> str:
+    """国コードを検証して大文字にする"""
+    if not re.fullmatch(r"[A-Za-z]{2}", value):
+        raise ApiError(400, f"invalid country code: {value}")
+    return value.upper()
+
+
+def parse_date(value: str) -> date:
+    """YYYY-MM-DD形式の日付を解析する"""
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(400, f"invalid date: {value}")
+    if not YEAR_MIN <= day.year <= YEAR_MAX:
+        raise ApiError(400, f"year must be within {YEAR_MIN}-{YEAR_MAX}")
+    return day
+
+
+def get_holidays(params: Dict[str, str], query: Dict[str, str]) -> List[dict]:
+    """GET /holidays/{年}/{国コード}"""
+    year = int(params["year"])
+    if not YEAR_MIN <= year <= YEAR_MAX:
+        raise ApiError(400, f"year must be within {YEAR_MIN}-{YEAR_MAX}")
+    country_code = parse_country_code(params["country_code"])
+    return [
+        holiday_to_dict(h)
+        for h in holiday_service.get_public_holidays(year, country_code)
+    ]
+
+
+def get_is_holiday(params: Dict[str, str], query: Dict[str, str]) -> dict:
+    """GET /is-holiday/{国コード}"""
+    country_code = parse_country_code(params["country_code"])
+    subdivision = query.get("subdivision")
+    if "date" in query:
+        day = parse_date(query["date"])
+        is_holiday = holiday_service.is_public_holiday(country_code, day, subdivision)
+        return {
+            "country_code": country_code,
+            "date": day.isoformat(),
+            "is_holiday": is_holiday,
+        }
+
+    try:
+        offset = int(query.get("offset", "0"))
+        is_holiday = holiday_service.is_today_public_holiday(
+            country_code, offset, subdivision
+        )
+    except ValueError as e:
+        raise ApiError(400, str(e))
+    return {"country_code": country_code, "offset": offset, "is_holiday": is_holiday}
+
+
+def get_next_holidays(params: Dict[str, str], query: Dict[str, str]) -> List[dict]:
+    """GET /next/{国コード}"""
+    country_code = parse_country_code(params["country_code"])
+    return [
+        holiday_to_dict(h)
+        for h in holiday_service.get_next_public_holidays(country_code)
+    ]
+
+
+def get_favorites_stats(params: Dict[str, str], query: Dict[str, str]) -> dict:
+    """GET /favorites/stats"""
+    stats = favorite_service.get_favorites_statistics(favorite_service.load_favorites())
+    if not stats:
+        return {
+            "total_holidays": 0,
+            "total_countries": 0,
+            "most_month": None,
+            "countries": {},
+            "months": {},
+            "years": {},
+        }
+    return {
+        "total_holidays": stats["total_holidays"],
+        "total_countries": stats["total_countries"],
+        "most_month": int(stats["most_month"]),
+        "countries": {str(k): int(v) for k, v in stats["country_stats"].items()},
+        "months": {str(k): int(v) for k, v in stats["month_stats"].items()},
+        "years": {str(k): int(v) for k, v in stats["year_stats"].items()},
+    }
+
+
+def get_cache_stats(params: Dict[str, str], query: Dict[str, str]) -> dict:
+    """GET /cache/stats"""
+    return {"api_cache": api_cache.stats(), "response_cache": response_cache.stats()}
+
+
+ROUTES = [
+    Route(
+        re.compile(r"/holidays/(?P<year>\d{4})/(?P<country_code>[^/]+)"), get_holidays
+    ),
+    Route(re.compile(r"/is-holiday/(?P<country_code>[^/]+)"), get_is_holiday),
+    Route(re.compile(r"/next/(?P<country_code>[^/]+)"), get_next_holidays),
+    Route(re.compile(r"/favorites/stats"), get_favorites_stats),
+    Route(re.compile(r"/cache/stats"), get_cache_stats, cacheable=False),
+]
+
+
+def encode_response(status: int, payload: Any, max_age: int = 0) -> ApiResponse:
+    """
+    JSONをエンコードし、大きいレスポンスはgzipで圧縮しておく
+
+    Args:
+        status: HTTPステータスコード
+        payload: JSONに変換する値
+        max_age: Cache-Controlのmax-age（秒）
+
+    Returns:
+        ApiResponse: エンコード済みのレスポンス
+    """
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+    gzip_body = None
+    if len(body) >= API_SERVER_GZIP_MIN_BYTES:
+        gzip_body = gzip.compress(body, compresslevel=6)
+    etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+    return ApiResponse(status, body, gzip_body, etag, max_age)
+
+
+def error_response(error: Exception) -> ApiResponse:
+    """例外をエラーのレスポンスに変換する"""
+    if isinstance(error, ApiError):
+        return encode_response(error.status, {"error": str(error)})
+    if isinstance(error, requests.RequestException):
+        # 不正な年・存在しない国はAPIと同じステータスを返す
+        cause = http_negative_cause(error)
+        status = error.response.status_code if cause is not None else 502
+        return encode_response(status, {"error": str(error)})
+    return encode_response(500, {"error": "internal server error"})
+
+
+def get_response(target: str) -> ApiResponse:
+    """
+    リクエストのパスに対するレスポンスを取得する（キャッシュあり）
+
+    同じURL（国コードの大文字・小文字とクエリの順番は区別しない）への
+    同時のリクエストは、1回だけサービスを呼んで結果を共有する。
+
+    Args:
+        target: リクエストのパス（クエリを含む）
+
+    Returns:
+        ApiResponse: エンコード済みのレスポンス
+    """
+    url = urlsplit(target)
+    path = url.path.rstrip("/") or "/"
+    query = dict(parse_qsl(url.query))
+
+    for route in ROUTES:
+        match = route.pattern.fullmatch(path)
+        if match is None:
+            continue
+        params = match.groupdict()
+
+        def load() -> ApiResponse:
+            return encode_response(
+                200, route.handler(params, query), API_SERVER_CACHE_TTL
+            )
+
+        try:
+            if not route.cacheable:
+                return encode_response(200, route.handler(params, query))
+            key = "|".join(
+                [route.handler.__name__, *(v.upper() for v in params.values())]
+                + [f"{k}={v}" for k, v in sorted(query.items())]
+            )
+            return response_cache.get_or_load(key, load)
+        except Exception as e:
+            return error_response(e)
+
+    return encode_response(404, {"error": f"not found: {path}"})
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Accept-Encodingヘッダーでgzipが受け入れられるか判定する"""
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        # q=0は受け入れないことを表す
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        return quality > 0
+    return False
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    """HTTPリクエストを処理するハンドラ（接続ごとのスレッドで実行される）"""
+
+    protocol_version = "HTTP/1.1"  # 接続を使い回せるようにする
+    # ヘッダーと本文を別々に送るため、Nagleアルゴリズムで遅延しないようにする
+    disable_nagle_algorithm = True
+    server_version = "HolidayApi/1.0"
+    log_requests = False
+
+    def do_GET(self) -> None:
+        response = get_response(self.path)
+        if response.status == 200 and response.etag == self.headers.get(
+            "If-None-Match"
+        ):
+            self.send_response(304)
+            self._send_cache_headers(response)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = response.body
+        use_gzip = response.gzip_body is not None and accepts_gzip(
+            self.headers.get("Accept-Encoding")
+        )
+        if use_gzip:
+            body = response.gzip_body
+
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        if response.gzip_body is not None:
+            self.send_header("Vary", "Accept-Encoding")
+        self._send_cache_headers(response)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_cache_headers(self, response: ApiResponse) -> None:
+        """キャッシュ用のヘッダーを送る"""
+        if response.status != 200:
+            return
+        self.send_header("ETag", response.etag)
+        if response.max_age:
+            self.send_header("Cache-Control", f"max-age={response.max_age}")
+        else:
+            self.send_header("Cache-Control", "no-cache")
+
+    def log_message(self, format: str, *args) -> None:
+        if self.log_requests:
+            super().log_message(format, *args)
+
+
+def create_server(
+    host: str = API_SERVER_HOST, port: int = API_SERVER_PORT
+) -> ThreadingHTTPServer:
+    """
+    HTTPサーバーを作成する（port=0の場合は空いているポートを使う）
+
+    Args:
+        host: 待ち受けるアドレス
+        port: 待ち受けるポート
+
+    Returns:
+        ThreadingHTTPServer: リクエストを並行して処理するサーバー
+    """
+    server = ThreadingHTTPServer((host, port), ApiRequestHandler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="祝日サービスのローカルHTTP API")
+    parser.add_argument("--host", default=API_SERVER_HOST, help="待ち受けるアドレス")
+    parser.add_argument(
+        "--port", type=int, default=API_SERVER_PORT, help="待ち受けるポート"
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="リクエストごとにログを出す"
+    )
+    args = parser.parse_args(argv)
+    ApiRequestHandler.log_requests = args.verbose
+
+    server = create_server(args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"http://{host}:{port} で待ち受けています（Ctrl+Cで終了）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
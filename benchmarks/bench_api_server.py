@@ -0,0 +1,131 @@
+"""
+ローカルHTTP APIの負荷試験
+
+合成した祝日一覧をキャッシュに入れてサーバーを起動し、複数のクライアント
+（接続を使い回すスレッド）からエンドポイントを混ぜてリクエストを送る。
+スループット、レイテンシのパーセンタイル、gzipで減った転送量、
+レスポンスのキャッシュのヒット率を表示する。API通信は行わない。
+
+使い方:
+    python -m benchmarks.bench_api_server [リクエスト数] [並行数]
+"""
+
+import gzip
+import http.client
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from api_server import create_server, response_cache
+from models import Holiday
+from services.cache import api_cache
+from services.holiday_index import holiday_index
+
+COUNTRY_COUNT = 50
+YEARS = range(2020, 2031)
+HOLIDAYS_PER_YEAR = 15
+SEED = 0
+
+
+def seed_caches() -> None:
+    """合成した祝日一覧をキャッシュとインデックスに入れる"""
+    for i in range(COUNTRY_COUNT):
+        country_code = f"{chr(65 + i // 26)}{chr(65 + i % 26)}"
+        for year in YEARS:
+            holidays = tuple(
+                Holiday(
+                    date=(
+                        date(year, 1, 1) + timedelta(days=(i + j * 23) % 365)
+                    ).isoformat(),
+                    name=f"Holiday {j}",
+                    local_name=f"祝日 {j}",
+                    country_code=country_code,
+                )
+                for j in range(HOLIDAYS_PER_YEAR)
+            )
+            api_cache.set(f"PublicHolidays/{year}/{country_code}", holidays)
+            holiday_index.add_holidays(year, country_code, holidays)
+
+
+def make_targets(n: int) -> list:
+    """リクエストするURLを作成（祝日一覧7割、祝日の判定2割、今後の祝日1割）"""
+    rng = random.Random(SEED)
+    targets = []
+    for _ in range(n):
+        i = rng.randrange(COUNTRY_COUNT)
+        country_code = f"{chr(65 + i // 26)}{chr(65 + i % 26)}"
+        kind = rng.random()
+        if kind < 0.7:
+            targets.append(f"/holidays/{rng.choice(YEARS)}/{country_code}")
+        elif kind < 0.9:
+            day = date(rng.choice(YEARS), 1, 1) + timedelta(days=rng.randrange(365))
+            targets.append(f"/is-holiday/{country_code}?date={day.isoformat()}")
+        else:
+            targets.append(f"/next/{country_code}")
+    return targets
+
+
+def run_client(address: tuple, targets: list) -> tuple:
+    """1つの接続でリクエストを順に送り、レイテンシと転送量（圧縮後・圧縮前）を返す"""
+    connection = http.client.HTTPConnection(*address)
+    latencies, sent_bytes, raw_bytes = [], 0, 0
+    for target in targets:
+        start = time.perf_counter()
+        connection.request("GET", target, headers={"Accept-Encoding": "gzip"})
+        response = connection.getresponse()
+        body = response.read()
+        latencies.append(time.perf_counter() - start)
+        assert response.status == 200, (target, response.status)
+        sent_bytes += len(body)
+        if response.getheader("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        raw_bytes += len(body)
+    connection.close()
+    return latencies, sent_bytes, raw_bytes
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    seed_caches()
+    server = create_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    targets = make_targets(n)
+    chunks = [targets[i::concurrency] for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(
+            executor.map(lambda chunk: run_client(server.server_address, chunk), chunks)
+        )
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+
+    latencies = sorted(latency for result, _, _ in results for latency in result)
+    sent_bytes = sum(sent for _, sent, _ in results)
+    raw_bytes = sum(raw for _, _, raw in results)
+    quantiles = statistics.quantiles(latencies, n=100)
+    stats = response_cache.stats()
+    print(
+        f"{n}リクエスト 並行数{concurrency}: {n / elapsed:,.0f}リクエスト/秒 "
+        f"（{elapsed:.2f}秒）"
+    )
+    print(
+        f"レイテンシ: p50 {quantiles[49] * 1000:.2f}ミリ秒, "
+        f"p95 {quantiles[94] * 1000:.2f}ミリ秒, p99 {quantiles[98] * 1000:.2f}ミリ秒"
+    )
+    print(
+        f"レスポンスのキャッシュ: ヒット率 {stats['hit_rate']:.1%}, {stats['entries']}件"
+    )
+    print(
+        f"転送量: {sent_bytes / 1024:,.0f}KB（圧縮前 {raw_bytes / 1024:,.0f}KB, "
+        f"{1 - sent_bytes / raw_bytes:.0%}減）"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+キャッシュヒット時のレイテンシのベンチマーク
+
+st.cache_data（ヒットのたびに結果を unpickle してコピーを返す）と、
+services.cache.ApiCache（不変の結果を参照で返す）のヒット時間を比較する。
+
+使い方:
+    python -m benchmarks.bench_cache_hits [ヒット回数]
+"""
+
+import sys
+import time
+from types import MappingProxyType
+import streamlit as st
+from models import Holiday
+from services.cache import ApiCache
+
+COUNTRY_COUNT = 120
+RESULT_SIZES = [15, 150, 1500]
+
+
+def make_holidays(size: int) -> list:
+    """ベンチマーク用の祝日リストを作成"""
+    return [
+        Holiday(
+            date=f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            name=f"Holiday {i}",
+            local_name=f"祝日 {i}",
+            country_code="JP",
+        )
+        for i in range(size)
+    ]
+
+
+def make_countries() -> list:
+    """ベンチマーク用の国一覧を作成"""
+    return [
+        {"countryCode": f"C{i:03d}", "name": f"Country {i}"}
+        for i in range(COUNTRY_COUNT)
+    ]
+
+
+def measure(func, hits: int) -> float:
+    """1回目（ミス）を除いたヒット1回あたりの時間（マイクロ秒）を計測"""
+    func()
+    start = time.perf_counter()
+    for _ in range(hits):
+        func()
+    return (time.perf_counter() - start) / hits * 1e6
+
+
+def bench(name: str, data: list, frozen, hits: int) -> None:
+    """st.cache_dataとApiCacheのヒット時間を比較して表示"""
+    # 同じ関数定義のキャッシュが前のデータを返さないようにクリアする
+    st.cache_data.clear()
+    st_cached = st.cache_data(lambda: data)
+    cache = ApiCache()
+
+    st_us = measure(st_cached, hits)
+    api_us = measure(lambda: cache.get_or_load("key", lambda: frozen), hits)
+    print(
+        f"{name:<16} st.cache_data: {st_us:9.2f}µs  "
+        f"ApiCache: {api_us:6.2f}µs  ({st_us / api_us:,.0f}倍)"
+    )
+
+
+def main() -> None:
+    hits = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    countries = make_countries()
+    bench(
+        f"countries x{len(countries)}",
+        countries,
+        tuple(MappingProxyType(c) for c in countries),
+        hits,
+    )
+    for size in RESULT_SIZES:
+        holidays = make_holidays(size)
+        bench(f"holidays x{size}", holidays, tuple(holidays), hits)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+クイズ一括生成のベンチマーク
+
+合成した祝日インデックスを使い、API呼び出しなしで問題生成のスループットを計測する。
+
+使い方:
+    python -m benchmarks.bench_quiz_generation [問題数]
+"""
+
+import sys
+import time
+from datetime import date, timedelta
+from models import Holiday
+from services.holiday_index import HolidayIndex
+from services.quiz_service import (
+    generate_true_false_questions,
+    generate_guess_questions,
+)
+from constants import TRUE_FALSE_QUIZ_YEAR_MIN, TRUE_FALSE_QUIZ_YEAR_MAX
+
+COUNTRY_COUNT = 120
+HOLIDAYS_PER_YEAR = 15
+SEED = 0
+
+
+def build_index() -> HolidayIndex:
+    """ベンチマーク用の合成インデックスを作成"""
+    index = HolidayIndex()
+    countries = [
+        {"countryCode": f"C{i:03d}", "name": f"Country {i}"}
+        for i in range(COUNTRY_COUNT)
+    ]
+    index.add_countries(countries)
+
+    for i, country in enumerate(countries):
+        for year in range(TRUE_FALSE_QUIZ_YEAR_MIN, TRUE_FALSE_QUIZ_YEAR_MAX + 1):
+            holidays = [
+                Holiday(
+                    date=(
+                        date(year, 1, 1) + timedelta(days=(i + j * 23) % 365)
+                    ).isoformat(),
+                    name=f"Holiday {j}",
+                    local_name=f"Holiday {j}",
+                    country_code=country["countryCode"],
+                )
+                for j in range(HOLIDAYS_PER_YEAR)
+            ]
+            index.add_holidays(year, country["countryCode"], holidays)
+    return index
+
+
+def bench(name: str, func, n: int, index: HolidayIndex) -> None:
+    """1つの生成関数のスループットを計測して表示"""
+    start = time.perf_counter()
+    questions = func(n, seed=SEED, index=index)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name}: {len(questions)}問 {elapsed:.3f}秒 ({len(questions) / elapsed:,.0f} 問/秒)"
+    )
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    index = build_index()
+    bench("generate_true_false_questions", generate_true_false_questions, n, index)
+    bench("generate_guess_questions", generate_guess_questions, n, index)
+
+
+if __name__ == "__main__":
+    main()
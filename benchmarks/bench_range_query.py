@@ -0,0 +1,115 @@
+"""
+複数の国の期間検索のベンチマーク
+
+1900〜2100年の合成した祝日インデックスを使い、国ごと・年ごとに祝日一覧を
+取り出してPythonで絞り込む方法と、HolidayIndex.holidays_in_range
+（国ごとの日付順の列を二分探索）の検索時間を比較する。
+
+使い方:
+    python -m benchmarks.bench_range_query [検索回数]
+"""
+
+import random
+import sys
+import time
+from datetime import date, timedelta
+from models import Holiday
+from services.holiday_index import HolidayIndex
+from constants import YEAR_MIN, YEAR_MAX
+
+COUNTRY_COUNT = 120
+HOLIDAYS_PER_YEAR = 15
+FILTER_COUNTRY_COUNT = 27  # 国で絞り込む場合の国数（EU加盟国数）
+SEED = 0
+
+
+def build_index() -> HolidayIndex:
+    """ベンチマーク用の合成インデックスを作成"""
+    index = HolidayIndex()
+    for i in range(COUNTRY_COUNT):
+        country_code = f"C{i:03d}"
+        for year in range(YEAR_MIN, YEAR_MAX + 1):
+            holidays = [
+                Holiday(
+                    date=(
+                        date(year, 1, 1) + timedelta(days=(i + j * 23) % 365)
+                    ).isoformat(),
+                    name=f"Holiday {j}",
+                    local_name=f"Holiday {j}",
+                    country_code=country_code,
+                )
+                for j in range(HOLIDAYS_PER_YEAR)
+            ]
+            index.add_holidays(year, country_code, holidays)
+    return index
+
+
+def filter_by_year(
+    index: HolidayIndex, start: date, end: date, country_codes: list
+) -> list:
+    """国ごと・年ごとに祝日一覧を取り出して期間で絞り込む（比較用）"""
+    start_str, end_str = start.isoformat(), end.isoformat()
+    result = [
+        holiday
+        for country_code in country_codes
+        for year in range(start.year, end.year + 1)
+        for holiday in index.get_holidays(year, country_code) or ()
+        if start_str <= holiday.date < end_str
+    ]
+    result.sort(key=lambda h: (h.date, h.country_code))
+    return result
+
+
+def random_ranges(n: int, days: int) -> list:
+    """ランダムな期間を作成"""
+    rng = random.Random(SEED)
+    first, last = date(YEAR_MIN, 1, 1), date(YEAR_MAX, 12, 31) - timedelta(days=days)
+    return [
+        (start, start + timedelta(days=days))
+        for start in (
+            first + timedelta(days=rng.randrange((last - first).days)) for _ in range(n)
+        )
+    ]
+
+
+def bench(name: str, index: HolidayIndex, ranges: list, country_codes: list) -> None:
+    """1つの条件で2つの方法の検索時間を計測して表示"""
+    start = time.perf_counter()
+    expected = [len(filter_by_year(index, s, e, country_codes)) for s, e in ranges]
+    baseline = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [len(index.holidays_in_range(s, e, country_codes)) for s, e in ranges]
+    elapsed = time.perf_counter() - start
+
+    assert actual == expected
+    print(
+        f"{name}: {len(ranges)}回 平均{sum(actual) / len(ranges):,.0f}件 "
+        f"年ごとの絞り込み {baseline / len(ranges) * 1000:.2f}ミリ秒/回, "
+        f"holidays_in_range {elapsed / len(ranges) * 1000:.2f}ミリ秒/回 "
+        f"({baseline / elapsed:.1f}倍)"
+    )
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    start = time.perf_counter()
+    index = build_index()
+    all_codes = [f"C{i:03d}" for i in range(COUNTRY_COUNT)]
+    filtered_codes = all_codes[:FILTER_COUNTRY_COUNT]
+    # 初回の検索で国ごとの列を作成する
+    index.holidays_in_range(date(YEAR_MIN, 1, 1), date(YEAR_MIN, 1, 2))
+    print(f"インデックス作成: {time.perf_counter() - start:.1f}秒")
+
+    bench("2週間・27か国", index, random_ranges(n, 14), filtered_codes)
+    bench("1年・全ての国", index, random_ranges(n, 365), all_codes)
+    bench(
+        f"{YEAR_MIN}〜{YEAR_MAX}年・27か国",
+        index,
+        [(date(YEAR_MIN, 1, 1), date(YEAR_MAX + 1, 1, 1))] * max(n // 100, 1),
+        filtered_codes,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+トップページの起動時間のベンチマーク
+
+新しいPythonプロセスで、トップページ（main.py）が最初に読み込むモジュールの
+インポート時間と、AppTestによる初回表示の時間を計測する。次の2つの条件で計測する。
+
+- 出荷時: ウォームアップを有効にし、国一覧もキャッシュしない（実際の起動と同じ）。
+  API通信は一定の待ち時間の後に合成したJSONを返すスタブに置き換える。
+- キャッシュ済み: ウォームアップを無効にし、国一覧をキャッシュに入れておく
+  （トップページ自体の描画だけの時間）。
+
+出荷時の中央値が閾値を超えた場合は終了コード1で終了する（起動時間の劣化の検出用）。
+
+使い方:
+    python -m benchmarks.bench_startup [計測回数]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# 初回表示（インポートを含む）の中央値の閾値（秒）
+STARTUP_THRESHOLD = 3.0
+
+# スタブのAPIの1リクエストあたりの待ち時間（秒）
+STUB_API_LATENCY = 0.05
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 計測する条件（子プロセスに渡す名前, 表示名）
+MODES = (("shipped", "出荷時"), ("cached", "キャッシュ済み"))
+
+# 子プロセスで実行する計測用のスクリプト（引数: 条件の名前, スタブの待ち時間）
+CHILD_SCRIPT = """
+import json
+import sys
+import time
+
+mode, latency = sys.argv[1], float(sys.argv[2])
+
+start = time.perf_counter()
+import streamlit  # noqa: F401
+import services.warmup_service
+
+imported = time.perf_counter()
+requests_loaded = "requests" in sys.modules
+
+from streamlit.testing.v1 import AppTest
+from services.cache import api_cache
+
+countries = [{"countryCode": f"C{i:03d}", "name": f"C{i:03d}"} for i in range(120)]
+
+if mode == "shipped":
+    # main.pyが読み込むrequestsとAPIのサービスの読み込み時間も初回表示に含める
+    rendering = time.perf_counter()
+    import repository
+
+    def fetch_json(path, *args, **kwargs):
+        time.sleep(latency)
+        if path == "AvailableCountries":
+            return countries
+        year, country_code = path.split("/")[1:3]
+        return [
+            {
+                "date": f"{year}-{month:02d}-01",
+                "name": f"Holiday {month}",
+                "localName": f"Holiday {month}",
+                "countryCode": country_code,
+            }
+            for month in range(1, 13)
+        ]
+
+    repository.fetch_json = fetch_json
+else:
+    services.warmup_service.WARMUP_ENABLED = False
+    api_cache.set("AvailableCountries", tuple(countries))
+    rendering = time.perf_counter()
+
+at = AppTest.from_file("main.py", default_timeout=30).run()
+rendered = time.perf_counter()
+
+print(json.dumps({
+    "import": imported - start,
+    "render": rendered - rendering,
+    "requests_loaded": requests_loaded,
+    "exception": bool(at.exception),
+}))
+"""
+
+
+def measure_once(mode: str) -> dict:
+    """新しいプロセスで1回計測する"""
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, mode, str(STUB_API_LATENCY)],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": ROOT},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    totals = {}
+    for mode, label in MODES:
+        runs = [measure_once(mode) for _ in range(n)]
+        if any(run["exception"] for run in runs):
+            print(f"{label}: トップページの表示で例外が発生しました")
+            sys.exit(1)
+
+        import_time = statistics.median(run["import"] for run in runs)
+        render_time = statistics.median(run["render"] for run in runs)
+        totals[mode] = statistics.median(run["import"] + run["render"] for run in runs)
+        requests_loaded = any(run["requests_loaded"] for run in runs)
+        print(
+            f"{label}（{n}回の中央値）: インポート {import_time * 1000:.0f}ミリ秒, "
+            f"初回表示 {render_time * 1000:.0f}ミリ秒, "
+            f"合計 {totals[mode] * 1000:.0f}ミリ秒"
+        )
+        print(
+            f"  初回表示前のrequestsの読み込み: {'あり' if requests_loaded else 'なし'}"
+        )
+
+    if totals["shipped"] > STARTUP_THRESHOLD:
+        print(f"出荷時の起動時間が閾値（{STARTUP_THRESHOLD:.1f}秒）を超えました")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,30 @@
 
 # API関連
 API_BASE_URL = "https://date.nager.at/api/v3"
+API_TIMEOUT = (3.05, 10)  # （接続, 読み込み）のタイムアウト（秒）
+API_RATE_LIMIT = 10  # 1秒あたりのリクエスト数の上限
+API_RATE_BURST = 20  # 連続して送れるリクエスト数の上限
+API_MAX_RETRIES = 3  # 通信エラーや5xx/429の場合のリトライ回数
+API_RETRY_BACKOFF_BASE = 0.5  # リトライ間隔の基準（秒）
+API_RETRY_BACKOFF_MAX = 8  # リトライ間隔の上限（秒）
+API_RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5  # サーキットブレーカーが開く連続失敗回数
+CIRCUIT_BREAKER_RESET_TIMEOUT = 30  # サーキットブレーカーが再試行するまでの秒数
+API_SNAPSHOT_DIR = "data/snapshot"  # APIレスポンスのスナップショット置き場
+
+# ヘッジリクエスト（遅いレスポンスに対して同じGETをもう1つ送る）
+API_HEDGE_ENABLED = False
+API_HEDGE_PERCENTILE = 95  # この割合のレスポンスが返る時間を過ぎたらヘッジする
+API_HEDGE_BUDGET = 0.1  # 追加リクエストは全体の10%まで
+API_HEDGE_MIN_SAMPLES = 20  # パーセンタイルを使い始めるレイテンシの件数
+API_HEDGE_DEFAULT_DELAY = 1.0  # レイテンシの件数が足りない間の待ち時間（秒）
+API_HEDGE_LATENCY_WINDOW = 200  # パーセンタイルの計算に使う直近のレイテンシの件数
+API_HEDGE_MAX_WORKERS = 8  # ヘッジリクエスト用のスレッド数
 API_CACHE_TTL = 3600  # 1時間
+API_CACHE_MAX_ENTRIES = 2048  # キャッシュするAPIリソース数の上限
+API_CACHE_MAX_BYTES = 64 * 1024 * 1024  # キャッシュのメモリ使用量の上限（64MB）
+NEGATIVE_CACHE_TTL = 300  # 取得失敗（不正な年・存在しない国）のキャッシュ期間（5分）
+NEGATIVE_CACHE_STATUS_CAUSES = {400: "validation", 404: "not_found"}
 
 # ファイルパス
 FAVORITES_CSV_PATH = "data/favorites.csv"
@@ -14,9 +37,71 @@ FAVORITES_CSV_PATH = "data/favorites.csv"
 YEAR_MIN = 1900
 YEAR_MAX = 2100
 
+# UTCオフセットの範囲（時間）
+UTC_OFFSET_MIN = -12
+UTC_OFFSET_MAX = 12
+
 # 日数
 NEXT_HOLIDAYS_DAYS = 365
 
+# 連休（ロングウィークエンド）
+WEEKEND_DAYS = (5, 6)  # 週末の曜日（date.weekday()の値: 土曜・日曜）
+LONG_WEEKEND_MIN_DAYS = 3  # 連休とみなす最小日数
+DEFAULT_AVAILABLE_BRIDGE_DAYS = 1  # 連休にするために休める平日の数（APIの既定値）
+
+# 複数の国・年の検索
+SEARCH_MAX_COUNTRIES = 10  # 一度に検索できる国数
+SEARCH_MAX_YEARS = 10  # 一度に検索できる年数
+SEARCH_MAX_WORKERS = 8  # 祝日一覧を並行して取得するスレッド数
+
+# 検索後の先読み（前後の年・国境を接する国）
+PREFETCH_RATE = 1.0  # 先読みに使えるリクエスト数（1秒あたり）
+PREFETCH_BURST = 8  # 先読みでまとめて送れるリクエスト数
+PREFETCH_MAX_WORKERS = 2  # 先読みするスレッド数
+PREFETCH_MAX_TRACKED = 256  # ヒット率の計算のために覚えておく先読み済みの(国, 年)の数
+
+# 起動時のキャッシュのウォームアップ
+WARMUP_ENABLED = True  # 起動時にウォームアップするか
+WARMUP_QUIZ_COUNTRIES = 40  # クイズの年の範囲を取得しておく国数（Noneは全ての国）
+WARMUP_POPULAR_KEYS = 20  # お気に入りの多い(国, 年)を取得しておく数
+WARMUP_MAX_WORKERS = 4  # ウォームアップで並行して取得するスレッド数
+WARMUP_RATE = 2.0  # ウォームアップに使えるリクエスト数（1秒あたり）
+WARMUP_BURST = 40  # ウォームアップでまとめて送れるリクエスト数
+
+# 祝日データの一括エクスポート
+EXPORT_DIR = "data/export"  # エクスポート先の既定のディレクトリ
+EXPORT_FORMATS = ("parquet", "csv")  # エクスポートできるファイル形式
+EXPORT_MAX_WORKERS = 8  # エクスポートで並行して取得するスレッド数
+
+# ローカルのJSON HTTP API
+API_SERVER_HOST = "127.0.0.1"  # 待ち受けるアドレス（既定ではローカルからのみ）
+API_SERVER_PORT = 8000
+API_SERVER_CACHE_TTL = 60  # レスポンスのキャッシュ期間（秒、Cache-Controlのmax-age）
+API_SERVER_CACHE_MAX_ENTRIES = 1024  # キャッシュするレスポンス数の上限
+API_SERVER_CACHE_MAX_BYTES = 16 * 1024 * 1024  # レスポンスのキャッシュの上限（16MB）
+API_SERVER_GZIP_MIN_BYTES = 512  # これ以上の大きさのレスポンスをgzipで圧縮する
+
+# 祝日名のあいまい検索
+NAME_SEARCH_MIN_SCORE = 0.5  # 検索語のトライグラムのうち一致が必要な割合
+NAME_SEARCH_LIMIT = 50  # 検索結果の最大件数
+
+# 営業日カレンダーを保持する数（年ごとのビットマップ・期間ごとのカレンダー）
+BUSINESS_DAY_CACHE_SIZE = 1024
+
+# クイズで出題する年の範囲
+TRUE_FALSE_QUIZ_YEAR_MIN = 2020
+TRUE_FALSE_QUIZ_YEAR_MAX = 2025
+GUESS_QUIZ_YEAR_MIN = 2023
+GUESS_QUIZ_YEAR_MAX = 2025
+
+# クイズ問題プール
+QUESTION_POOL_SIZE = 10  # プールに保持する問題数
+QUESTION_POOL_RETRY_INTERVAL = 5  # 生成失敗時の再試行間隔（秒）
+QUESTION_POOL_RATE_WINDOW = 20  # 補充レートの計算に使う直近の補充回数
+
+# 非祝日の配列を保持する（国, 年）の組数
+NON_HOLIDAY_CACHE_SIZE = 1024
+
 # 月名（日本語）
 MONTH_NAMES = [
     "",  # 0は使わない
@@ -47,3 +132,8 @@ PAGE_ICON_SEARCH = "🔍"
 PAGE_ICON_TRUE_FALSE = "⭕"
 PAGE_ICON_GUESS = "🎯"
 PAGE_ICON_FAVORITES = "❤️"
+
+# 検索ページの検索方法
+SEARCH_MODE_COUNTRY = "国・年から探す"
+SEARCH_MODE_DATE = "日付から探す"
+SEARCH_MODE_NAME = "祝日名から探す"
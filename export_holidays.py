@@ -0,0 +1,102 @@
+"""
+祝日データを国×年ごとのParquet / CSVファイルにエクスポートするコマンド
+
+中断した場合は同じ引数で再実行すると、書き出し済みの(国, 年)を省略して再開する。
+
+使い方:
+    python export_holidays.py [--countries JP US ...] [--year-min 2000]
+        [--year-max 2030] [--format parquet|csv] [--output data/export]
+        [--workers 8]
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+import repository
+from services.export_service import export_public_holidays
+from constants import YEAR_MIN, YEAR_MAX, EXPORT_DIR, EXPORT_FORMATS, EXPORT_MAX_WORKERS
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """コマンドライン引数を解析する"""
+    parser = argparse.ArgumentParser(
+        description="祝日データを国×年ごとのParquet / CSVファイルにエクスポートする"
+    )
+    parser.add_argument(
+        "--countries",
+        nargs="+",
+        metavar="CODE",
+        help="国コード（省略すると利用可能な全ての国）",
+    )
+    parser.add_argument("--year-min", type=int, default=YEAR_MIN, help="最初の年")
+    parser.add_argument("--year-max", type=int, default=YEAR_MAX, help="最後の年")
+    parser.add_argument(
+        "--format", choices=EXPORT_FORMATS, default="parquet", help="ファイル形式"
+    )
+    parser.add_argument("--output", default=EXPORT_DIR, help="エクスポート先")
+    parser.add_argument(
+        "--workers", type=int, default=EXPORT_MAX_WORKERS, help="並行取得のスレッド数"
+    )
+    args = parser.parse_args(argv)
+    if not YEAR_MIN <= args.year_min <= args.year_max <= YEAR_MAX:
+        parser.error(f"年は{YEAR_MIN}〜{YEAR_MAX}の範囲で指定してください")
+    if args.workers < 1:
+        parser.error("スレッド数は1以上を指定してください")
+    return args
+
+
+def print_progress(metrics: dict) -> None:
+    """途中経過を1行で表示する"""
+    done = metrics["written"] + metrics["skipped"] + metrics["failed"]
+    print(
+        f"\r{done}/{metrics['partitions']} "
+        f"({metrics['partitions_per_second']:.1f}件/秒, 失敗 {metrics['failed']})",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.countries:
+        country_codes = [code.upper() for code in args.countries]
+    else:
+        country_codes = [
+            country["countryCode"] for country in repository.get_available_countries()
+        ]
+
+    metrics = export_public_holidays(
+        country_codes,
+        args.year_min,
+        args.year_max,
+        args.output,
+        file_format=args.format,
+        max_workers=args.workers,
+        progress=print_progress,
+    )
+    print(file=sys.stderr)
+
+    print(
+        f"{len(country_codes)}か国 × {args.year_max - args.year_min + 1}年: "
+        f"書き出し {metrics['written']}, 省略（書き出し済み） {metrics['skipped']}, "
+        f"失敗 {metrics['failed']}"
+    )
+    print(
+        f"{metrics['rows']:,}件 {metrics['bytes'] / 1024 / 1024:.1f}MB "
+        f"{metrics['duration']:.1f}秒 "
+        f"({metrics['partitions_per_second']:.1f}ファイル/秒, "
+        f"{metrics['rows_per_second']:,.0f}件/秒)"
+    )
+    for country_code, year, error in metrics["errors"]:
+        print(f"失敗: {country_code} {year}: {error}", file=sys.stderr)
+    if metrics["failed"]:
+        print(
+            "同じ引数で再実行すると、失敗した(国, 年)だけを取得します", file=sys.stderr
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
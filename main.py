@@ -1,7 +1,7 @@
 import streamlit as st
-import repository
 from datetime import datetime
-from constants import APP_TITLE, PAGE_ICON_MAIN, API_CACHE_TTL
+from services.warmup_service import start_warmup, warmup_job
+from constants import APP_TITLE, PAGE_ICON_MAIN
 
 
 # ページの基本設定
@@ -12,13 +12,10 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# session_stateの初期化
-if "favorites" not in st.session_state:
-    try:
-        st.session_state.favorites = repository.load_favorites()
-    except Exception as e:
-        st.error(f"お気に入りの読み込みに失敗しました: {str(e)}")
-        st.session_state.favorites = []
+# クイズやよく検索される祝日一覧をバックグラウンドで取得しておく（初回のみ）
+start_warmup()
+
+# お気に入りはこのページでは使わないため、必要になったページで読み込む
 
 # アプリのタイトルと説明
 st.title(f"{PAGE_ICON_MAIN} {APP_TITLE}")
@@ -64,15 +61,8 @@ with col1:
     st.info(f"📅 今日の日付: {datetime.now().strftime('%Y年%m月%d日')}")
 
 with col2:
-    # 利用可能な国数を表示
-    try:
-        countries = st.cache_data(ttl=API_CACHE_TTL)(
-            repository.get_available_countries
-        )()
-        if countries:
-            st.success(f"🌍 {len(countries)}ヶ国の祝日データが利用可能")
-    except Exception as e:
-        st.error(f"国リストの取得に失敗しました: {str(e)}")
+    # 利用可能な国数は、ページの他の部分を表示してから最後に取得する
+    countries_placeholder = st.empty()
 
 # サイドバーの案内
 st.sidebar.markdown("### 📱 ナビゲーション")
@@ -82,6 +72,20 @@ st.sidebar.markdown("### 🌐 コミュニティ機能")
 st.sidebar.caption("・お気に入りは全ユーザーで共有")
 st.sidebar.caption("・みんなで世界の祝日を探索")
 
+# キャッシュのウォームアップの進捗
+warmup_metrics = warmup_job.metrics()
+if warmup_metrics["state"] == warmup_job.FETCHING:
+    st.sidebar.progress(
+        warmup_metrics["progress"],
+        text=f"祝日データを準備中... ({warmup_metrics['completed']}"
+        f" / {warmup_metrics['total']}件)",
+    )
+elif warmup_metrics["state"] == warmup_job.DONE:
+    st.sidebar.caption(
+        f"祝日データの準備完了: {warmup_metrics['completed']}件"
+        f"（{warmup_metrics['duration']:.1f}秒）"
+    )
+
 # ページへのナビゲーションボタン
 st.markdown("### 🚀 クイックアクセス")
 
@@ -106,3 +110,19 @@ with col4:
 # フッター
 st.markdown("---")
 st.markdown("祝日データは[Nager.Date API](https://date.nager.at/)から取得しています")
+
+
+def show_available_countries(placeholder) -> None:
+    """利用可能な国数を表示する（API通信を行うサービスはここで初めて読み込む）"""
+    from services import holiday_service
+
+    try:
+        countries = holiday_service.get_available_countries()
+        if countries:
+            placeholder.success(f"🌍 {len(countries)}ヶ国の祝日データが利用可能")
+    except Exception as e:
+        placeholder.error(f"国リストの取得に失敗しました: {str(e)}")
+
+
+# 利用可能な国数を表示
+show_available_countries(countries_placeholder)
@@ -1,14 +1,30 @@
 from dataclasses import dataclass
+from typing import Optional, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class Holiday:
-    """祝日を表すデータクラス"""
+    """祝日を表すデータクラス（キャッシュから参照渡しで共有するため不変）"""
 
     date: str  # YYYY-MM-DD形式
     name: str
     local_name: str
     country_code: str
+    counties: Optional[Tuple[str, ...]] = None  # 対象の州・県（Noneは全国）
+
+    def applies_to(self, subdivision: Optional[str] = None) -> bool:
+        """
+        祝日が対象地域で休みになるか判定する
+
+        Args:
+            subdivision: 州・県のコード（ISO-3166-2、Noneは全国）
+
+        Returns:
+            bool: 全国の祝日、または指定された州・県の祝日の場合True
+        """
+        if self.counties is None:
+            return True
+        return subdivision is not None and subdivision in self.counties
 
     def __eq__(self, other):
         """お気に入り重複チェック用の等価性判定"""
@@ -19,3 +35,14 @@ class Holiday:
     def __hash__(self):
         """セットやディクショナリで使用するためのハッシュ値"""
         return hash((self.date, self.country_code))
+
+
+@dataclass(frozen=True)
+class LongWeekend:
+    """連休（ロングウィークエンド）を表すデータクラス"""
+
+    start_date: str  # YYYY-MM-DD形式
+    end_date: str  # YYYY-MM-DD形式（この日を含む）
+    day_count: int
+    need_bridge_day: bool
+    bridge_days: Tuple[str, ...] = ()  # 連休にするために休む平日
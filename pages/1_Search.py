@@ -1,6 +1,7 @@
 import streamlit as st
-from datetime import datetime
+from datetime import date, datetime
 from services import favorite_service, holiday_service
+from services.prefetch_service import prefetcher
 from constants import (
     APP_TITLE,
     PAGE_TITLE_SEARCH,
@@ -8,6 +9,11 @@ from constants import (
     MONTH_NAMES,
     YEAR_MIN,
     YEAR_MAX,
+    SEARCH_MAX_COUNTRIES,
+    SEARCH_MAX_YEARS,
+    SEARCH_MODE_COUNTRY,
+    SEARCH_MODE_DATE,
+    SEARCH_MODE_NAME,
 )
 
 
@@ -19,7 +25,7 @@ st.set_page_config(
 
 st.title(f"{PAGE_ICON_SEARCH} {PAGE_TITLE_SEARCH}")
 st.markdown(
-    "国と年を指定して、世界中の祝日を探索し、みんなのお気に入りに追加しましょう！"
+    "国と年を指定して（複数の国・年もまとめて）、世界中の祝日を探索し、みんなのお気に入りに追加しましょう！"
 )
 
 # セッション状態の初期化
@@ -30,13 +36,130 @@ if "favorites" not in st.session_state:
         st.error(str(e))
         st.session_state.favorites = []
 
+# 現在のお気に入り数を表示
+st.sidebar.markdown("---")
+st.sidebar.info(f"みんなのお気に入り: {len(st.session_state.favorites)}件")
+st.sidebar.caption("※ 全ユーザー共通のお気に入りリストです")
+prefetch_metrics = prefetcher.metrics()
+st.sidebar.caption(
+    f"先読みのヒット率: {prefetch_metrics['hit_rate']:.0%}"
+    f"（{prefetch_metrics['hits']} / {prefetch_metrics['completed']}件）"
+)
+
+# 検索方法の選択
+search_mode = st.radio(
+    "検索方法",
+    [SEARCH_MODE_COUNTRY, SEARCH_MODE_DATE, SEARCH_MODE_NAME],
+    horizontal=True,
+)
+
+# 日付・祝日名からの検索は取得済み・スナップショットのデータから探す
+if search_mode != SEARCH_MODE_COUNTRY and (
+    "snapshot_corpus_loaded" not in st.session_state
+):
+    holiday_service.load_snapshot_corpus()
+    st.session_state.snapshot_corpus_loaded = True
+
+if search_mode == SEARCH_MODE_NAME:
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        query = st.text_input(
+            "祝日名（英語名・現地名）", placeholder="例: Independence、建国"
+        )
+    with col2:
+        name_year_from = st.number_input(
+            "開始年", min_value=YEAR_MIN, max_value=YEAR_MAX, value=YEAR_MIN, step=1
+        )
+    with col3:
+        name_year_to = st.number_input(
+            "終了年", min_value=YEAR_MIN, max_value=YEAR_MAX, value=YEAR_MAX, step=1
+        )
+
+    if query.strip():
+        matches = holiday_service.search_holiday_names(
+            query, int(name_year_from), int(name_year_to)
+        )
+        if matches:
+            st.success(f"「{query}」に似た祝日が{len(matches)}件見つかりました！")
+            name_df = holiday_service.holidays_to_search_dataframe(
+                [holiday for holiday, _ in matches], st.session_state.favorites
+            )
+            name_df.insert(0, "一致度", [f"{score:.0%}" for _, score in matches])
+            st.dataframe(name_df, hide_index=True, use_container_width=True)
+        else:
+            st.info(f"取得済みのデータには「{query}」に似た祝日はありません。")
+    st.caption("※ 取得済みの国・年の祝日から探します")
+    st.stop()
+
+if search_mode == SEARCH_MODE_DATE:
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        selected_date = st.date_input(
+            "日付を選択",
+            value=datetime.now().date(),
+            min_value=date(YEAR_MIN, 1, 1),
+            max_value=date(YEAR_MAX, 12, 31),
+        )
+    with col2:
+        st.markdown("<br>", unsafe_allow_html=True)  # スペーサー
+        every_year = st.checkbox("全ての年の同じ月日を探す")
+
+    # 取得済みの国数を表示し、足りない国をまとめて取得できるようにする
+    country_options = holiday_service.get_country_options()
+    loaded_codes = set(holiday_service.get_loaded_country_codes(selected_date.year))
+    missing_codes = [
+        code for code in country_options.values() if code not in loaded_codes
+    ]
+    st.caption(
+        f"{selected_date.year}年の祝日データを取得済みの国: "
+        f"{len(country_options) - len(missing_codes)}/{len(country_options)}"
+    )
+    if missing_codes and st.button(
+        f"🌍 {selected_date.year}年の全ての国の祝日データを取得"
+    ):
+        progress = st.progress(0.0, text="祝日データを取得中...")
+        for count, _ in enumerate(
+            holiday_service.search_public_holidays(
+                missing_codes, selected_date.year, selected_date.year
+            ),
+            start=1,
+        ):
+            progress.progress(
+                count / len(missing_codes),
+                text=f"祝日データを取得中... ({count}/{len(missing_codes)})",
+            )
+        progress.empty()
+        st.rerun()
+
+    if every_year:
+        date_holidays = holiday_service.get_holidays_on_month_day(
+            selected_date.month, selected_date.day
+        )
+        date_label = f"{selected_date.month}月{selected_date.day}日"
+    else:
+        date_holidays = holiday_service.get_holidays_on_date(selected_date)
+        date_label = selected_date.strftime("%Y年%m月%d日")
+
+    if date_holidays:
+        st.success(f"{date_label}は{len(date_holidays)}件の祝日が見つかりました！")
+        st.dataframe(
+            holiday_service.holidays_to_search_dataframe(
+                date_holidays, st.session_state.favorites
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+    else:
+        st.info(f"取得済みのデータには{date_label}の祝日はありません。")
+    st.stop()
+
 # 検索結果をセッション状態に保存
 if "search_results" not in st.session_state:
     st.session_state.search_results = None
-if "search_country_code" not in st.session_state:
-    st.session_state.search_country_code = None
-if "search_year" not in st.session_state:
-    st.session_state.search_year = None
+if "search_country_codes" not in st.session_state:
+    st.session_state.search_country_codes = []
+if "search_years" not in st.session_state:
+    st.session_state.search_years = None
 if "search_country_display" not in st.session_state:
     st.session_state.search_country_display = None
 
@@ -48,19 +171,29 @@ with col1:
     country_options = holiday_service.get_country_options()
 
     if country_options:
-        selected_country_display = st.selectbox(
-            "国を選択", options=list(country_options.keys()), index=0
+        country_names = list(country_options.keys())
+        selected_country_displays = st.multiselect(
+            "国を選択（複数可）",
+            options=country_names,
+            default=country_names[:1],
+            max_selections=SEARCH_MAX_COUNTRIES,
         )
-        selected_country_code = country_options[selected_country_display]
+        selected_country_codes = [
+            country_options[display] for display in selected_country_displays
+        ]
     else:
         st.error("国リストの取得に失敗しました。")
-        selected_country_code = None
+        selected_country_displays = []
+        selected_country_codes = []
 
 with col2:
-    # 年の選択
+    # 年の範囲の選択
     current_year = datetime.now().year
-    selected_year = st.number_input(
-        "年を選択", min_value=YEAR_MIN, max_value=YEAR_MAX, value=current_year, step=1
+    year_from = st.number_input(
+        "開始年", min_value=YEAR_MIN, max_value=YEAR_MAX, value=current_year, step=1
+    )
+    year_to = st.number_input(
+        "終了年", min_value=YEAR_MIN, max_value=YEAR_MAX, value=current_year, step=1
     )
 
 with col3:
@@ -69,25 +202,54 @@ with col3:
     search_button = st.button("🔍 検索", use_container_width=True, type="primary")
 
 # 検索実行時の処理
-if search_button and selected_country_code:
-    with st.spinner("祝日データを取得中..."):
-        try:
-            holidays = holiday_service.get_public_holidays(
-                selected_year, selected_country_code
+if search_button and year_from > year_to:
+    st.error("開始年は終了年以前を指定してください。")
+elif search_button and year_to - year_from + 1 > SEARCH_MAX_YEARS:
+    st.error(f"一度に検索できるのは{SEARCH_MAX_YEARS}年分までです。")
+elif search_button and selected_country_codes:
+    total = len(selected_country_codes) * (year_to - year_from + 1)
+    progress = st.progress(0.0, text="祝日データを取得中...")
+    preview = st.empty()
+    results = []
+    prefetcher.record_search(selected_country_codes, int(year_from), int(year_to))
+
+    # 取得できた国・年から順に表示する
+    for result in holiday_service.search_public_holidays(
+        selected_country_codes, int(year_from), int(year_to)
+    ):
+        results.append(result)
+        if result.error is not None:
+            st.error(
+                f"{result.year}年の{result.country_code}の祝日データの取得に失敗しました: "
+                f"{str(result.error)}"
             )
-            # 検索結果をセッション状態に保存
-            st.session_state.search_results = holidays
-            st.session_state.search_country_code = selected_country_code
-            st.session_state.search_year = selected_year
-            st.session_state.search_country_display = selected_country_display
-        except Exception as e:
-            st.error(f"祝日データの取得に失敗しました: {str(e)}")
-            st.session_state.search_results = []
+        progress.progress(
+            len(results) / total, text=f"祝日データを取得中... ({len(results)}/{total})"
+        )
+        preview.dataframe(
+            holiday_service.holidays_to_search_dataframe(
+                holiday_service.merge_search_results(results),
+                st.session_state.favorites,
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+    progress.empty()
+    preview.empty()
+
+    # 検索結果をセッション状態に保存
+    st.session_state.search_results = holiday_service.merge_search_results(results)
+    st.session_state.search_country_codes = selected_country_codes
+    st.session_state.search_years = (int(year_from), int(year_to))
+    st.session_state.search_country_display = "、".join(selected_country_displays)
+
+    # 次に検索されそうな前後の年・隣の国をバックグラウンドで先読みする
+    prefetcher.after_search(selected_country_codes, int(year_from), int(year_to))
 
 # 検索結果の表示（セッション状態から取得）
 holidays = st.session_state.search_results
-selected_country_code = st.session_state.search_country_code
-selected_year = st.session_state.search_year
+selected_country_codes = st.session_state.search_country_codes
+selected_years = st.session_state.search_years
 selected_country_display = st.session_state.search_country_display
 
 if holidays:
@@ -122,7 +284,6 @@ if holidays:
                 st.session_state.favorites,
                 edited_df,
                 holidays,
-                selected_country_code,
             )
 
             # セッション状態とCSVファイルを更新
@@ -161,20 +322,22 @@ elif (
     st.session_state.search_results is not None
     and len(st.session_state.search_results) == 0
 ):
+    year_from, year_to = selected_years
+    year_label = (
+        f"{year_from}年" if year_from == year_to else f"{year_from}〜{year_to}年"
+    )
     st.warning(
-        f"{selected_year}年の{selected_country_display}の祝日データが見つかりませんでした。"
+        f"{year_label}の{selected_country_display}の祝日データが見つかりませんでした。"
     )
 
 # 使い方のヒント
 with st.expander("💡 使い方のヒント"):
     st.markdown("""
     - 国を選択して年を指定し、検索ボタンをクリックすると祝日一覧が表示されます
+    - 「日付から探す」では、指定した日が祝日の国を一覧できます
+    - 「祝日名から探す」では、名前の一部やつづりが少し違う語でも祝日を探せます
+    - 複数の国や年の範囲を指定すると、まとめて日付順に表示されます（取得できたものから順に表示）
     - お気に入り列のチェックボックスをクリックすると、**みんなのお気に入り**に追加されます
     - お気に入りは全ユーザーで共有されます
     - みんなで楽しむため、マナーを守って利用しましょう
     """)
-
-# 現在のお気に入り数を表示
-st.sidebar.markdown("---")
-st.sidebar.info(f"みんなのお気に入り: {len(st.session_state.favorites)}件")
-st.sidebar.caption("※ 全ユーザー共通のお気に入りリストです")
@@ -1,9 +1,10 @@
 import streamlit as st
 from services.quiz_service import (
-    generate_true_false_question,
     check_true_false_answer,
     calculate_accuracy,
 )
+from services.question_pool import get_true_false_pool
+from services.warmup_service import start_warmup
 from constants import APP_TITLE, PAGE_TITLE_TRUE_FALSE_QUIZ, PAGE_ICON_TRUE_FALSE
 
 
@@ -13,9 +14,15 @@ st.set_page_config(
     layout="wide",
 )
 
+# 直接このページを開いた場合もキャッシュのウォームアップを開始する（初回のみ）
+start_warmup()
+
 st.title(f"{PAGE_ICON_TRUE_FALSE}❌ {PAGE_TITLE_TRUE_FALSE_QUIZ}")
 st.markdown("指定された日付が本当に祝日かどうかを当ててみましょう！")
 
+# 事前生成された問題のプール
+question_pool = get_true_false_pool()
+
 # セッション状態の初期化
 if "quiz_score" not in st.session_state:
     st.session_state.quiz_score = 0
@@ -29,7 +36,7 @@ if "quiz_answered" not in st.session_state:
 
 # 新しい問題を生成
 if st.session_state.current_question is None:
-    st.session_state.current_question = generate_true_false_question()
+    st.session_state.current_question = question_pool.get()
     st.session_state.quiz_answered = False
 
 # スコア表示
@@ -101,7 +108,7 @@ if st.session_state.current_question:
 
         # 次の問題へ
         if st.button("🔄 次の問題", use_container_width=True, type="primary"):
-            st.session_state.current_question = generate_true_false_question()
+            st.session_state.current_question = question_pool.get()
             st.session_state.quiz_answered = False
             st.rerun()
 else:
@@ -114,7 +121,7 @@ with col1:
     if st.button("🔄 スコアをリセット", use_container_width=True):
         st.session_state.quiz_score = 0
         st.session_state.quiz_total = 0
-        st.session_state.current_question = generate_true_false_question()
+        st.session_state.current_question = question_pool.get()
         st.session_state.quiz_answered = False
         st.rerun()
 
@@ -140,3 +147,9 @@ if st.session_state.quiz_total > 0:
     st.sidebar.markdown(
         f"正解数: {st.session_state.quiz_score} / {st.session_state.quiz_total}"
     )
+
+pool_metrics = question_pool.metrics()
+st.sidebar.caption(
+    f"問題プール: {pool_metrics['depth']} / {pool_metrics['size']}"
+    f"（補充 {pool_metrics['refill_rate']:.1f} 問/秒）"
+)
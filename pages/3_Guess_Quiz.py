@@ -1,9 +1,10 @@
 import streamlit as st
 from services.quiz_service import (
-    generate_guess_question as service_generate_guess_question,
     process_guess_answer as service_process_guess_answer,
     calculate_accuracy,
 )
+from services.question_pool import get_guess_pool
+from services.warmup_service import start_warmup
 from constants import APP_TITLE, PAGE_TITLE_GUESS_QUIZ, PAGE_ICON_GUESS
 
 
@@ -13,9 +14,15 @@ st.set_page_config(
     layout="wide",
 )
 
+# 直接このページを開いた場合もキャッシュのウォームアップを開始する（初回のみ）
+start_warmup()
+
 st.title(f"{PAGE_ICON_GUESS} {PAGE_TITLE_GUESS_QUIZ}")
 st.markdown("祝日の名前から、いつ・どこの祝日かを当ててみましょう！")
 
+# 事前生成された問題のプール
+question_pool = get_guess_pool()
+
 # セッション状態の初期化
 if "guess_score" not in st.session_state:
     st.session_state.guess_score = 0
@@ -31,7 +38,7 @@ if "selected_answer" not in st.session_state:
 
 # 新しい問題を生成
 if st.session_state.current_guess_question is None:
-    st.session_state.current_guess_question = service_generate_guess_question()
+    st.session_state.current_guess_question = question_pool.get()
     st.session_state.guess_answered = False
     st.session_state.selected_answer = None
 
@@ -111,7 +118,7 @@ if st.session_state.current_guess_question:
         # 次の問題へ
         st.markdown("")
         if st.button("🔄 次の問題", use_container_width=True, type="primary"):
-            st.session_state.current_guess_question = service_generate_guess_question()
+            st.session_state.current_guess_question = question_pool.get()
             st.session_state.guess_answered = False
             st.session_state.selected_answer = None
             st.rerun()
@@ -125,7 +132,7 @@ with col1:
     if st.button("🔄 スコアをリセット", use_container_width=True):
         st.session_state.guess_score = 0
         st.session_state.guess_total = 0
-        st.session_state.current_guess_question = service_generate_guess_question()
+        st.session_state.current_guess_question = question_pool.get()
         st.session_state.guess_answered = False
         st.session_state.selected_answer = None
         st.rerun()
@@ -153,6 +160,12 @@ if st.session_state.guess_total > 0:
         f"正解数: {st.session_state.guess_score} / {st.session_state.guess_total}"
     )
 
+pool_metrics = question_pool.metrics()
+st.sidebar.caption(
+    f"問題プール: {pool_metrics['depth']} / {pool_metrics['size']}"
+    f"（補充 {pool_metrics['refill_rate']:.1f} 問/秒）"
+)
+
 # 豆知識
 with st.expander("🌍 豆知識"):
     st.markdown("""
@@ -1,44 +1,587 @@
+import json
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import requests
-import pandas as pd
-from typing import List
+from typing import Any, Callable, Collection, Deque, Dict, List, Optional, Tuple
 from models import Holiday
 from pathlib import Path
 from utils import convert_api_response_to_holidays
-from constants import API_BASE_URL, FAVORITES_CSV_PATH
+from constants import (
+    API_BASE_URL,
+    API_TIMEOUT,
+    API_RATE_LIMIT,
+    API_RATE_BURST,
+    API_MAX_RETRIES,
+    API_RETRY_BACKOFF_BASE,
+    API_RETRY_BACKOFF_MAX,
+    API_RETRY_STATUS_CODES,
+    API_SNAPSHOT_DIR,
+    API_HEDGE_ENABLED,
+    API_HEDGE_PERCENTILE,
+    API_HEDGE_BUDGET,
+    API_HEDGE_MIN_SAMPLES,
+    API_HEDGE_DEFAULT_DELAY,
+    API_HEDGE_LATENCY_WINDOW,
+    API_HEDGE_MAX_WORKERS,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RESET_TIMEOUT,
+    FAVORITES_CSV_PATH,
+)
 
 
-def get_available_countries() -> List[dict]:
+class CircuitOpenError(requests.RequestException):
+    """サーキットブレーカーが開いていてAPIを呼び出さなかった場合の例外"""
+
+
+class NotModifiedError(requests.RequestException):
+    """条件付きリクエストに304 Not Modifiedが返った場合の例外（キャッシュ済みの値を使う）"""
+
+
+class ResponseValidators:
+    """
+    APIのリソースパスごとのキャッシュ検証用の値（ETag / Last-Modified）
+
+    取得したレスポンスの検証用ヘッダーを保存しておき、再取得の際に
+    条件付きリクエストのヘッダーとして送る。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._validators: Dict[str, Dict[str, str]] = {}
+
+    def conditional_headers(self, path: str) -> Dict[str, str]:
+        """
+        条件付きリクエストのヘッダーを取得する
+
+        Args:
+            path: APIのリソースパス（例: "PublicHolidays/2025/JP"）
+
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since ヘッダー（検証用の値がなければ空）
+        """
+        with self._lock:
+            validators = self._validators.get(path, {})
+        headers = {}
+        if "ETag" in validators:
+            headers["If-None-Match"] = validators["ETag"]
+        if "Last-Modified" in validators:
+            headers["If-Modified-Since"] = validators["Last-Modified"]
+        return headers
+
+    def update(self, path: str, response: requests.Response) -> None:
+        """
+        レスポンスの検証用ヘッダーを保存する（ヘッダーがなければ削除する）
+
+        Args:
+            path: APIのリソースパス
+            response: 取得したレスポンス
+        """
+        validators = {
+            name: response.headers[name]
+            for name in ("ETag", "Last-Modified")
+            if isinstance(response.headers.get(name), str)
+        }
+        with self._lock:
+            if validators:
+                self._validators[path] = validators
+            else:
+                self._validators.pop(path, None)
+
+    def discard(self, path: str) -> None:
+        """指定されたリソースパスの検証用の値を削除する"""
+        with self._lock:
+            self._validators.pop(path, None)
+
+    def clear(self) -> None:
+        """すべての検証用の値を削除する"""
+        with self._lock:
+            self._validators.clear()
+
+
+class TokenBucket:
+    """
+    スレッド間で共有するトークンバケット方式のレート制限
+
+    1秒あたりrate個のトークンが補充され、最大capacity個まで貯まる。
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """トークンを1つ取得する（足りない場合は補充されるまで待つ）"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def try_acquire(self) -> bool:
+        """
+        トークンを1つ取得する（待たない）
+
+        Returns:
+            bool: 取得できた場合True、トークンが足りない場合False
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def _refill(self) -> None:
+        """経過時間に応じてトークンを補充する（ロック取得済みで呼ぶ）"""
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def reset(self) -> None:
+        """トークンを満杯に戻す"""
+        with self._lock:
+            self._tokens = float(self.capacity)
+            self._updated_at = self._clock()
+
+
+class CircuitBreaker:
+    """
+    連続した失敗でAPI呼び出しを一時停止するサーキットブレーカー
+
+    failure_threshold回連続で失敗すると開き（open）、reset_timeout秒後に
+    1回だけ試行を許可する（half_open）。試行が成功すると閉じる（closed）。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        """現在の状態"""
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        API呼び出しを許可するか判定する
+
+        Returns:
+            bool: 呼び出してよい場合True
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._clock() - self._opened_at < self.reset_timeout:
+                return False
+            # 一定時間経過したら試行を1回だけ許可する
+            self._state = self.HALF_OPEN
+            self._opened_at = self._clock()
+            return True
+
+    def record_success(self) -> None:
+        """呼び出しの成功を記録する"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """呼び出しの失敗を記録する"""
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+    def reset(self) -> None:
+        """閉じた状態に戻す"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+
+class RequestHedger:
+    """
+    ヘッジリクエストでテールレイテンシを抑えるGETクライアント
+
+    レスポンスが直近のレイテンシのパーセンタイル値を過ぎても返らない場合に
+    同じリクエストをもう1つ送り、先に返った方を使う。冪等なGETにだけ使うこと。
+    追加のリクエスト数は全体のbudgetの割合までに制限し、レート制限のトークンが
+    すぐに取得できない場合もヘッジしない。
+    """
+
+    def __init__(
+        self,
+        percentile: float = API_HEDGE_PERCENTILE,
+        budget: float = API_HEDGE_BUDGET,
+        min_samples: int = API_HEDGE_MIN_SAMPLES,
+        default_delay: float = API_HEDGE_DEFAULT_DELAY,
+        latency_window: int = API_HEDGE_LATENCY_WINDOW,
+        max_workers: int = API_HEDGE_MAX_WORKERS,
+    ):
+        """
+        Args:
+            percentile: ヘッジするまでの待ち時間に使うレイテンシのパーセンタイル
+            budget: 全リクエストに対する追加リクエストの割合の上限
+            min_samples: パーセンタイルを使い始めるのに必要なレイテンシの件数
+            default_delay: レイテンシの件数が足りない間の待ち時間（秒）
+            latency_window: パーセンタイルの計算に使う直近のレイテンシの件数
+            max_workers: リクエストを送るスレッド数
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hedged-request"
+        )
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+
+    def hedge_delay(self) -> float:
+        """ヘッジリクエストを送るまでの待ち時間（秒）"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.default_delay
+            latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+        return latencies[index]
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GETリクエストを送る（遅い場合はヘッジする）
+
+        Args:
+            url: リクエスト先のURL
+            **kwargs: requests.getに渡す引数
+
+        Returns:
+            requests.Response: 先に返ったレスポンス
+
+        Raises:
+            requests.RequestException: すべてのリクエストが失敗した場合
+        """
+        with self._lock:
+            self._requests += 1
+
+        primary = self._submit(url, kwargs)
+        done, _ = wait([primary], timeout=self.hedge_delay())
+        if done or not self._try_acquire_budget():
+            return primary.result()
+
+        hedge = self._submit(url, kwargs)
+        pending = {primary, hedge}
+        error: Optional[Exception] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self._hedge_wins += 1
+                # 負けた方はキャンセルし、後から返ったレスポンスは閉じる
+                for loser in pending:
+                    if not loser.cancel():
+                        loser.add_done_callback(_close_response)
+                return future.result()
+        raise error
+
+    def metrics(self) -> dict:
+        """
+        ヘッジのメトリクスを取得する
+
+        Returns:
+            dict: 以下のキーを持つ辞書
+                - requests: リクエスト数
+                - hedged: ヘッジリクエストを送った回数
+                - hedge_wins: ヘッジリクエストの方が先に返った回数
+                - hedge_rate: ヘッジした割合（0〜1）
+                - hedge_delay: 現在のヘッジまでの待ち時間（秒）
+        """
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "hedged": self._hedged,
+                "hedge_wins": self._hedge_wins,
+                "hedge_rate": self._hedged / self._requests if self._requests else 0.0,
+                "hedge_delay": delay,
+            }
+
+    def _try_acquire_budget(self) -> bool:
+        """予算内でレート制限のトークンも取得できればヘッジ回数を増やしてTrueを返す"""
+        with self._lock:
+            if self._hedged >= self.budget * self._requests:
+                return False
+        # ヘッジリクエストもAPIへのリクエストなのでレート制限に数える（待たない）
+        if not rate_limiter.try_acquire():
+            return False
+        with self._lock:
+            self._hedged += 1
+            return True
+
+    def _submit(self, url: str, kwargs: dict) -> Future:
+        """リクエストを送り、完了時にレイテンシを記録する"""
+        started_at = time.monotonic()
+
+        def record_latency(future: Future) -> None:
+            if not future.cancelled() and future.exception() is None:
+                with self._lock:
+                    self._latencies.append(time.monotonic() - started_at)
+
+        future = self._executor.submit(requests.get, url, **kwargs)
+        future.add_done_callback(record_latency)
+        return future
+
+
+def _close_response(future: Future) -> None:
+    """使わなかったレスポンスを閉じる"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+# プロセス共通のレート制限・サーキットブレーカー・ヘッジリクエスト・検証用の値
+response_validators = ResponseValidators()
+rate_limiter = TokenBucket(API_RATE_LIMIT, API_RATE_BURST)
+circuit_breaker = CircuitBreaker(
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD, CIRCUIT_BREAKER_RESET_TIMEOUT
+)
+request_hedger = RequestHedger()
+
+
+def _send_get(url: str, headers: Dict[str, str]) -> requests.Response:
+    """GETリクエストを送る（設定によりヘッジリクエストを使う）"""
+    kwargs = {"timeout": API_TIMEOUT}
+    if headers:
+        kwargs["headers"] = headers
+    if API_HEDGE_ENABLED:
+        return request_hedger.get(url, **kwargs)
+    return requests.get(url, **kwargs)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """リトライまでの待ち時間（指数バックオフ + フルジッター）"""
+    return random.uniform(
+        0, min(API_RETRY_BACKOFF_MAX, API_RETRY_BACKOFF_BASE * 2**attempt)
+    )
+
+
+def _load_snapshot(path: str) -> Optional[Any]:
+    """
+    スナップショットとして保存されたAPIレスポンスを読み込む
+
+    Args:
+        path: APIのリソースパス（例: "PublicHolidays/2025/JP"）
+
+    Returns:
+        Any: JSONデータ、スナップショットがない場合はNone
+    """
+    snapshot_path = Path(API_SNAPSHOT_DIR) / f"{path}.json"
+    if not snapshot_path.exists():
+        return None
+    with open(snapshot_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fetch_json(
+    path: str, revalidate: bool = False, store_validators: bool = True
+) -> Any:
+    """
+    APIのリソースを取得してJSONを返す
+
+    レート制限、タイムアウト、ジッター付きのリトライ、サーキットブレーカーを適用する。
+    サーキットブレーカーが開いている場合はAPIを呼ばず、スナップショットがあれば
+    それを返し、なければ CircuitOpenError を送出する。
+    レスポンスのETag / Last-Modifiedは保存しておき、revalidateを指定した場合は
+    条件付きリクエストを送る。変更がなければ（304）JSONを読まずに NotModifiedError を送出する。
+    再検証しない一括取得では、store_validatorsにFalseを指定して検証用の値を保存しない。
+
+    Args:
+        path: APIのリソースパス（例: "PublicHolidays/2025/JP"）
+        revalidate: 保存済みの検証用の値で条件付きリクエストを送るか
+        store_validators: レスポンスの検証用の値を保存するか
+
+    Returns:
+        Any: レスポンスのJSONデータ
+
+    Raises:
+        NotModifiedError: 条件付きリクエストでリソースが変更されていなかった場合
+        CircuitOpenError: サーキットブレーカーが開いていてスナップショットもない場合
+        requests.RequestException: API呼び出しに失敗した場合
+    """
+    url = f"{API_BASE_URL}/{path}"
+    headers = response_validators.conditional_headers(path) if revalidate else {}
+
+    if not circuit_breaker.allow_request():
+        snapshot = _load_snapshot(path)
+        if snapshot is not None:
+            return snapshot
+        raise CircuitOpenError(f"API呼び出しを一時停止しています: {url}")
+
+    error: Optional[Exception] = None
+    for attempt in range(API_MAX_RETRIES + 1):
+        if attempt > 0:
+            time.sleep(_backoff_delay(attempt - 1))
+        rate_limiter.acquire()
+
+        try:
+            response = _send_get(url, headers)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+            continue
+
+        if response.status_code in API_RETRY_STATUS_CODES:
+            error = requests.HTTPError(
+                f"{response.status_code} Error for url: {url}", response=response
+            )
+            continue
+
+        # 4xxなどリトライしても変わらない応答はAPIが応答しているとみなす
+        circuit_breaker.record_success()
+        if headers and response.status_code == 304:
+            raise NotModifiedError(
+                f"304 Not Modified for url: {url}", response=response
+            )
+        response.raise_for_status()
+        if store_validators:
+            response_validators.update(path, response)
+        return response.json()
+
+    circuit_breaker.record_failure()
+    raise error
+
+
+def get_available_countries(revalidate: bool = False) -> List[dict]:
     """
     利用可能な国のリストをAPIから取得
 
+    Args:
+        revalidate: 前回のレスポンスから変更があるか条件付きリクエストで確認するか
+
     Returns:
         List[dict]: 国コードと国名を含む辞書のリスト
 
     Raises:
+        NotModifiedError: revalidateを指定し、変更がなかった場合
+        requests.RequestException: API呼び出しに失敗した場合
+    """
+    return fetch_json("AvailableCountries", revalidate)
+
+
+def get_country_info(country_code: str, revalidate: bool = False) -> dict:
+    """
+    指定された国の情報（国境を接する国を含む）をAPIから取得
+
+    Args:
+        country_code: 国コード（例: "DE"）
+        revalidate: 前回のレスポンスから変更があるか条件付きリクエストで確認するか
+
+    Returns:
+        dict: commonName, officialName, countryCode, region, bordersを含む辞書
+
+    Raises:
+        NotModifiedError: revalidateを指定し、変更がなかった場合
         requests.RequestException: API呼び出しに失敗した場合
     """
-    response = requests.get(f"{API_BASE_URL}/AvailableCountries")
-    response.raise_for_status()
-    return response.json()
+    return fetch_json(f"CountryInfo/{country_code}", revalidate)
 
 
-def get_public_holidays(year: int, country_code: str) -> List[Holiday]:
+def get_public_holidays(
+    year: int,
+    country_code: str,
+    revalidate: bool = False,
+    store_validators: bool = True,
+) -> List[Holiday]:
     """
     指定された年と国の祝日一覧をAPIから取得
 
     Args:
         year: 年（例: 2025）
         country_code: 国コード（例: "JP"）
+        revalidate: 前回のレスポンスから変更があるか条件付きリクエストで確認するか
+        store_validators: 次回の条件付きリクエストのために検証用の値を保存するか
 
     Returns:
         List[Holiday]: 祝日のリスト
 
     Raises:
+        NotModifiedError: revalidateを指定し、変更がなかった場合
         requests.RequestException: API呼び出しに失敗した場合
     """
-    response = requests.get(f"{API_BASE_URL}/PublicHolidays/{year}/{country_code}")
-    response.raise_for_status()
-    return convert_api_response_to_holidays(response.json())
+    return convert_api_response_to_holidays(
+        fetch_json(
+            f"PublicHolidays/{year}/{country_code}", revalidate, store_validators
+        )
+    )
+
+
+def load_snapshot_public_holidays(
+    exclude: Collection[Tuple[str, int]] = (),
+) -> List[Tuple[int, str, List[Holiday]]]:
+    """
+    スナップショットとして保存された全ての祝日一覧を読み込む
+
+    Args:
+        exclude: 読み込まない(国コード, 年)（ファイルを開く前に除外する）
+
+    Returns:
+        List[Tuple[int, str, List[Holiday]]]: (年, 国コード, 祝日のリスト)のリスト
+    """
+    base_path = Path(API_SNAPSHOT_DIR) / "PublicHolidays"
+    if not base_path.exists():
+        return []
+
+    corpus = []
+    for snapshot_path in sorted(base_path.glob("*/*.json")):
+        if not snapshot_path.parent.name.isdigit():
+            continue
+        if (snapshot_path.stem, int(snapshot_path.parent.name)) in exclude:
+            continue
+        with open(snapshot_path, encoding="utf-8") as f:
+            holidays = convert_api_response_to_holidays(json.load(f))
+        corpus.append((int(snapshot_path.parent.name), snapshot_path.stem, holidays))
+    return corpus
 
 
 def load_favorites() -> List[Holiday]:
@@ -51,6 +594,8 @@ def load_favorites() -> List[Holiday]:
     Raises:
         Exception: ファイル読み込みに失敗した場合
     """
+    import pandas as pd  # お気に入りを使うときだけ読み込む
+
     csv_path = Path(FAVORITES_CSV_PATH)
 
     # ファイルが存在しない場合は空のリストを返す
@@ -84,6 +629,8 @@ def save_favorites(favorites: List[Holiday]) -> None:
     Raises:
         Exception: ファイル保存に失敗した場合
     """
+    import pandas as pd  # お気に入りを使うときだけ読み込む
+
     csv_path = Path(FAVORITES_CSV_PATH)
 
     # ディレクトリが存在しない場合は作成
@@ -106,19 +653,23 @@ def save_favorites(favorites: List[Holiday]) -> None:
     df.to_csv(csv_path, index=False)
 
 
-def get_next_public_holidays(country_code: str) -> List[Holiday]:
+def get_next_public_holidays(
+    country_code: str, revalidate: bool = False
+) -> List[Holiday]:
     """
     指定された国の今後の祝日を取得
 
     Args:
         country_code: 国コード（例: "JP"）
+        revalidate: 前回のレスポンスから変更があるか条件付きリクエストで確認するか
 
     Returns:
         List[Holiday]: 祝日のリスト
 
     Raises:
+        NotModifiedError: revalidateを指定し、変更がなかった場合
         requests.RequestException: API呼び出しに失敗した場合
     """
-    response = requests.get(f"{API_BASE_URL}/NextPublicHolidays/{country_code}")
-    response.raise_for_status()
-    return convert_api_response_to_holidays(response.json())
+    return convert_api_response_to_holidays(
+        fetch_json(f"NextPublicHolidays/{country_code}", revalidate)
+    )
@@ -0,0 +1,390 @@
+"""営業日の計算（国ごとの祝日ビットマップと累積和による）"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+import numpy as np
+from services import holiday_service
+from services.cache import api_cache
+from constants import (
+    YEAR_MIN,
+    YEAR_MAX,
+    WEEKEND_DAYS,
+    BUSINESS_DAY_CACHE_SIZE,
+    API_CACHE_TTL,
+)
+
+# カレンダーのキャッシュのキー（国コード, 最初の年, 最後の年, 週末, 州・県）
+CalendarKey = Tuple[str, int, int, Tuple[int, ...], Optional[str]]
+
+
+def _validate_weekend(weekend: Sequence[int]) -> Tuple[int, ...]:
+    """週末の曜日を検証して正規化する"""
+    days = tuple(sorted(set(weekend)))
+    if any(day < 0 or day > 6 for day in days):
+        raise ValueError("weekend days must be between 0 (Monday) and 6 (Sunday)")
+    if len(days) == 7:
+        raise ValueError("weekend must leave at least one working day")
+    return days
+
+
+@lru_cache(maxsize=BUSINESS_DAY_CACHE_SIZE)
+def get_business_day_bitmap(
+    year: int, weekend: Tuple[int, ...], holiday_dates: Tuple[str, ...]
+) -> np.ndarray:
+    """
+    指定された年の営業日のビットマップを生成
+
+    Args:
+        year: 年
+        weekend: 週末の曜日（date.weekday()の値）のタプル
+        holiday_dates: 祝日の日付（YYYY-MM-DD形式）のタプル
+
+    Returns:
+        np.ndarray: 年初からの日ごとに営業日ならTrueの配列（読み取り専用）
+    """
+    start_date = date(year, 1, 1)
+    days_in_year = (date(year + 1, 1, 1) - start_date).days
+
+    weekdays = (np.arange(days_in_year) + start_date.weekday()) % 7
+    bitmap = ~np.isin(weekdays, weekend)
+    offsets = [(date.fromisoformat(d) - start_date).days for d in holiday_dates]
+    bitmap[[offset for offset in offsets if 0 <= offset < days_in_year]] = False
+    bitmap.flags.writeable = False
+    return bitmap
+
+
+class BusinessCalendar:
+    """
+    連続した期間の営業日カレンダー
+
+    営業日のビットマップの累積和を持ち、期間内の営業日数はO(1)、
+    N営業日後の日付は二分探索でO(log n)で求める。
+    日付の配列をまとめて計算する一括版のメソッドもある。
+    """
+
+    def __init__(self, first_day: date, is_business_day: np.ndarray):
+        """
+        Args:
+            first_day: カレンダーの初日
+            is_business_day: 初日からの日ごとに営業日ならTrueの配列
+        """
+        self.first_day = first_day
+        self.last_day = first_day + timedelta(days=len(is_business_day) - 1)
+        self._first_day64 = np.datetime64(first_day, "D")
+        self._is_business_day = is_business_day
+        # _prefix[i] は初日からi日分（i日目を含まない）の営業日数
+        self._prefix = np.zeros(len(is_business_day) + 1, dtype=np.int64)
+        np.cumsum(is_business_day, out=self._prefix[1:])
+
+    def is_business_day(self, day: date) -> bool:
+        """
+        営業日か判定する
+
+        Raises:
+            ValueError: 日付がカレンダーの期間外の場合
+        """
+        return bool(self._is_business_day[self._offsets(day)])
+
+    def business_days_between(self, start: date, end: date) -> int:
+        """
+        期間内の営業日数を計算する
+
+        Args:
+            start: 開始日（この日を含む）
+            end: 終了日（この日を含まない）
+
+        Returns:
+            int: 営業日数（endがstartより前の場合は負の値）
+
+        Raises:
+            ValueError: 日付がカレンダーの期間外の場合
+        """
+        return int(self.business_days_between_many([start], [end])[0])
+
+    def add_business_days(self, day: date, n: int) -> date:
+        """
+        N営業日後（Nが負の場合はN営業日前）の日付を計算する
+
+        Args:
+            day: 基準日（営業日でなくてもよい）
+            n: 営業日数（0の場合は基準日をそのまま返す）
+
+        Returns:
+            date: 基準日より後（前）のN番目の営業日
+
+        Raises:
+            ValueError: 日付または結果がカレンダーの期間外の場合
+        """
+        return self.add_business_days_many([day], [n])[0].astype(date)
+
+    def next_business_day(self, day: date) -> date:
+        """基準日より後の最初の営業日を計算する"""
+        return self.add_business_days(day, 1)
+
+    def previous_business_day(self, day: date) -> date:
+        """基準日より前の最後の営業日を計算する"""
+        return self.add_business_days(day, -1)
+
+    def business_days_between_many(self, starts, ends) -> np.ndarray:
+        """
+        複数の期間の営業日数をまとめて計算する
+
+        Args:
+            starts: 開始日（この日を含む）の配列
+            ends: 終了日（この日を含まない）の配列
+
+        Returns:
+            np.ndarray: 期間ごとの営業日数の配列
+
+        Raises:
+            ValueError: 日付がカレンダーの期間外の場合
+        """
+        start_offsets = self._offsets(starts, allow_end=True)
+        end_offsets = self._offsets(ends, allow_end=True)
+        return self._prefix[end_offsets] - self._prefix[start_offsets]
+
+    def add_business_days_many(self, days, n) -> np.ndarray:
+        """
+        複数の日付のN営業日後をまとめて計算する
+
+        Args:
+            days: 基準日の配列
+            n: 営業日数の配列（またはすべての基準日に共通の整数）
+
+        Returns:
+            np.ndarray: 結果の日付（datetime64[D]）の配列
+
+        Raises:
+            ValueError: 日付または結果がカレンダーの期間外の場合
+        """
+        offsets = self._offsets(days)
+        n = np.broadcast_to(np.asarray(n, dtype=np.int64), offsets.shape)
+
+        # 求める営業日までの累積営業日数（前方は基準日を含まず、後方は基準日を含まない）
+        targets = np.where(
+            n > 0, self._prefix[offsets + 1] + n, self._prefix[offsets] + n + 1
+        )
+        if np.any((n != 0) & ((targets < 1) | (targets > self._prefix[-1]))):
+            raise ValueError("result is outside of the calendar range")
+        results = np.searchsorted(self._prefix, targets, side="left") - 1
+        results = np.where(n == 0, offsets, results)
+        return self._first_day64 + results
+
+    def _offsets(self, days, allow_end: bool = False) -> np.ndarray:
+        """日付（または日付の配列）をカレンダーの初日からの日数に変換する"""
+        offsets = (np.asarray(days, dtype="datetime64[D]") - self._first_day64).astype(
+            np.int64
+        )
+        limit = len(self._is_business_day) + (1 if allow_end else 0)
+        if np.any((offsets < 0) | (offsets >= limit)):
+            raise ValueError(
+                f"date must be between {self.first_day} and {self.last_day}"
+            )
+        return offsets
+
+
+def _holiday_dates(
+    year: int, country_code: str, subdivision: Optional[str]
+) -> Tuple[str, ...]:
+    """営業日の計算に使う祝日の日付を取得する"""
+    return tuple(
+        sorted(
+            holiday.date
+            for holiday in holiday_service.get_public_holidays(year, country_code)
+            if holiday.applies_to(subdivision)
+        )
+    )
+
+
+# 作成済みのカレンダー（古い順）。祝日一覧と同じ期間だけ使い回し、
+# 祝日一覧がキャッシュから追い出されたらその年を含むカレンダーを削除する
+_calendars: "OrderedDict[CalendarKey, Tuple[float, BusinessCalendar]]" = OrderedDict()
+_calendars_lock = threading.Lock()
+
+
+def _on_cache_eviction(key: str) -> None:
+    """キャッシュから追い出された祝日一覧を使ったカレンダーを削除する"""
+    parts = key.split("/")
+    if len(parts) != 3 or parts[0] != "PublicHolidays":
+        return
+    year, country_code = int(parts[1]), parts[2]
+    with _calendars_lock:
+        for calendar_key in [
+            k for k in _calendars if k[0] == country_code and k[1] <= year <= k[2]
+        ]:
+            del _calendars[calendar_key]
+
+
+api_cache.add_eviction_listener(_on_cache_eviction)
+
+
+def clear_calendar_cache() -> None:
+    """作成済みのカレンダーをすべて削除する"""
+    with _calendars_lock:
+        _calendars.clear()
+
+
+def _build_calendar(
+    country_code: str,
+    year_min: int,
+    year_max: int,
+    weekend: Tuple[int, ...],
+    subdivision: Optional[str],
+) -> BusinessCalendar:
+    """年ごとのビットマップをつなげてカレンダーを作成する"""
+    bitmaps = [
+        get_business_day_bitmap(
+            year, weekend, _holiday_dates(year, country_code, subdivision)
+        )
+        for year in range(year_min, year_max + 1)
+    ]
+    return BusinessCalendar(date(year_min, 1, 1), np.concatenate(bitmaps))
+
+
+def get_business_calendar(
+    country_code: str,
+    year_min: int,
+    year_max: int,
+    weekend: Sequence[int] = WEEKEND_DAYS,
+    subdivision: Optional[str] = None,
+) -> BusinessCalendar:
+    """
+    指定された国と期間の営業日カレンダーを取得
+
+    作成したカレンダーは(国, 期間, 週末, 州・県)ごとに使い回すため、2回目以降は
+    辞書を1回引くだけで返す。祝日一覧は共通のキャッシュから取得する。
+
+    Args:
+        country_code: 国コード（例: "JP"）
+        year_min: 最初の年
+        year_max: 最後の年
+        weekend: 週末の曜日（date.weekday()の値、例: 金曜・土曜なら(4, 5)）
+        subdivision: 州・県のコード（ISO-3166-2）
+
+    Returns:
+        BusinessCalendar: year_minの1月1日からyear_maxの12月31日までのカレンダー
+
+    Raises:
+        ValueError: 年の範囲や週末の指定が不正な場合
+        requests.RequestException: 祝日一覧の取得に失敗した場合
+    """
+    if year_min > year_max:
+        raise ValueError("year_min must be <= year_max")
+    weekend = _validate_weekend(weekend)
+    key = (country_code, year_min, year_max, weekend, subdivision)
+    with _calendars_lock:
+        cached = _calendars.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            _calendars.move_to_end(key)
+            return cached[1]
+
+    calendar = _build_calendar(country_code, year_min, year_max, weekend, subdivision)
+    with _calendars_lock:
+        _calendars[key] = (time.monotonic() + API_CACHE_TTL, calendar)
+        _calendars.move_to_end(key)
+        while len(_calendars) > BUSINESS_DAY_CACHE_SIZE:
+            _calendars.popitem(last=False)
+    return calendar
+
+
+def business_days_between(
+    country_code: str,
+    start: date,
+    end: date,
+    weekend: Sequence[int] = WEEKEND_DAYS,
+    subdivision: Optional[str] = None,
+) -> int:
+    """
+    指定された国の期間内の営業日数を計算
+
+    Args:
+        country_code: 国コード（例: "JP"）
+        start: 開始日（この日を含む）
+        end: 終了日（この日を含まない）
+        weekend: 週末の曜日（date.weekday()の値）
+        subdivision: 州・県のコード（ISO-3166-2）
+
+    Returns:
+        int: 営業日数（endがstartより前の場合は負の値）
+
+    Raises:
+        requests.RequestException: 祝日一覧の取得に失敗した場合
+    """
+    first, last = min(start, end), max(start, end)
+    calendar = get_business_calendar(
+        country_code, first.year, last.year, weekend, subdivision
+    )
+    return calendar.business_days_between(start, end)
+
+
+def add_business_days(
+    country_code: str,
+    day: date,
+    n: int,
+    weekend: Sequence[int] = WEEKEND_DAYS,
+    subdivision: Optional[str] = None,
+) -> date:
+    """
+    指定された国でN営業日後（Nが負の場合はN営業日前）の日付を計算
+
+    Args:
+        country_code: 国コード（例: "JP"）
+        day: 基準日
+        n: 営業日数
+        weekend: 週末の曜日（date.weekday()の値）
+        subdivision: 州・県のコード（ISO-3166-2）
+
+    Returns:
+        date: 基準日より後（前）のN番目の営業日
+
+    Raises:
+        ValueError: 基準日または結果が取得できる年（YEAR_MIN〜YEAR_MAX）の範囲外の場合
+        requests.RequestException: 祝日一覧の取得に失敗した場合
+    """
+    if not YEAR_MIN <= day.year <= YEAR_MAX:
+        raise ValueError(f"date must be between {YEAR_MIN} and {YEAR_MAX}")
+
+    # 結果が収まるまでカレンダーの期間を広げる（取得できる年の範囲まで）
+    span = 0
+    while True:
+        year_min = max(YEAR_MIN, day.year - (span if n < 0 else 0))
+        year_max = min(YEAR_MAX, day.year + (span if n > 0 else 0))
+        calendar = get_business_calendar(
+            country_code, year_min, year_max, weekend, subdivision
+        )
+        try:
+            return calendar.add_business_days(day, n)
+        except ValueError:
+            if (n < 0 and year_min == YEAR_MIN) or (n > 0 and year_max == YEAR_MAX):
+                raise ValueError(
+                    f"result is outside of the years {YEAR_MIN} to {YEAR_MAX}"
+                ) from None
+            span = span * 2 + 1
+
+
+def next_business_day(
+    country_code: str,
+    day: date,
+    weekend: Sequence[int] = WEEKEND_DAYS,
+    subdivision: Optional[str] = None,
+) -> date:
+    """
+    指定された国で基準日より後の最初の営業日を計算
+
+    Args:
+        country_code: 国コード（例: "JP"）
+        day: 基準日
+        weekend: 週末の曜日（date.weekday()の値）
+        subdivision: 州・県のコード（ISO-3166-2）
+
+    Returns:
+        date: 次の営業日
+
+    Raises:
+        requests.RequestException: 祝日一覧の取得に失敗した場合
+    """
+    return add_business_days(country_code, day, 1, weekend, subdivision)
@@ -0,0 +1,514 @@
+"""APIリソースのキャッシュ（プロセス内で共有する単一のキャッシュ層）"""
+
+import copy
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from constants import (
+    API_CACHE_TTL,
+    API_CACHE_MAX_ENTRIES,
+    API_CACHE_MAX_BYTES,
+    NEGATIVE_CACHE_TTL,
+    NEGATIVE_CACHE_STATUS_CAUSES,
+)
+
+
+@dataclass
+class CacheEntry:
+    """
+    キャッシュの1エントリ
+
+    errorが設定されている場合は、取得に失敗したことを記録するネガティブエントリ
+    """
+
+    value: Any
+    expires_at: float
+    size: int = 0
+    error: Optional[Exception] = None
+    cause: Optional[str] = None
+
+
+@dataclass
+class _KeyLock:
+    """キーごとの取得用のロックと、それを使っているスレッド数"""
+
+    lock: threading.Lock
+    users: int = 0
+
+
+def http_negative_cause(error: Exception) -> Optional[str]:
+    """
+    取得失敗をネガティブキャッシュするかを判定する
+
+    Args:
+        error: 取得時に発生した例外
+
+    Returns:
+        str: ネガティブキャッシュする場合はその原因（例: "not_found"）、しない場合はNone
+    """
+    response = getattr(error, "response", None)
+    status_code = getattr(response, "status_code", None)
+    return NEGATIVE_CACHE_STATUS_CAUSES.get(status_code)
+
+
+def _copy_negative_error(entry: CacheEntry) -> Exception:
+    """
+    ネガティブエントリの例外をヒットごとに作り直す
+
+    同じ例外のインスタンスを複数のスレッドから送出すると、トレースバックや
+    __context__が上書きし合うため、型と属性（responseなど）を引き継いだ
+    新しいインスタンスを作る。
+
+    Args:
+        entry: ネガティブエントリ
+
+    Returns:
+        Exception: 記録した原因をnegative_causeに持つ新しい例外
+    """
+    error = copy.copy(entry.error)
+    error.negative_cause = entry.cause
+    return error
+
+
+def http_not_modified(error: Exception) -> bool:
+    """
+    取得失敗が「変更なし」（304 Not Modified）を表すか判定する
+
+    Args:
+        error: 取得時に発生した例外
+
+    Returns:
+        bool: 304の場合True
+    """
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 304
+
+
+def estimate_size(value: Any, _seen: Optional[Set[int]] = None) -> int:
+    """
+    値が使用するメモリ量（バイト）を概算する
+
+    タプル・リスト・辞書・データクラスなどを再帰的にたどり、
+    同じオブジェクトは1回だけ数える。
+
+    Args:
+        value: 対象の値
+
+    Returns:
+        int: 概算のバイト数
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return size
+    if isinstance(value, Mapping):
+        items = value.items()
+        if not isinstance(value, dict):
+            # MappingProxyTypeなどは中身の辞書の分も数える
+            size += sys.getsizeof(dict(items))
+        return size + sum(
+            estimate_size(k, seen) + estimate_size(v, seen) for k, v in items
+        )
+    if isinstance(value, (tuple, list, set, frozenset)):
+        return size + sum(estimate_size(item, seen) for item in value)
+    if hasattr(value, "__dict__"):
+        return size + estimate_size(vars(value), seen)
+    return size
+
+
+class ApiCache:
+    """
+    APIリソースをキーとするTTL付きLRUキャッシュ
+
+    キーはAPIのリソースパス（例: "PublicHolidays/2025/JP"）で、
+    同じリソースはプロセス内で1回だけ取得・保持される。
+    同じキーへの同時アクセスは1回の取得にまとめられる。
+    エントリ数とメモリ量（概算バイト数）の両方に上限があり、
+    超えた場合は最も古く使われたエントリから削除する。
+    存在しない国や不正な年などの取得失敗は、原因とともに短い期間だけ
+    キャッシュし（ネガティブキャッシュ）、同じ例外を再送出する。
+    それ以外の一時的な取得失敗では、期限切れの値が残っていればそれを返す。
+    期限切れの値が残っている場合は再検証用の関数で取得し、変更がなければ
+    （304 Not Modified）値をそのまま使って有効期限だけを延ばす。
+    """
+
+    def __init__(
+        self,
+        ttl: float = API_CACHE_TTL,
+        max_entries: int = API_CACHE_MAX_ENTRIES,
+        max_bytes: int = API_CACHE_MAX_BYTES,
+        negative_ttl: float = NEGATIVE_CACHE_TTL,
+        negative_cause: Callable[[Exception], Optional[str]] = http_negative_cause,
+        not_modified: Callable[[Exception], bool] = http_not_modified,
+        clock: Callable[[], float] = time.monotonic,
+        sizer: Callable[[Any], int] = estimate_size,
+    ):
+        """
+        Args:
+            ttl: エントリの有効期間（秒）
+            max_entries: 保持するエントリ数の上限
+            max_bytes: 保持するメモリ量（概算バイト数）の上限
+            negative_ttl: ネガティブエントリの有効期間（秒）
+            negative_cause: 例外からネガティブキャッシュの原因を判定する関数
+            not_modified: 例外が「変更なし」を表すか判定する関数
+            clock: 現在時刻を返す関数（テスト用）
+            sizer: 値のバイト数を概算する関数
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl
+        self._negative_cause = negative_cause
+        self._not_modified = not_modified
+        self._clock = clock
+        self._sizer = sizer
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, _KeyLock] = {}
+        self._eviction_listeners: List[Callable[[str], None]] = []
+
+        # 統計情報
+        self._hits = 0
+        self._negative_hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._evictions = 0
+        self._evicted_bytes = 0
+        self._expirations = 0
+        self._rejections = 0
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        revalidator: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        """
+        キャッシュから値を取得し、なければloaderで取得して保存する
+
+        Args:
+            key: リソースのキー
+            loader: 値を取得する関数（例外はそのまま送出される）
+            revalidator: 期限切れの値が残っている場合に使う取得関数
+                （条件付きリクエストなど。変更がなければ304の例外を送出する）
+
+        Returns:
+            Any: キャッシュされた値
+
+        Raises:
+            Exception: loaderの例外、またはネガティブキャッシュされた例外
+        """
+        with self._lock:
+            entry = self._get_fresh_entry(key)
+            if entry is not None:
+                return self._use_entry(entry)
+            key_lock = self._key_locks.get(key)
+            if key_lock is None:
+                key_lock = self._key_locks[key] = _KeyLock(threading.Lock())
+            key_lock.users += 1
+
+        try:
+            with key_lock.lock:
+                # 待っている間に他のスレッドが取得済みならそれを使う
+                with self._lock:
+                    entry = self._get_fresh_entry(key)
+                    if entry is not None:
+                        return self._use_entry(entry)
+                    self._misses += 1
+                    has_stale = key in self._entries
+                    if has_stale:
+                        self._expirations += 1
+
+                try:
+                    value, renewed = self._load(key, loader, revalidator, has_stale)
+                except Exception as e:
+                    cause = self._negative_cause(e)
+                    if cause is not None:
+                        self._set_negative(key, e, cause)
+                        raise
+                    # 一時的な失敗なら期限切れの値があればそれを返す
+                    stale = self._get_stale_entry(key)
+                    if stale is None:
+                        raise
+                    return stale.value
+                if not renewed:
+                    self.set(key, value)
+                return value
+        finally:
+            # 待っているスレッドが残っている間はロックを削除しない
+            # （削除すると後から来たスレッドが別のロックで同時に取得してしまう）
+            with self._lock:
+                key_lock.users -= 1
+                if key_lock.users == 0:
+                    del self._key_locks[key]
+
+    def _load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        revalidator: Optional[Callable[[], Any]],
+        has_stale: bool,
+    ) -> Tuple[Any, bool]:
+        """
+        値を取得する
+
+        Returns:
+            Tuple[Any, bool]: 値と、期限切れの値を再検証して使い続けるか
+        """
+        if revalidator is None or not has_stale:
+            return loader(), False
+        try:
+            return revalidator(), False
+        except Exception as e:
+            if not self._not_modified(e):
+                raise
+        entry = self._renew(key)
+        if entry is None:
+            # 再検証中に期限切れの値が削除された場合は改めて取得する
+            return loader(), False
+        return entry.value, True
+
+    def _renew(self, key: str) -> Optional[CacheEntry]:
+        """期限切れの値の有効期限を延ばす"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.error is not None:
+                return None
+            entry.expires_at = self._clock() + self.ttl
+            self._entries.move_to_end(key)
+            self._revalidations += 1
+            return entry
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        キャッシュから値を取得する（取得処理は行わない）
+
+        Returns:
+            Any: キャッシュされた値、なければNone
+        """
+        with self._lock:
+            entry = self._get_fresh_entry(key)
+            if entry is None or entry.error is not None:
+                return None
+            self._hits += 1
+            return entry.value
+
+    def contains(self, key: str) -> bool:
+        """
+        有効なエントリ（ネガティブエントリを含む）があるか判定する
+
+        ヒット数やLRUの順序は変えないため、先読みなどの判定に使う。
+
+        Returns:
+            bool: 期限内のエントリがある場合True
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.expires_at > self._clock()
+
+    def get_negative_cause(self, key: str) -> Optional[str]:
+        """
+        ネガティブキャッシュされている原因を取得する
+
+        Returns:
+            str: 原因（例: "not_found"）、ネガティブエントリがなければNone
+        """
+        with self._lock:
+            entry = self._get_fresh_entry(key)
+            return entry.cause if entry is not None else None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        キャッシュに値を保存する
+
+        値が単体でメモリ上限を超える場合は保存しない。
+        """
+        self._store(
+            key, CacheEntry(value, self._clock() + self.ttl, self._sizer(value))
+        )
+
+    def _set_negative(self, key: str, error: Exception, cause: str) -> None:
+        """取得失敗を原因とともにネガティブエントリとして保存する"""
+        size = self._sizer((cause, str(error)))
+        self._store(
+            key,
+            CacheEntry(
+                None,
+                self._clock() + self.negative_ttl,
+                size,
+                error=error,
+                cause=cause,
+            ),
+        )
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        """エントリを保存し、上限を超えた分を削除する"""
+        evicted_keys = []
+        with self._lock:
+            self._remove(key)
+            if entry.size > self.max_bytes:
+                self._rejections += 1
+                return
+
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self._evictions += 1
+                self._evicted_bytes += evicted.size
+                evicted_keys.append(evicted_key)
+            listeners = list(self._eviction_listeners)
+
+        for evicted_key in evicted_keys:
+            for listener in listeners:
+                listener(evicted_key)
+
+    def add_eviction_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        上限超過でエントリが削除されたときに呼ばれる関数を登録する
+
+        Args:
+            listener: 削除されたキーを受け取る関数
+        """
+        with self._lock:
+            self._eviction_listeners.append(listener)
+
+    def invalidate(self, key: str) -> None:
+        """指定されたキーのエントリを削除する"""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """すべてのエントリと統計情報を削除する"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._negative_hits = 0
+            self._stale_hits = 0
+            self._misses = 0
+            self._revalidations = 0
+            self._evictions = 0
+            self._evicted_bytes = 0
+            self._expirations = 0
+            self._rejections = 0
+
+    def keys(self, prefix: str = "") -> List[str]:
+        """
+        有効なエントリのキーを取得する
+
+        Args:
+            prefix: キーの接頭辞（例: "PublicHolidays/"）
+
+        Returns:
+            List[str]: キーのリスト
+        """
+        now = self._clock()
+        with self._lock:
+            return [
+                key
+                for key, entry in self._entries.items()
+                if key.startswith(prefix)
+                and entry.expires_at > now
+                and entry.error is None
+            ]
+
+    def stats(self) -> dict:
+        """
+        キャッシュの統計情報を取得する
+
+        Returns:
+            dict: 以下のキーを持つ辞書
+                - entries: 現在のエントリ数
+                - max_entries: エントリ数の上限
+                - bytes: 現在のメモリ使用量（概算バイト数）
+                - max_bytes: メモリ使用量の上限
+                - occupancy: メモリ使用率（0〜1）
+                - hits: ヒット数（ネガティブエントリへのヒットを含む）
+                - negative_hits: ネガティブエントリへのヒット数
+                - negative_entries: 現在のネガティブエントリ数
+                - stale_hits: 取得失敗時に期限切れの値を返した回数
+                - misses: ミス数（取得処理を行った回数）
+                - revalidations: 再検証で変更がなく、有効期限だけを延ばした回数
+                - evictions: 上限超過で削除されたエントリ数
+                - evicted_bytes: 上限超過で削除されたバイト数
+                - expirations: 期限切れのため再取得した回数
+                - rejections: 大きすぎて保存しなかった値の数
+                - hit_rate: ヒット率（0〜1）
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "occupancy": self._bytes / self.max_bytes if self.max_bytes else 0.0,
+                "hits": self._hits,
+                "negative_hits": self._negative_hits,
+                "negative_entries": sum(
+                    1 for entry in self._entries.values() if entry.error is not None
+                ),
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "revalidations": self._revalidations,
+                "evictions": self._evictions,
+                "evicted_bytes": self._evicted_bytes,
+                "expirations": self._expirations,
+                "rejections": self._rejections,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def _use_entry(self, entry: CacheEntry) -> Any:
+        """ヒットしたエントリの値を返す（ネガティブエントリなら例外を送出）"""
+        self._hits += 1
+        if entry.error is not None:
+            self._negative_hits += 1
+            raise _copy_negative_error(entry) from entry.error
+        return entry.value
+
+    def _remove(self, key: str) -> None:
+        """エントリを削除する（ロック取得済みで呼ぶ）"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _get_fresh_entry(self, key: str) -> Optional[CacheEntry]:
+        """
+        有効なエントリを取得する（ロック取得済みで呼ぶ）
+
+        期限切れの値は取得失敗時に返せるよう、上限超過で削除されるまで残しておく。
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self._clock():
+            if entry.error is not None:
+                self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _get_stale_entry(self, key: str) -> Optional[CacheEntry]:
+        """期限切れでも残っている値のエントリを取得する"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.error is not None:
+                return None
+            self._stale_hits += 1
+            return entry
+
+
+# プロセス共通のキャッシュ
+api_cache = ApiCache()
@@ -0,0 +1,225 @@
+"""
+祝日データの一括エクスポート（国×年ごとのParquet / CSVファイル）
+
+(国, 年)ごとに祝日一覧を取得してすぐにファイルへ書き出すため、
+全体をメモリに持たずにエクスポートできる。ファイルは一時ファイルに書いてから
+名前を変えるので、中断した後に再実行すると書き出し済みの(国, 年)は省略する。
+"""
+
+import csv
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple
+import repository
+from models import Holiday
+from constants import YEAR_MIN, YEAR_MAX, EXPORT_FORMATS, EXPORT_MAX_WORKERS
+
+# ファイルに書き出す列（国コードと年はディレクトリ名に含める）
+EXPORT_COLUMNS = ("date", "name", "local_name", "counties")
+
+# CSVで対象の州・県を区切る文字（全国の祝日は空欄）
+CSV_COUNTIES_SEPARATOR = ";"
+
+
+def partition_path(
+    output_dir: Path, country_code: str, year: int, file_format: str
+) -> Path:
+    """
+    (国, 年)のファイルのパスを取得する
+
+    Hive形式（country_code=JP/year=2025）のディレクトリに置くため、
+    Parquetはpandasやpyarrowでディレクトリごと読み込める。
+
+    Args:
+        output_dir: エクスポート先のディレクトリ
+        country_code: 国コード
+        year: 年
+        file_format: ファイル形式（"parquet" または "csv"）
+
+    Returns:
+        Path: ファイルのパス
+    """
+    return (
+        Path(output_dir)
+        / f"country_code={country_code}"
+        / f"year={year}"
+        / f"part.{file_format}"
+    )
+
+
+def write_partition(path: Path, holidays: Sequence[Holiday], file_format: str) -> int:
+    """
+    1つの(国, 年)の祝日一覧をファイルに書き出す
+
+    一時ファイルに書いてから名前を変えるため、途中で中断しても
+    書きかけのファイルは残らない。祝日がない場合も空のファイルを書き出す。
+
+    Args:
+        path: 書き出すファイルのパス
+        holidays: 祝日のリスト
+        file_format: ファイル形式（"parquet" または "csv"）
+
+    Returns:
+        int: 書き出したファイルのバイト数
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    if file_format == "parquet":
+        # Parquetを書き出すときだけ読み込む
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table(
+            {
+                "date": pa.array(
+                    [date.fromisoformat(h.date) for h in holidays], pa.date32()
+                ),
+                "name": pa.array([h.name for h in holidays], pa.string()),
+                "local_name": pa.array([h.local_name for h in holidays], pa.string()),
+                # 全国の祝日はnull、地域の祝日は対象の州・県のリスト
+                "counties": pa.array(
+                    [
+                        list(h.counties) if h.counties is not None else None
+                        for h in holidays
+                    ],
+                    pa.list_(pa.string()),
+                ),
+            }
+        )
+        pq.write_table(table, tmp_path)
+    else:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_COLUMNS)
+            writer.writerows(
+                (
+                    h.date,
+                    h.name,
+                    h.local_name,
+                    CSV_COUNTIES_SEPARATOR.join(h.counties or ()),
+                )
+                for h in holidays
+            )
+
+    os.replace(tmp_path, path)
+    return path.stat().st_size
+
+
+def export_public_holidays(
+    country_codes: Sequence[str],
+    year_min: int,
+    year_max: int,
+    output_dir: Path,
+    file_format: str = "parquet",
+    max_workers: int = EXPORT_MAX_WORKERS,
+    progress: Optional[Callable[[dict], None]] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> dict:
+    """
+    複数の国と年の祝日一覧を(国, 年)ごとのファイルにエクスポートする
+
+    祝日一覧は並行して取得し、取得したスレッドでそのまま書き出す。
+    画面用のキャッシュとインデックスは使わずにリポジトリから直接取得し、
+    再検証しないため検証用の値（ETag等）も保存しない。全ての国と年を
+    エクスポートしてもメモリ使用量は増えない。
+    書き出し済みのファイルがある(国, 年)は省略する（中断後の再開）。
+    取得に失敗した(国, 年)はファイルを書かず、再実行で再び取得する。
+
+    Args:
+        country_codes: 国コードのリスト
+        year_min: 最初の年
+        year_max: 最後の年
+        output_dir: エクスポート先のディレクトリ
+        file_format: ファイル形式（"parquet" または "csv"）
+        max_workers: 並行して取得するスレッド数
+        progress: (国, 年)が終わるたびに途中経過のメトリクスを受け取る関数
+        clock: 所要時間の計測に使う時計
+
+    Returns:
+        dict: 以下のキーを持つ辞書
+            - partitions: 対象の(国, 年)の数
+            - written: 書き出した数
+            - skipped: 書き出し済みで省略した数
+            - failed: 取得または書き出しに失敗した数
+            - rows: 書き出した祝日の件数
+            - bytes: 書き出したバイト数
+            - duration: 所要時間（秒）
+            - partitions_per_second: 1秒あたりに書き出した(国, 年)の数
+            - rows_per_second: 1秒あたりに書き出した祝日の件数
+            - errors: 失敗した(国コード, 年, エラーメッセージ)のリスト
+
+    Raises:
+        ValueError: ファイル形式または年の範囲が不正な場合
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"file_format must be one of {EXPORT_FORMATS}")
+    if not YEAR_MIN <= year_min <= year_max <= YEAR_MAX:
+        raise ValueError(f"years must be within {YEAR_MIN}-{YEAR_MAX}")
+
+    output_dir = Path(output_dir)
+    keys = [
+        (country_code, year)
+        for country_code in dict.fromkeys(country_codes)
+        for year in range(year_min, year_max + 1)
+    ]
+    started_at = clock()
+    metrics = {
+        "partitions": len(keys),
+        "written": 0,
+        "skipped": 0,
+        "failed": 0,
+        "rows": 0,
+        "bytes": 0,
+        "errors": [],
+    }
+
+    def snapshot() -> dict:
+        duration = clock() - started_at
+        result = dict(metrics, errors=list(metrics["errors"]), duration=duration)
+        result["partitions_per_second"] = (
+            metrics["written"] / duration if duration > 0 else 0.0
+        )
+        result["rows_per_second"] = metrics["rows"] / duration if duration > 0 else 0.0
+        return result
+
+    def export_one(country_code: str, year: int) -> Tuple[int, int]:
+        holidays = repository.get_public_holidays(
+            year, country_code, store_validators=False
+        )
+        path = partition_path(output_dir, country_code, year, file_format)
+        return len(holidays), write_partition(path, holidays, file_format)
+
+    missing = []
+    for country_code, year in keys:
+        if partition_path(output_dir, country_code, year, file_format).exists():
+            metrics["skipped"] += 1
+        else:
+            missing.append((country_code, year))
+
+    if missing:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(missing)), thread_name_prefix="export"
+        ) as executor:
+            futures = {
+                executor.submit(export_one, country_code, year): (country_code, year)
+                for country_code, year in missing
+            }
+            for future in as_completed(futures):
+                country_code, year = futures[future]
+                try:
+                    rows, size = future.result()
+                except Exception as e:
+                    metrics["failed"] += 1
+                    metrics["errors"].append((country_code, year, str(e)))
+                else:
+                    metrics["written"] += 1
+                    metrics["rows"] += rows
+                    metrics["bytes"] += size
+                if progress is not None:
+                    progress(snapshot())
+
+    return snapshot()
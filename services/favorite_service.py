@@ -157,7 +157,6 @@ def update_favorites_from_search(
     current_favorites: List[Holiday],
     edited_df: pd.DataFrame,
     holidays: List[Holiday],
-    selected_country_code: str,
 ) -> List[Holiday]:
     """
     検索結果からお気に入りを更新する（追加のみ、削除は不可）
@@ -166,7 +165,6 @@ def update_favorites_from_search(
         current_favorites: 現在のお気に入りリスト
         edited_df: 編集されたデータフレーム（お気に入り列を含む）
         holidays: 検索結果の祝日リスト
-        selected_country_code: 選択された国コード
 
     Returns:
         List[Holiday]: 更新後のお気に入りリスト
@@ -0,0 +1,627 @@
+"""取得済みの祝日データをメモリ上に保持するインデックス"""
+
+import heapq
+import re
+import threading
+from bisect import bisect_left
+import unicodedata
+from datetime import date, timedelta
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from models import Holiday
+from constants import NAME_SEARCH_MIN_SCORE, NAME_SEARCH_LIMIT
+
+# 祝日名の類似判定に使わない語
+NAME_STOPWORDS = frozenset({"a", "and", "day", "for", "in", "of", "on", "s", "the"})
+
+# 登録した祝日のID（国コード, 年, 日付順の位置）
+_EntryId = Tuple[str, int, int]
+
+
+def normalize_holiday_name(name: str) -> Tuple[str, ...]:
+    """
+    祝日名を正規化したトークンに分割する
+
+    Args:
+        name: 祝日名（例: "Independence Day"）
+
+    Returns:
+        Tuple[str, ...]: 重複と一般的な語を除いたトークン（例: ("independence",)）
+    """
+    normalized = unicodedata.normalize("NFKC", name or "").lower()
+    tokens = []
+    for token in re.findall(r"\w+", normalized):
+        if token not in NAME_STOPWORDS and token not in tokens:
+            tokens.append(token)
+    return tuple(tokens)
+
+
+def name_trigrams(text: str) -> FrozenSet[str]:
+    """
+    あいまい検索用に文字列をトライグラムに分割する
+
+    語ごとに前後へ空白を付けてから3文字ずつ切り出すため、
+    語の先頭・末尾の一致が重視される（例: "建国" -> {" 建国", "建国 "}）。
+
+    Args:
+        text: 祝日名や検索語
+
+    Returns:
+        FrozenSet[str]: トライグラムの集合
+    """
+    normalized = unicodedata.normalize("NFKC", text or "").lower()
+    grams = set()
+    for word in re.findall(r"\w+", normalized):
+        padded = f" {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _holiday_trigrams(holiday: Holiday) -> FrozenSet[str]:
+    """祝日の英語名と現地名のトライグラム"""
+    return name_trigrams(holiday.name) | name_trigrams(holiday.local_name)
+
+
+@dataclass(frozen=True)
+class HolidayColumns:
+    """
+    期間検索の結果（日付・国コード順の列ごとの配列）
+
+    Attributes:
+        dates: 日付（datetime64[D]）
+        country_codes: 国コード
+        names: 英語名
+        local_names: 現地名
+        holidays: 祝日（Holiday）
+    """
+
+    dates: np.ndarray
+    country_codes: np.ndarray
+    names: np.ndarray
+    local_names: np.ndarray
+    holidays: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+@dataclass(frozen=True)
+class _CountryPartition:
+    """国ごとの全ての年の祝日を日付順に並べた列（期間検索用）"""
+
+    ordinals: np.ndarray
+    names: np.ndarray
+    local_names: np.ndarray
+    holidays: np.ndarray
+
+
+# 期間検索のキー（国の位置 * _KEY_STRIDE + 日付の序数）で国を区切る幅
+_KEY_STRIDE = date.max.toordinal() + 1
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@dataclass(frozen=True)
+class _RangeTable:
+    """全ての国の祝日を国コード・日付順に並べた表（期間検索用）"""
+
+    positions: Dict[str, int]  # 国コード -> 国の位置（国コード順）
+    keys: np.ndarray  # 国の位置 * _KEY_STRIDE + 日付の序数（昇順）
+    columns: HolidayColumns
+
+
+def _object_array(values: Sequence) -> np.ndarray:
+    """要素をそのまま格納するobject型の配列を作成する"""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+class HolidayIndex:
+    """
+    (国コード, 年)ごとの祝日データのインデックス
+
+    APIから取得した祝日を登録しておくことで、クイズの一括生成などを
+    API呼び出しなしで行えるようにする。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._country_names: Dict[str, str] = {}
+        self._holidays: Dict[Tuple[str, int], Tuple[Holiday, ...]] = {}
+        # (国コード, 年) -> 祝日の日付の序数（_holidaysと同じ順）
+        self._ordinals: Dict[Tuple[str, int], List[int]] = {}
+        # (トークン, 年) -> そのトークンを名前に含む祝日（国ごとに1件）
+        self._name_postings: Dict[Tuple[str, int], List[Holiday]] = {}
+        # 日付（YYYY-MM-DD） -> その日の全ての国の祝日
+        self._by_date: Dict[str, List[Holiday]] = {}
+        # 月日（MM-DD） -> その月日の全ての年・国の祝日
+        self._by_month_day: Dict[str, List[Holiday]] = {}
+        # トライグラム -> 英語名か現地名にそのトライグラムを含む祝日のID
+        # （Holidayの等価性は日付と国コードだけで判定するため、同じ日の祝日を
+        # 区別できるよう(国コード, 年, 位置)のIDで管理する）
+        self._gram_postings: Dict[str, Set[_EntryId]] = {}
+        # 祝日のID -> (祝日, 英語名と現地名のトライグラムの数)
+        self._gram_entries: Dict[_EntryId, Tuple[Holiday, int]] = {}
+        # 国コード -> 登録済みの年
+        self._country_years: Dict[str, Set[int]] = {}
+        # 国コード -> 期間検索用の列（登録が変わった国は次の検索時に作り直す）
+        self._partitions: Dict[str, _CountryPartition] = {}
+        # 国ごとの列をつなげた期間検索用の表（登録が変わったら次の検索時に作り直す）
+        self._range_table: Optional[_RangeTable] = None
+
+    def add_countries(self, countries: Sequence[dict]) -> None:
+        """
+        国一覧を登録する
+
+        Args:
+            countries: 国コードと国名を含む辞書のリスト
+        """
+        with self._lock:
+            for country in countries:
+                self._country_names[country["countryCode"]] = country["name"]
+
+    def add_holidays(
+        self, year: int, country_code: str, holidays: Sequence[Holiday]
+    ) -> None:
+        """
+        指定された年と国の祝日一覧を登録する（既存の登録は置き換える）
+
+        Args:
+            year: 年
+            country_code: 国コード
+            holidays: 祝日のリスト
+        """
+        key = (country_code, year)
+        entries = tuple(sorted(holidays, key=lambda h: h.date))
+        ordinals = [date.fromisoformat(h.date).toordinal() for h in entries]
+        with self._lock:
+            previous = self._holidays.get(key, ())
+            self._holidays[key] = entries
+            self._ordinals[key] = ordinals
+            self._country_years.setdefault(country_code, set()).add(year)
+            self._partitions.pop(country_code, None)
+            self._range_table = None
+            self._remove_name_postings(year, country_code, previous)
+            self._add_name_postings(year, entries)
+            self._remove_date_postings(year, country_code, previous)
+            self._add_date_postings(entries)
+            self._remove_gram_postings(year, country_code, previous)
+            self._add_gram_postings(year, country_code, entries)
+
+    def remove_holidays(self, year: int, country_code: str) -> None:
+        """
+        指定された年と国の祝日一覧の登録を削除する
+
+        Args:
+            year: 年
+            country_code: 国コード
+        """
+        key = (country_code, year)
+        with self._lock:
+            previous = self._holidays.pop(key, ())
+            self._ordinals.pop(key, None)
+            years = self._country_years.get(country_code)
+            if years is not None:
+                years.discard(year)
+                if not years:
+                    del self._country_years[country_code]
+            self._partitions.pop(country_code, None)
+            self._range_table = None
+            self._remove_name_postings(year, country_code, previous)
+            self._remove_date_postings(year, country_code, previous)
+            self._remove_gram_postings(year, country_code, previous)
+
+    def _add_name_postings(self, year: int, holidays: Sequence[Holiday]) -> None:
+        """祝日名の転置インデックスに追加する（ロック取得済みで呼ぶ）"""
+        for holiday in holidays:
+            for token in normalize_holiday_name(holiday.name):
+                postings = self._name_postings.setdefault((token, year), [])
+                if not any(h.country_code == holiday.country_code for h in postings):
+                    postings.append(holiday)
+
+    def _remove_name_postings(
+        self, year: int, country_code: str, holidays: Sequence[Holiday]
+    ) -> None:
+        """祝日名の転置インデックスから削除する（ロック取得済みで呼ぶ）"""
+        for holiday in holidays:
+            for token in normalize_holiday_name(holiday.name):
+                postings = self._name_postings.get((token, year))
+                if postings is None:
+                    continue
+                postings[:] = [h for h in postings if h.country_code != country_code]
+                if not postings:
+                    del self._name_postings[(token, year)]
+
+    def _add_date_postings(self, holidays: Sequence[Holiday]) -> None:
+        """日付の逆引きインデックスに追加する（ロック取得済みで呼ぶ）"""
+        for holiday in holidays:
+            self._by_date.setdefault(holiday.date, []).append(holiday)
+            self._by_month_day.setdefault(holiday.date[5:], []).append(holiday)
+
+    def _remove_date_postings(
+        self, year: int, country_code: str, holidays: Sequence[Holiday]
+    ) -> None:
+        """日付の逆引きインデックスから削除する（ロック取得済みで呼ぶ）"""
+        prefix = f"{year:04d}-"
+        for index, date_keys in (
+            (self._by_date, {h.date for h in holidays}),
+            (self._by_month_day, {h.date[5:] for h in holidays}),
+        ):
+            for date_key in date_keys:
+                postings = index.get(date_key)
+                if postings is None:
+                    continue
+                postings[:] = [
+                    h
+                    for h in postings
+                    if h.country_code != country_code or not h.date.startswith(prefix)
+                ]
+                if not postings:
+                    del index[date_key]
+
+    def _add_gram_postings(
+        self, year: int, country_code: str, holidays: Sequence[Holiday]
+    ) -> None:
+        """トライグラムの転置インデックスに追加する（ロック取得済みで呼ぶ）"""
+        for position, holiday in enumerate(holidays):
+            entry_id = (country_code, year, position)
+            grams = _holiday_trigrams(holiday)
+            self._gram_entries[entry_id] = (holiday, len(grams))
+            for gram in grams:
+                self._gram_postings.setdefault(gram, set()).add(entry_id)
+
+    def _remove_gram_postings(
+        self, year: int, country_code: str, holidays: Sequence[Holiday]
+    ) -> None:
+        """トライグラムの転置インデックスから削除する（ロック取得済みで呼ぶ）"""
+        for position, holiday in enumerate(holidays):
+            entry_id = (country_code, year, position)
+            if self._gram_entries.pop(entry_id, None) is None:
+                continue
+            for gram in _holiday_trigrams(holiday):
+                postings = self._gram_postings.get(gram)
+                if postings is None:
+                    continue
+                postings.discard(entry_id)
+                if not postings:
+                    del self._gram_postings[gram]
+
+    def search_names(
+        self,
+        query: str,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+        limit: int = NAME_SEARCH_LIMIT,
+        min_score: float = NAME_SEARCH_MIN_SCORE,
+    ) -> List[Tuple[Holiday, float]]:
+        """
+        英語名・現地名のあいまい検索をする
+
+        検索語のトライグラムを含む祝日を転置インデックスから集め、
+        一致したトライグラムの割合をスコアとする。スコアが同じ場合は
+        名前が短い（余分なトライグラムが少ない）祝日を上位にする。
+
+        Args:
+            query: 検索語（例: "Independence", "建国"）
+            year_min: 年の下限（省略時は制限なし）
+            year_max: 年の上限（省略時は制限なし）
+            limit: 結果の最大件数
+            min_score: 結果に含める最小のスコア（0〜1）
+
+        Returns:
+            List[Tuple[Holiday, float]]: スコアの高い順の(祝日, スコア)のリスト
+        """
+        query_grams = name_trigrams(query)
+        if not query_grams:
+            return []
+
+        matches: Counter = Counter()
+        with self._lock:
+            for gram in query_grams:
+                matches.update(self._gram_postings.get(gram, ()))
+            entries = {
+                entry_id: self._gram_entries.get(entry_id) for entry_id in matches
+            }
+
+        candidates = []
+        for entry_id, shared in matches.items():
+            entry = entries[entry_id]
+            if entry is None:
+                continue
+            holiday, gram_count = entry
+            score = shared / len(query_grams)
+            year = entry_id[1]
+            if (
+                score >= min_score
+                and (year_min is None or year >= year_min)
+                and (year_max is None or year <= year_max)
+            ):
+                candidates.append((holiday, score, gram_count))
+        # 上位limit件だけを取り出す（候補全体のソートは不要）
+        top = heapq.nsmallest(
+            limit,
+            candidates,
+            key=lambda item: (-item[1], item[2], item[0].date, item[0].country_code),
+        )
+        return [(holiday, score) for holiday, score, _ in top]
+
+    def holidays_on_date(self, day: str) -> Tuple[Holiday, ...]:
+        """
+        指定された日付に祝日がある全ての国の祝日を取得する
+
+        Args:
+            day: 日付（YYYY-MM-DD形式）
+
+        Returns:
+            Tuple[Holiday, ...]: 国コード順の祝日（該当なしの場合は空）
+        """
+        with self._lock:
+            postings = tuple(self._by_date.get(day, ()))
+        return tuple(sorted(postings, key=lambda h: h.country_code))
+
+    def holidays_on_month_day(
+        self,
+        month: int,
+        day: int,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+    ) -> Tuple[Holiday, ...]:
+        """
+        指定された月日に祝日がある全ての年・国の祝日を取得する
+
+        Args:
+            month: 月
+            day: 日
+            year_min: 年の下限（省略時は制限なし）
+            year_max: 年の上限（省略時は制限なし）
+
+        Returns:
+            Tuple[Holiday, ...]: 日付・国コード順の祝日（該当なしの場合は空）
+        """
+        with self._lock:
+            postings = tuple(self._by_month_day.get(f"{month:02d}-{day:02d}", ()))
+        return tuple(
+            sorted(
+                (
+                    h
+                    for h in postings
+                    if (year_min is None or int(h.date[:4]) >= year_min)
+                    and (year_max is None or int(h.date[:4]) <= year_max)
+                ),
+                key=lambda h: (h.date, h.country_code),
+            )
+        )
+
+    def similar_holidays(self, name: str, year: int) -> Tuple[Holiday, ...]:
+        """
+        名前が似ている祝日を取得する
+
+        名前のトークンのうち、複数の国で使われている中で最も国数が少ない
+        （最も固有性の高い）トークンを共有する祝日を、国ごとに1件返す。
+
+        Args:
+            name: 祝日名（例: "Independence Day"）
+            year: 年
+
+        Returns:
+            Tuple[Holiday, ...]: 名前が似ている祝日（該当なしの場合は空）
+        """
+        with self._lock:
+            candidates = [
+                self._name_postings[(token, year)]
+                for token in normalize_holiday_name(name)
+                if len(self._name_postings.get((token, year), ())) > 1
+            ]
+            if not candidates:
+                return ()
+            return tuple(min(candidates, key=len))
+
+    def get_holidays(
+        self, year: int, country_code: str
+    ) -> Optional[Tuple[Holiday, ...]]:
+        """
+        登録済みの祝日一覧を取得する
+
+        Returns:
+            Tuple[Holiday, ...]: 日付順の祝日、未登録の場合はNone
+        """
+        with self._lock:
+            return self._holidays.get((country_code, year))
+
+    def holidays_between(
+        self, country_code: str, start: date, end: date
+    ) -> Optional[Tuple[Holiday, ...]]:
+        """
+        期間内の祝日を取得する
+
+        年ごとの日付の序数を二分探索して該当範囲を取り出す。
+
+        Args:
+            country_code: 国コード
+            start: 期間の開始日（この日を含む）
+            end: 期間の終了日（この日を含まない）
+
+        Returns:
+            Tuple[Holiday, ...]: 日付順の祝日、期間内の年が1つでも未登録の場合はNone
+        """
+        result: List[Holiday] = []
+        with self._lock:
+            for year in range(start.year, end.year + 1):
+                key = (country_code, year)
+                if key not in self._holidays:
+                    return None
+                ordinals = self._ordinals[key]
+                lo = bisect_left(ordinals, start.toordinal())
+                hi = bisect_left(ordinals, end.toordinal(), lo)
+                result.extend(self._holidays[key][lo:hi])
+        return tuple(result)
+
+    def _partition(self, country_code: str) -> _CountryPartition:
+        """国ごとの期間検索用の列を取得する（ロック取得済みで呼ぶ）"""
+        partition = self._partitions.get(country_code)
+        if partition is None:
+            years = sorted(self._country_years[country_code])
+            holidays = [
+                holiday
+                for year in years
+                for holiday in self._holidays[(country_code, year)]
+            ]
+            ordinals = [
+                ordinal
+                for year in years
+                for ordinal in self._ordinals[(country_code, year)]
+            ]
+            partition = _CountryPartition(
+                ordinals=np.array(ordinals, dtype=np.int64),
+                names=_object_array([h.name for h in holidays]),
+                local_names=_object_array([h.local_name for h in holidays]),
+                holidays=_object_array(holidays),
+            )
+            self._partitions[country_code] = partition
+        return partition
+
+    def _get_range_table(self) -> _RangeTable:
+        """期間検索用の表を取得する（ロック取得済みで呼ぶ）"""
+        if self._range_table is None:
+            codes = sorted(self._country_years)
+            partitions = [self._partition(code) for code in codes]
+            lengths = [len(partition.ordinals) for partition in partitions]
+            ordinals = np.concatenate(
+                [partition.ordinals for partition in partitions]
+                or [np.empty(0, dtype=np.int64)]
+            )
+
+            def concat(field: str) -> np.ndarray:
+                arrays = [getattr(partition, field) for partition in partitions]
+                return np.concatenate(arrays) if arrays else _object_array([])
+
+            self._range_table = _RangeTable(
+                positions={code: i for i, code in enumerate(codes)},
+                keys=np.repeat(np.arange(len(codes), dtype=np.int64), lengths)
+                * _KEY_STRIDE
+                + ordinals,
+                columns=HolidayColumns(
+                    dates=(ordinals - _EPOCH_ORDINAL).astype("datetime64[D]"),
+                    country_codes=np.repeat(_object_array(codes), lengths),
+                    names=concat("names"),
+                    local_names=concat("local_names"),
+                    holidays=concat("holidays"),
+                ),
+            )
+        return self._range_table
+
+    def holidays_in_range(
+        self,
+        start: date,
+        end: date,
+        country_codes: Optional[Iterable[str]] = None,
+    ) -> HolidayColumns:
+        """
+        期間内の祝日を複数の国からまとめて取得する
+
+        全ての国の祝日を国コード・日付順に並べた表を持ち、対象の国ごとの
+        期間の両端を1回の二分探索でまとめて求めて該当する行を切り出す。
+        表は登録が変わった後の最初の検索で（変わった国の列だけ作り直して）作成する。
+
+        Args:
+            start: 開始日（この日を含む）
+            end: 終了日（この日を含まない）
+            country_codes: 対象の国コード（省略時は登録済みの全ての国）
+
+        Returns:
+            HolidayColumns: 日付・国コード順の祝日の列（登録済みの年の分だけ）
+        """
+        with self._lock:
+            table = self._get_range_table()
+
+        if country_codes is None:
+            positions = np.arange(len(table.positions), dtype=np.int64)
+        else:
+            positions = np.array(
+                sorted(
+                    table.positions[code]
+                    for code in set(country_codes)
+                    if code in table.positions
+                ),
+                dtype=np.int64,
+            )
+        bases = positions * _KEY_STRIDE
+        lo = np.searchsorted(table.keys, bases + start.toordinal())
+        hi = np.searchsorted(table.keys, bases + max(start, end).toordinal())
+
+        # 国ごとの[lo, hi)の行番号を連結する
+        lengths = hi - lo
+        offsets = np.cumsum(lengths) - lengths
+        rows = np.repeat(lo - offsets, lengths) + np.arange(lengths.sum())
+        # 国コード順に連結してあるので、安定ソートで同じ日付内は国コード順のまま
+        rows = rows[np.argsort(table.columns.dates[rows], kind="stable")]
+        return HolidayColumns(
+            dates=table.columns.dates[rows],
+            country_codes=table.columns.country_codes[rows],
+            names=table.columns.names[rows],
+            local_names=table.columns.local_names[rows],
+            holidays=table.columns.holidays[rows],
+        )
+
+    def holidays_on(
+        self, country_code: str, day: date
+    ) -> Optional[Tuple[Holiday, ...]]:
+        """
+        指定された日の祝日を取得する
+
+        Args:
+            country_code: 国コード
+            day: 日付
+
+        Returns:
+            Tuple[Holiday, ...]: その日の祝日（祝日でなければ空）、その年が未登録の場合はNone
+        """
+        return self.holidays_between(country_code, day, day + timedelta(days=1))
+
+    def get_country_name(self, country_code: str) -> str:
+        """国名を取得する（未登録の場合は国コードを返す）"""
+        with self._lock:
+            return self._country_names.get(country_code, country_code)
+
+    def keys(
+        self, year_min: Optional[int] = None, year_max: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """
+        登録済みの(国コード, 年)を取得する
+
+        Args:
+            year_min: 年の下限（省略時は制限なし）
+            year_max: 年の上限（省略時は制限なし）
+
+        Returns:
+            List[Tuple[str, int]]: ソート済みの(国コード, 年)のリスト
+        """
+        with self._lock:
+            keys = list(self._holidays)
+        return sorted(
+            key
+            for key in keys
+            if (year_min is None or key[1] >= year_min)
+            and (year_max is None or key[1] <= year_max)
+        )
+
+    def clear(self) -> None:
+        """登録済みのデータをすべて削除する"""
+        with self._lock:
+            self._country_names.clear()
+            self._holidays.clear()
+            self._ordinals.clear()
+            self._name_postings.clear()
+            self._by_date.clear()
+            self._by_month_day.clear()
+            self._gram_postings.clear()
+            self._gram_entries.clear()
+            self._country_years.clear()
+            self._partitions.clear()
+            self._range_table = None
+
+
+# プロセス共通のインデックス
+holiday_index = HolidayIndex()
@@ -1,63 +1,434 @@
 """祝日関連のビジネスロジック"""
 
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from models import Holiday
-import pandas as pd
-import streamlit as st
 import repository
-from constants import API_CACHE_TTL
+from services.cache import api_cache
+from services.holiday_index import HolidayColumns, holiday_index
+from constants import (
+    NEXT_HOLIDAYS_DAYS,
+    UTC_OFFSET_MIN,
+    UTC_OFFSET_MAX,
+    SEARCH_MAX_WORKERS,
+)
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-@st.cache_data(ttl=API_CACHE_TTL)
-def get_available_countries() -> List[dict]:
+
+def _on_cache_eviction(key: str) -> None:
+    """キャッシュから追い出されたリソースの検証用の値とインデックスを削除する"""
+    repository.response_validators.discard(key)
+    parts = key.split("/")
+    if len(parts) == 3 and parts[0] == "PublicHolidays":
+        holiday_index.remove_holidays(int(parts[1]), parts[2])
+
+
+api_cache.add_eviction_listener(_on_cache_eviction)
+
+
+def get_available_countries() -> Tuple[Mapping[str, str], ...]:
     """
-    利用可能な国のリストをAPIから取得
+    利用可能な国のリストをAPIから取得（キャッシュあり）
+
+    キャッシュした値をコピーせずに返すため、読み取り専用の形で返す。
 
     Returns:
-        List[dict]: 国コードと国名を含む辞書のリスト
+        Tuple[Mapping[str, str], ...]: 国コードと国名を含む読み取り専用の辞書のタプル
 
     Raises:
         requests.RequestException: API呼び出しに失敗した場合
     """
-    try:
-        return repository.get_available_countries()
-    except Exception as e:
-        raise e
 
+    def load(**options) -> Tuple[Mapping[str, str], ...]:
+        countries = tuple(
+            MappingProxyType(dict(country))
+            for country in repository.get_available_countries(**options)
+        )
+        holiday_index.add_countries(countries)
+        return countries
+
+    return api_cache.get_or_load(
+        "AvailableCountries", load, lambda: load(revalidate=True)
+    )
 
-@st.cache_data(ttl=API_CACHE_TTL)
-def get_public_holidays(year: int, country_code: str) -> List[Holiday]:
+
+def get_country_info(country_code: str) -> Mapping[str, Any]:
     """
-    指定された年と国の祝日一覧をAPIから取得
+    指定された国の情報をAPIから取得（キャッシュあり）
+
+    Args:
+        country_code: 国コード（例: "DE"）
+
+    Returns:
+        Mapping[str, Any]: 国の情報の読み取り専用の辞書（bordersは読み取り専用の辞書のタプル）
+
+    Raises:
+        requests.RequestException: API呼び出しに失敗した場合
+    """
+
+    def load(**options) -> Mapping[str, Any]:
+        info = dict(repository.get_country_info(country_code, **options))
+        info["borders"] = tuple(
+            MappingProxyType(dict(border)) for border in info.get("borders") or ()
+        )
+        return MappingProxyType(info)
+
+    return api_cache.get_or_load(
+        f"CountryInfo/{country_code}", load, lambda: load(revalidate=True)
+    )
+
+
+def get_neighbor_country_codes(country_code: str) -> Tuple[str, ...]:
+    """
+    指定された国と国境を接する国の国コードを取得
+
+    Args:
+        country_code: 国コード（例: "DE"）
+
+    Returns:
+        Tuple[str, ...]: 国境を接する国の国コード
+
+    Raises:
+        requests.RequestException: API呼び出しに失敗した場合
+    """
+    return tuple(
+        border["countryCode"]
+        for border in get_country_info(country_code)["borders"]
+        if border.get("countryCode")
+    )
+
+
+def get_public_holidays(year: int, country_code: str) -> Tuple[Holiday, ...]:
+    """
+    指定された年と国の祝日一覧をAPIから取得（キャッシュあり）
+
+    キャッシュした値をコピーせずに返すため、不変のタプルで返す。
 
     Args:
         year: 年（例: 2025）
         country_code: 国コード（例: "JP"）
 
     Returns:
-        List[Holiday]: 祝日のリスト
+        Tuple[Holiday, ...]: 祝日のタプル
 
     Raises:
         requests.RequestException: API呼び出しに失敗した場合
     """
-    return repository.get_public_holidays(year, country_code)
+
+    def load(**options) -> Tuple[Holiday, ...]:
+        holidays = tuple(repository.get_public_holidays(year, country_code, **options))
+        holiday_index.add_holidays(year, country_code, holidays)
+        return holidays
+
+    return api_cache.get_or_load(
+        f"PublicHolidays/{year}/{country_code}", load, lambda: load(revalidate=True)
+    )
+
+
+class SearchResult(NamedTuple):
+    """複数の国・年の検索で1つの(国, 年)について取得した結果"""
+
+    country_code: str
+    year: int
+    holidays: Tuple[Holiday, ...]
+    error: Optional[Exception] = None
+
+
+def search_public_holidays(
+    country_codes: Sequence[str],
+    year_min: int,
+    year_max: int,
+    max_workers: int = SEARCH_MAX_WORKERS,
+) -> Iterator[SearchResult]:
+    """
+    複数の国と年の祝日一覧を取得し、取得できたものから順に返す
+
+    キャッシュ済みの(国, 年)はすぐに返し、残りは並行して取得する。
+    取得に失敗した(国, 年)は、errorに例外を設定して返す。
+
+    Args:
+        country_codes: 国コードのリスト
+        year_min: 最初の年
+        year_max: 最後の年
+        max_workers: 並行して取得するスレッド数
+
+    Yields:
+        SearchResult: (国, 年)ごとの取得結果（取得できた順）
+    """
+    missing = []
+    for country_code in country_codes:
+        for year in range(year_min, year_max + 1):
+            cached = api_cache.get(f"PublicHolidays/{year}/{country_code}")
+            if cached is not None:
+                yield SearchResult(country_code, year, cached)
+            else:
+                missing.append((country_code, year))
+    if not missing:
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(missing)), thread_name_prefix="search"
+    ) as executor:
+        futures = {
+            executor.submit(get_public_holidays, year, country_code): (
+                country_code,
+                year,
+            )
+            for country_code, year in missing
+        }
+        for future in as_completed(futures):
+            country_code, year = futures[future]
+            try:
+                yield SearchResult(country_code, year, future.result())
+            except Exception as e:
+                yield SearchResult(country_code, year, (), e)
+
+
+def get_holidays_in_range(
+    country_codes: Sequence[str], start: date, end: date
+) -> HolidayColumns:
+    """
+    複数の国の期間内の祝日をまとめて取得
+
+    期間にかかる年の祝日一覧を（未取得の分は並行して）取得してから、
+    インデックスの二分探索で期間内の祝日を切り出す。
+
+    Args:
+        country_codes: 国コードのリスト
+        start: 開始日（この日を含む）
+        end: 終了日（この日を含まない）
+
+    Returns:
+        HolidayColumns: 日付・国コード順の祝日の列
+
+    Raises:
+        requests.RequestException: 祝日一覧の取得に失敗した場合
+    """
+    if end > start:
+        last_day = end - timedelta(days=1)
+        for result in search_public_holidays(country_codes, start.year, last_day.year):
+            if result.error is not None:
+                raise result.error
+    return holiday_index.holidays_in_range(start, end, country_codes)
+
+
+def merge_search_results(results: Iterable[SearchResult]) -> Tuple[Holiday, ...]:
+    """
+    検索結果の祝日を1つにまとめて日付順に並べる
+
+    Args:
+        results: 検索結果
+
+    Returns:
+        Tuple[Holiday, ...]: 日付・国コード順の祝日
+    """
+    return tuple(
+        sorted(
+            (holiday for result in results for holiday in result.holidays),
+            key=lambda h: (h.date, h.country_code),
+        )
+    )
 
 
-@st.cache_data(ttl=API_CACHE_TTL)
-def get_next_public_holidays(country_code: str) -> List[Holiday]:
+def get_next_public_holidays(
+    country_code: str, today: Optional[date] = None
+) -> Tuple[Holiday, ...]:
     """
-    指定された国の今後の祝日を取得
+    指定された国の今後の祝日を取得（キャッシュあり）
+
+    今日からNEXT_HOLIDAYS_DAYS日間の祝日を、キャッシュ済みの年ごとの祝日一覧から
+    計算する。期間内の年の祝日一覧がキャッシュにない場合のみAPIから取得する。
 
     Args:
         country_code: 国コード（例: "JP"）
+        today: 基準日（省略時は今日）
 
     Returns:
-        List[Holiday]: 祝日のリスト
+        Tuple[Holiday, ...]: 日付順の祝日のタプル
 
     Raises:
         requests.RequestException: API呼び出しに失敗した場合
     """
-    return repository.get_next_public_holidays(country_code)
+    start = today or date.today()
+    end = start + timedelta(days=NEXT_HOLIDAYS_DAYS)
+    if all(
+        api_cache.contains(f"PublicHolidays/{year}/{country_code}")
+        for year in range(start.year, end.year + 1)
+    ):
+        holidays = holiday_index.holidays_between(country_code, start, end)
+        if holidays is not None:
+            return holidays
+
+    return api_cache.get_or_load(
+        f"NextPublicHolidays/{country_code}",
+        lambda: tuple(repository.get_next_public_holidays(country_code)),
+        lambda: tuple(
+            repository.get_next_public_holidays(country_code, revalidate=True)
+        ),
+    )
+
+
+def is_today_public_holiday(
+    country_code: str,
+    offset: int = 0,
+    subdivision: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> bool:
+    """
+    指定された国で今日が祝日かを判定（キャッシュ済みの祝日一覧から計算）
+
+    APIのIsTodayPublicHolidayと同じく、UTCの現在時刻にoffset時間を足した日付で判定する。
+    全国の祝日に加え、subdivisionを指定した場合はその州・県の祝日も対象とする。
+
+    Args:
+        country_code: 国コード（例: "JP"）
+        offset: UTCからのオフセット（時間、-12〜12）
+        subdivision: 州・県のコード（ISO-3166-2、例: "DE-BY"）
+        now: 現在時刻（タイムゾーンなしの場合はUTCとみなす。省略時は現在時刻）
+
+    Returns:
+        bool: 祝日の場合True
+
+    Raises:
+        ValueError: offsetが範囲外の場合
+        requests.RequestException: 祝日一覧の取得に失敗した場合
+    """
+    if not UTC_OFFSET_MIN <= offset <= UTC_OFFSET_MAX:
+        raise ValueError(
+            f"offset must be between {UTC_OFFSET_MIN} and {UTC_OFFSET_MAX}"
+        )
+
+    current = now or datetime.now(timezone.utc)
+    if current.tzinfo is not None:
+        current = current.astimezone(timezone.utc)
+    today = (current + timedelta(hours=offset)).date()
+    return is_public_holiday(country_code, today, subdivision)
+
+
+def is_public_holiday(
+    country_code: str, day: date, subdivision: Optional[str] = None
+) -> bool:
+    """
+    指定された国で指定された日付が祝日かを判定（キャッシュ済みの祝日一覧から計算）
+
+    Args:
+        country_code: 国コード（例: "JP"）
+        day: 日付
+        subdivision: 州・県のコード（ISO-3166-2、例: "DE-BY"）
+
+    Returns:
+        bool: 祝日の場合True
+
+    Raises:
+        requests.RequestException: 祝日一覧の取得に失敗した場合
+    """
+    holidays = get_public_holidays(day.year, country_code)
+    days = holiday_index.holidays_on(country_code, day)
+    if days is None:
+        days = tuple(h for h in holidays if h.date == day.isoformat())
+
+    return any(h.applies_to(subdivision) for h in days)
+
+
+def load_snapshot_corpus() -> int:
+    """
+    スナップショットの祝日一覧をインデックスに登録する
+
+    APIから取得済み・登録済みの(国, 年)はそのまま残し、そのファイルは読み込まない
+    （新しいセッションごとに呼ばれても、未登録の分だけを読み込む）。
+
+    Returns:
+        int: 新たに登録した(国, 年)の数
+    """
+    loaded = set(holiday_index.keys())
+    count = 0
+    for year, country_code, holidays in repository.load_snapshot_public_holidays(
+        exclude=loaded
+    ):
+        # 読み込んでいる間にAPIから取得された(国, 年)は上書きしない
+        if holiday_index.get_holidays(year, country_code) is None:
+            holiday_index.add_holidays(year, country_code, holidays)
+            count += 1
+    return count
+
+
+def get_holidays_on_date(day: date) -> Tuple[Holiday, ...]:
+    """
+    指定された日付に祝日がある国の祝日を取得（取得済みの祝日から逆引き）
+
+    Args:
+        day: 日付
+
+    Returns:
+        Tuple[Holiday, ...]: 国コード順の祝日
+    """
+    return holiday_index.holidays_on_date(day.isoformat())
+
+
+def get_holidays_on_month_day(
+    month: int,
+    day: int,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+) -> Tuple[Holiday, ...]:
+    """
+    指定された月日に祝日がある年・国の祝日を取得（取得済みの祝日から逆引き）
+
+    Args:
+        month: 月
+        day: 日
+        year_min: 年の下限（省略時は制限なし）
+        year_max: 年の上限（省略時は制限なし）
+
+    Returns:
+        Tuple[Holiday, ...]: 日付・国コード順の祝日
+    """
+    return holiday_index.holidays_on_month_day(month, day, year_min, year_max)
+
+
+def search_holiday_names(
+    query: str, year_min: Optional[int] = None, year_max: Optional[int] = None
+) -> List[Tuple[Holiday, float]]:
+    """
+    取得済みの全ての国・年の祝日を英語名・現地名であいまい検索
+
+    Args:
+        query: 検索語（例: "Independence", "建国"）
+        year_min: 年の下限（省略時は制限なし）
+        year_max: 年の上限（省略時は制限なし）
+
+    Returns:
+        List[Tuple[Holiday, float]]: 一致度（0〜1）の高い順の(祝日, 一致度)のリスト
+    """
+    return holiday_index.search_names(query, year_min, year_max)
+
+
+def get_loaded_country_codes(year: int) -> List[str]:
+    """
+    指定された年の祝日一覧を取得済みの国コードを取得
+
+    Args:
+        year: 年
+
+    Returns:
+        List[str]: 国コードのリスト
+    """
+    return [country_code for country_code, _ in holiday_index.keys(year, year)]
 
 
 def get_country_options() -> dict:
@@ -80,18 +451,20 @@ def get_country_options() -> dict:
 
 
 def holidays_to_search_dataframe(
-    holidays: List[Holiday], favorites: List[Holiday]
-) -> pd.DataFrame:
+    holidays: Sequence[Holiday], favorites: List[Holiday]
+) -> "pd.DataFrame":
     """
     検索結果用のDataFrameを生成（お気に入り状態付き）
 
     Args:
-        holidays: 祝日のリスト
+        holidays: 祝日のリスト（タプルも可）
         favorites: お気に入りのリスト
 
     Returns:
         pd.DataFrame: 検索結果用のデータフレーム
     """
+    import pandas as pd  # 表示用のデータフレームを作るときだけ読み込む
+
     # 列名を定義
     columns = ["日付", "祝日名", "現地名", "国コード", "お気に入り"]
 
@@ -0,0 +1,197 @@
+"""連休（ロングウィークエンド）の計算（APIのLongWeekendをキャッシュ済みの祝日から計算する）"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from models import Holiday, LongWeekend
+from services import holiday_service
+from constants import (
+    WEEKEND_DAYS,
+    LONG_WEEKEND_MIN_DAYS,
+    DEFAULT_AVAILABLE_BRIDGE_DAYS,
+)
+
+# 年末年始をまたぐ連休のために前後に含める日数
+_PADDING_DAYS = 7
+
+
+@dataclass
+class _Run:
+    """計算中の連休（日付は計算範囲の先頭からの日数、endは含まない）"""
+
+    row: int
+    start: int
+    end: int
+    has_holiday: bool
+    last_block: int
+    bridge_days: List[int] = field(default_factory=list)
+
+
+def calculate_long_weekends(
+    holidays_by_country: Mapping[str, Sequence[Holiday]],
+    year: int,
+    available_bridge_days: int = DEFAULT_AVAILABLE_BRIDGE_DAYS,
+    subdivision: Optional[str] = None,
+) -> Dict[str, Tuple[LongWeekend, ...]]:
+    """
+    複数の国の連休をまとめて計算する
+
+    週末と祝日が続く期間を連休とし、間の平日がavailable_bridge_days日以内なら
+    休んで（ブリッジ休日）つなげる。1つの連休で使うブリッジ休日は合計で
+    available_bridge_days日までとする。国×日の休日の行列を作り、休日が続く
+    ブロックの境界をまとめて求めるため、国数が多くても1回の計算で済む。
+
+    Args:
+        holidays_by_country: 国コードをキー、その年の祝日を値とする辞書
+        year: 年
+        available_bridge_days: 連休にするために休める平日の数
+        subdivision: 州・県のコード（指定した場合はその州・県の祝日も含める）
+
+    Returns:
+        Dict[str, Tuple[LongWeekend, ...]]: 国コードをキー、開始日順の連休を値とする辞書
+
+    Raises:
+        ValueError: available_bridge_daysが負の場合
+    """
+    if available_bridge_days < 0:
+        raise ValueError("available_bridge_days must be >= 0")
+
+    country_codes = list(holidays_by_country)
+    first_day = date(year, 1, 1) - timedelta(days=_PADDING_DAYS)
+    num_days = (date(year + 1, 1, 1) - date(year, 1, 1)).days + 2 * _PADDING_DAYS
+
+    # 国×日の休日の行列
+    weekdays = (np.arange(num_days) + first_day.weekday()) % 7
+    is_weekend = np.isin(weekdays, WEEKEND_DAYS)
+    is_holiday = np.zeros((len(country_codes), num_days), dtype=bool)
+    rows, offsets = [], []
+    for row, country_code in enumerate(country_codes):
+        for holiday in holidays_by_country[country_code]:
+            day = date.fromisoformat(holiday.date)
+            if day.year == year and holiday.applies_to(subdivision):
+                rows.append(row)
+                offsets.append((day - first_day).days)
+    is_holiday[rows, offsets] = True
+    is_free = is_holiday | is_weekend
+
+    # 休日が続くブロックの境界（行の前後に平日を置いて差分を取る）
+    padded = np.zeros((len(country_codes), num_days + 2), dtype=np.int8)
+    padded[:, 1:-1] = is_free
+    edges = np.diff(padded, axis=1)
+    block_rows, block_starts = np.nonzero(edges == 1)
+    _, block_ends = np.nonzero(edges == -1)
+
+    holiday_counts = np.zeros((len(country_codes), num_days + 1), dtype=np.int32)
+    holiday_counts[:, 1:] = np.cumsum(is_holiday, axis=1)
+    has_holiday = (
+        holiday_counts[block_rows, block_ends]
+        > holiday_counts[block_rows, block_starts]
+    )
+
+    # 祝日を含むブロックとその隣のブロックだけが連休になりうる
+    same_row_as_prev = np.r_[False, block_rows[1:] == block_rows[:-1]]
+    same_row_as_next = np.r_[block_rows[:-1] == block_rows[1:], False]
+    candidates = (
+        has_holiday
+        | (np.r_[False, has_holiday[:-1]] & same_row_as_prev)
+        | (np.r_[has_holiday[1:], False] & same_row_as_next)
+    )
+
+    long_weekends: Dict[str, List[LongWeekend]] = {code: [] for code in country_codes}
+
+    def emit(run: Optional[_Run]) -> None:
+        if (
+            run is None
+            or not run.has_holiday
+            or run.end - run.start < LONG_WEEKEND_MIN_DAYS
+        ):
+            return
+        long_weekends[country_codes[run.row]].append(
+            LongWeekend(
+                start_date=(first_day + timedelta(days=run.start)).isoformat(),
+                end_date=(first_day + timedelta(days=run.end - 1)).isoformat(),
+                day_count=run.end - run.start,
+                need_bridge_day=bool(run.bridge_days),
+                bridge_days=tuple(
+                    (first_day + timedelta(days=offset)).isoformat()
+                    for offset in run.bridge_days
+                ),
+            )
+        )
+
+    run: Optional[_Run] = None
+    for block in np.flatnonzero(candidates):
+        row = int(block_rows[block])
+        start, end = int(block_starts[block]), int(block_ends[block])
+        holiday = bool(has_holiday[block])
+        if run is not None and run.row == row and run.last_block == block - 1:
+            gap = start - run.end
+            remaining = available_bridge_days - len(run.bridge_days)
+            if (run.has_holiday or holiday) and gap <= remaining:
+                run.bridge_days.extend(range(run.end, start))
+                run.end = end
+                run.has_holiday = run.has_holiday or holiday
+                run.last_block = block
+                continue
+        emit(run)
+        run = _Run(row, start, end, holiday, block)
+    emit(run)
+
+    return {code: tuple(weekends) for code, weekends in long_weekends.items()}
+
+
+def get_long_weekends(
+    year: int,
+    country_code: str,
+    available_bridge_days: int = DEFAULT_AVAILABLE_BRIDGE_DAYS,
+    subdivision: Optional[str] = None,
+) -> Tuple[LongWeekend, ...]:
+    """
+    指定された年と国の連休を取得
+
+    Args:
+        year: 年（例: 2025）
+        country_code: 国コード（例: "DE"）
+        available_bridge_days: 連休にするために休める平日の数
+        subdivision: 州・県のコード（ISO-3166-2、例: "DE-BY"）
+
+    Returns:
+        Tuple[LongWeekend, ...]: 開始日順の連休
+
+    Raises:
+        requests.RequestException: 祝日一覧の取得に失敗した場合
+    """
+    return get_long_weekends_for_countries(
+        year, [country_code], available_bridge_days, subdivision
+    )[country_code]
+
+
+def get_long_weekends_for_countries(
+    year: int,
+    country_codes: Sequence[str],
+    available_bridge_days: int = DEFAULT_AVAILABLE_BRIDGE_DAYS,
+    subdivision: Optional[str] = None,
+) -> Dict[str, Tuple[LongWeekend, ...]]:
+    """
+    複数の国の指定された年の連休をまとめて取得
+
+    Args:
+        year: 年（例: 2025）
+        country_codes: 国コードのリスト
+        available_bridge_days: 連休にするために休める平日の数
+        subdivision: 州・県のコード（ISO-3166-2）
+
+    Returns:
+        Dict[str, Tuple[LongWeekend, ...]]: 国コードをキー、開始日順の連休を値とする辞書
+
+    Raises:
+        requests.RequestException: 祝日一覧の取得に失敗した場合
+    """
+    holidays_by_country = {
+        country_code: holiday_service.get_public_holidays(year, country_code)
+        for country_code in country_codes
+    }
+    return calculate_long_weekends(
+        holidays_by_country, year, available_bridge_days, subdivision
+    )
@@ -0,0 +1,279 @@
+"""検索の後に次に検索されそうな祝日一覧をバックグラウンドで先読みする"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Sequence, Set, Tuple
+import repository
+from services import holiday_service
+from services.cache import api_cache
+from constants import (
+    YEAR_MIN,
+    YEAR_MAX,
+    PREFETCH_RATE,
+    PREFETCH_BURST,
+    PREFETCH_MAX_WORKERS,
+    PREFETCH_MAX_TRACKED,
+)
+
+# 先読みの単位（国コード, 年）
+PrefetchKey = Tuple[str, int]
+
+
+class Prefetcher:
+    """
+    検索した国・年の前後の年と、国境を接する国の同じ年を先読みするクラス
+
+    先読みのリクエスト（国境を接する国を調べるための国情報の取得を含む）は
+    トークンバケットの予算の範囲でだけ送り、予算が足りない分は送らずに捨てる。先読みした(国, 年)がその後
+    検索されたかを記録し、ヒット率を計算する。
+    """
+
+    def __init__(
+        self,
+        load: Callable[[int, str], Any],
+        is_cached: Callable[[int, str], bool],
+        neighbors: Callable[[str], Sequence[str]],
+        budget: repository.TokenBucket,
+        max_workers: int = PREFETCH_MAX_WORKERS,
+        max_tracked: int = PREFETCH_MAX_TRACKED,
+        neighbors_cached: Optional[Callable[[str], bool]] = None,
+    ):
+        """
+        Args:
+            load: (年, 国コード)の祝日一覧を取得してキャッシュする関数
+            is_cached: (年, 国コード)の祝日一覧がキャッシュ済みか判定する関数
+            neighbors: 国境を接する国の国コードを返す関数
+            budget: 先読みのリクエストに使うトークンバケット
+            max_workers: 先読みするスレッド数
+            max_tracked: ヒット率の計算のために覚えておく先読み済みの(国, 年)の数
+            neighbors_cached: 国境を接する国がAPI呼び出しなしで分かるか判定する関数
+                （Noneは常にAPIを呼ぶものとして予算を使う）
+        """
+        self._load = load
+        self._is_cached = is_cached
+        self._neighbors = neighbors
+        self._neighbors_cached = neighbors_cached
+        self.budget = budget
+        self.max_workers = max_workers
+        self.max_tracked = max_tracked
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Set[PrefetchKey] = set()
+        # 先読みしてまだ検索されていない(国, 年)（古い順）
+        self._prefetched: "OrderedDict[PrefetchKey, None]" = OrderedDict()
+
+        # メトリクス
+        self._scheduled = 0
+        self._completed = 0
+        self._failed = 0
+        self._over_budget = 0
+        self._requests = 0
+        self._hits = 0
+
+    def after_search(
+        self, country_codes: Sequence[str], year_min: int, year_max: int
+    ) -> None:
+        """
+        検索の後に先読みを開始する（すぐに戻る）
+
+        Args:
+            country_codes: 検索した国コードのリスト
+            year_min: 検索した最初の年
+            year_max: 検索した最後の年
+        """
+        self._submit(self._plan, tuple(country_codes), year_min, year_max)
+
+    def record_search(
+        self, country_codes: Sequence[str], year_min: int, year_max: int
+    ) -> int:
+        """
+        検索された(国, 年)を記録し、先読み済みだったものをヒットとして数える
+
+        検索でキャッシュが使われる前に呼ぶ。
+
+        Args:
+            country_codes: 検索する国コードのリスト
+            year_min: 最初の年
+            year_max: 最後の年
+
+        Returns:
+            int: 先読みがヒットした(国, 年)の数
+        """
+        hits = 0
+        for country_code in country_codes:
+            for year in range(year_min, year_max + 1):
+                key = (country_code, year)
+                with self._lock:
+                    self._requests += 1
+                    prefetched = key in self._prefetched
+                    if prefetched:
+                        del self._prefetched[key]
+                if prefetched and self._is_cached(year, country_code):
+                    hits += 1
+        with self._lock:
+            self._hits += hits
+        return hits
+
+    def metrics(self) -> dict:
+        """
+        先読みのメトリクスを取得する
+
+        Returns:
+            dict: 以下のキーを持つ辞書
+                - scheduled: 先読みを開始した(国, 年)の数
+                - completed: 先読みが完了した数
+                - failed: 先読みに失敗した数
+                - over_budget: 予算が足りずに先読みしなかった数
+                - in_flight: 先読み中の数
+                - requests: 検索された(国, 年)の数
+                - hits: 先読み済みだった検索の数
+                - hit_rate: 先読みが完了したもののうち検索された割合
+                - request_hit_rate: 検索のうち先読み済みだった割合
+        """
+        with self._lock:
+            return {
+                "scheduled": self._scheduled,
+                "completed": self._completed,
+                "failed": self._failed,
+                "over_budget": self._over_budget,
+                "in_flight": len(self._in_flight),
+                "requests": self._requests,
+                "hits": self._hits,
+                "hit_rate": self._hits / self._completed if self._completed else 0.0,
+                "request_hit_rate": (
+                    self._hits / self._requests if self._requests else 0.0
+                ),
+            }
+
+    def wait(self) -> None:
+        """実行中の先読みが終わるまで待つ（テスト・ベンチマーク用）"""
+        # 先読みの計画中に新しいスレッドプールが作られることがあるため、なくなるまで待つ
+        while True:
+            with self._lock:
+                executor, self._executor = self._executor, None
+            if executor is None:
+                return
+            executor.shutdown(wait=True)
+
+    def clear(self) -> None:
+        """先読みの終了を待ち、記録とメトリクスをリセットする"""
+        self.wait()
+        with self._lock:
+            self._in_flight.clear()
+            self._prefetched.clear()
+            self._scheduled = 0
+            self._completed = 0
+            self._failed = 0
+            self._over_budget = 0
+            self._requests = 0
+            self._hits = 0
+
+    def _submit(self, func: Callable, *args) -> None:
+        """先読み用のスレッドで関数を実行する"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="prefetch"
+                )
+            self._executor.submit(func, *args)
+
+    def _plan(
+        self, country_codes: Tuple[str, ...], year_min: int, year_max: int
+    ) -> None:
+        """先読みする(国, 年)を優先度順に決めて先読みを開始する"""
+        # 前後の年を優先し、次に国境を接する国の同じ年を先読みする
+        scheduled: Set[PrefetchKey] = set()
+        for key in (
+            (country_code, year)
+            for country_code in country_codes
+            for year in (year_min - 1, year_max + 1)
+            if YEAR_MIN <= year <= YEAR_MAX
+        ):
+            if key not in scheduled:
+                scheduled.add(key)
+                self._schedule(key)
+
+        for country_code in country_codes:
+            # 国情報がキャッシュにない場合は取得するリクエストにも予算を使う
+            if (
+                not self._are_neighbors_cached(country_code)
+                and not self.budget.try_acquire()
+            ):
+                with self._lock:
+                    self._over_budget += 1
+                continue
+            try:
+                neighbors = self._neighbors(country_code)
+            except Exception:
+                continue
+            for key in (
+                (neighbor, year)
+                for neighbor in neighbors
+                if neighbor not in country_codes
+                for year in range(year_max, year_min - 1, -1)
+            ):
+                if key not in scheduled:
+                    scheduled.add(key)
+                    self._schedule(key)
+
+    def _are_neighbors_cached(self, country_code: str) -> bool:
+        """国境を接する国がAPI呼び出しなしで分かるか判定する"""
+        if self._neighbors_cached is None:
+            return False
+        return self._neighbors_cached(country_code)
+
+    def _schedule(self, key: PrefetchKey) -> None:
+        """キャッシュされていない(国, 年)を予算の範囲で先読みする"""
+        country_code, year = key
+        with self._lock:
+            if key in self._in_flight or key in self._prefetched:
+                return
+        if self._is_cached(year, country_code):
+            return
+        if not self.budget.try_acquire():
+            with self._lock:
+                self._over_budget += 1
+            return
+        with self._lock:
+            self._in_flight.add(key)
+            self._scheduled += 1
+        self._submit(self._fetch, key)
+
+    def _fetch(self, key: PrefetchKey) -> None:
+        """1つの(国, 年)を先読みする"""
+        country_code, year = key
+        try:
+            self._load(year, country_code)
+        except Exception:
+            with self._lock:
+                self._in_flight.discard(key)
+                self._failed += 1
+            return
+        with self._lock:
+            self._in_flight.discard(key)
+            self._completed += 1
+            self._prefetched[key] = None
+            while len(self._prefetched) > self.max_tracked:
+                self._prefetched.popitem(last=False)
+
+
+def _is_public_holidays_cached(year: int, country_code: str) -> bool:
+    """祝日一覧がキャッシュ済み（取得失敗のキャッシュを含む）か判定する"""
+    return api_cache.contains(f"PublicHolidays/{year}/{country_code}")
+
+
+def _is_country_info_cached(country_code: str) -> bool:
+    """国情報がキャッシュ済み（取得失敗のキャッシュを含む）か判定する"""
+    return api_cache.contains(f"CountryInfo/{country_code}")
+
+
+# プロセス共通の先読み
+prefetcher = Prefetcher(
+    load=holiday_service.get_public_holidays,
+    is_cached=_is_public_holidays_cached,
+    neighbors=holiday_service.get_neighbor_country_codes,
+    budget=repository.TokenBucket(PREFETCH_RATE, PREFETCH_BURST),
+    neighbors_cached=_is_country_info_cached,
+)
@@ -0,0 +1,237 @@
+"""クイズ問題のプール（バックグラウンドで事前生成して補充する）"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+from services import quiz_service
+from constants import (
+    QUESTION_POOL_SIZE,
+    QUESTION_POOL_RETRY_INTERVAL,
+    QUESTION_POOL_RATE_WINDOW,
+)
+
+
+class QuestionPool:
+    """
+    生成済みの問題を一定数バッファしておくプール
+
+    バックグラウンドのワーカースレッドが、プールが満杯になるまで
+    問題を生成して補充する。ページ側は get() で O(1) で取り出せる。
+    """
+
+    def __init__(
+        self,
+        generator: Callable[[], Optional[Dict]],
+        size: int = QUESTION_POOL_SIZE,
+        retry_interval: float = QUESTION_POOL_RETRY_INTERVAL,
+        name: str = "",
+    ):
+        """
+        Args:
+            generator: 問題を1つ生成する関数（生成できない場合はNoneを返す）
+            size: プールに保持する問題数の上限
+            retry_interval: 生成に失敗した場合に次の生成まで待つ秒数
+            name: ワーカースレッド名に使う識別子
+        """
+        if size < 1:
+            raise ValueError("size must be >= 1")
+
+        self.generator = generator
+        self.size = size
+        self.retry_interval = retry_interval
+        self.name = name
+
+        self._questions: Deque[Dict] = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopped = False
+        self._worker: Optional[threading.Thread] = None
+
+        # メトリクス
+        self._generated = 0
+        self._served = 0
+        self._misses = 0
+        self._errors = 0
+        self._refill_times: Deque[float] = deque(maxlen=QUESTION_POOL_RATE_WINDOW)
+
+    def start(self) -> None:
+        """補充用のワーカースレッドを起動する（起動済みなら何もしない）"""
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stopped = False
+            self._worker = threading.Thread(
+                target=self._run, name=f"question-pool-{self.name}", daemon=True
+            )
+            self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """ワーカースレッドを停止する"""
+        with self._lock:
+            self._stopped = True
+            self._wakeup.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def get(self) -> Optional[Dict]:
+        """
+        プールから問題を1つ取り出す
+
+        プールが空の場合はその場で同期的に生成する。
+
+        Returns:
+            Dict: 問題の辞書データ、またはNone
+        """
+        with self._lock:
+            if self._questions:
+                question = self._questions.popleft()
+                self._served += 1
+                self._wakeup.notify()
+                return question
+            self._misses += 1
+            self._wakeup.notify()
+
+        return self.generator()
+
+    def fill(self) -> int:
+        """
+        プールが満杯になるまで現在のスレッドで問題を生成する
+
+        Returns:
+            int: 追加した問題数
+        """
+        added = 0
+        while self.depth() < self.size:
+            if not self._refill_once():
+                break
+            added += 1
+        return added
+
+    def depth(self) -> int:
+        """現在プールにある問題数"""
+        with self._lock:
+            return len(self._questions)
+
+    def metrics(self) -> dict:
+        """
+        プールのメトリクスを取得する
+
+        Returns:
+            dict: 以下のキーを持つ辞書
+                - depth: 現在の問題数
+                - size: プールの上限
+                - generated: 生成した問題の総数
+                - served: プールから提供した問題の総数
+                - misses: プールが空で同期生成した回数
+                - errors: 生成に失敗した回数
+                - refill_rate: 直近の補充レート（問/秒）
+        """
+        with self._lock:
+            return {
+                "depth": len(self._questions),
+                "size": self.size,
+                "generated": self._generated,
+                "served": self._served,
+                "misses": self._misses,
+                "errors": self._errors,
+                "refill_rate": self._refill_rate(),
+            }
+
+    def _refill_rate(self) -> float:
+        """直近の補充時刻から補充レートを計算する（ロック取得済みで呼ぶ）"""
+        if len(self._refill_times) < 2:
+            return 0.0
+        elapsed = self._refill_times[-1] - self._refill_times[0]
+        if elapsed <= 0:
+            return 0.0
+        return (len(self._refill_times) - 1) / elapsed
+
+    def _refill_once(self) -> bool:
+        """
+        問題を1つ生成してプールに追加する
+
+        Returns:
+            bool: 追加できた場合True
+        """
+        try:
+            question = self.generator()
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            return False
+
+        if question is None:
+            return False
+
+        with self._lock:
+            if len(self._questions) >= self.size:
+                return False
+            self._questions.append(question)
+            self._generated += 1
+            self._refill_times.append(time.monotonic())
+        return True
+
+    def _run(self) -> None:
+        """ワーカースレッドの本体"""
+        while True:
+            with self._lock:
+                while not self._stopped and len(self._questions) >= self.size:
+                    self._wakeup.wait()
+                if self._stopped:
+                    return
+
+            if not self._refill_once():
+                # 失敗した場合は少し待ってから再試行する
+                with self._lock:
+                    if self._stopped:
+                        return
+                    self._wakeup.wait(self.retry_interval)
+
+
+# プロセス共通の問題プール（名前ごとに最初に使われたときに起動する）
+_shared_pools: Dict[str, QuestionPool] = {}
+_shared_pools_lock = threading.Lock()
+
+
+def _get_shared_pool(
+    name: str, generator: Callable[[], Optional[Dict]]
+) -> QuestionPool:
+    """
+    プロセス共通の問題プールを取得（初回は作成して起動する）
+
+    Args:
+        name: 問題プールの識別子
+        generator: 問題を1つ生成する関数
+
+    Returns:
+        QuestionPool: 起動済みの問題プール
+    """
+    with _shared_pools_lock:
+        pool = _shared_pools.get(name)
+        if pool is None:
+            pool = QuestionPool(generator, name=name)
+            pool.start()
+            _shared_pools[name] = pool
+        return pool
+
+
+def get_true_false_pool() -> QuestionPool:
+    """
+    プロセス共通のマルバツクイズ用問題プールを取得
+
+    Returns:
+        QuestionPool: 起動済みの問題プール
+    """
+    return _get_shared_pool("true-false", quiz_service.generate_true_false_question)
+
+
+def get_guess_pool() -> QuestionPool:
+    """
+    プロセス共通の祝日名当てクイズ用問題プールを取得
+
+    Returns:
+        QuestionPool: 起動済みの問題プール
+    """
+    return _get_shared_pool("guess", quiz_service.generate_guess_question)
@@ -1,48 +1,51 @@
 import random
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict
-import streamlit as st
-import repository
+from array import array
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Mapping, Optional, Dict, Sequence, Tuple
+import numpy as np
 from models import Holiday
-from constants import API_CACHE_TTL
-
-
-@st.cache_data(ttl=API_CACHE_TTL)
-def get_countries_for_quiz() -> Optional[List[dict]]:
+from services import holiday_service
+from services.holiday_index import HolidayIndex, holiday_index, normalize_holiday_name
+from constants import (
+    NON_HOLIDAY_CACHE_SIZE,
+    TRUE_FALSE_QUIZ_YEAR_MIN,
+    TRUE_FALSE_QUIZ_YEAR_MAX,
+    GUESS_QUIZ_YEAR_MIN,
+    GUESS_QUIZ_YEAR_MAX,
+)
+
+
+def get_countries_for_quiz() -> Optional[Sequence[Mapping[str, str]]]:
     """
-    クイズ用の国一覧を取得
+    クイズ用の国一覧を取得（holiday_serviceと同じキャッシュを使う）
 
     Returns:
-        List[dict]: 国一覧の辞書リスト、またはNone
+        Sequence[Mapping[str, str]]: 国一覧（読み取り専用）、またはNone
 
     Raises:
         Exception: 国一覧の取得に失敗した場合
     """
-    try:
-        return repository.get_available_countries()
-    except Exception as e:
-        raise e
+    return holiday_service.get_available_countries()
 
 
-@st.cache_data(ttl=API_CACHE_TTL)
-def get_holidays_for_country(year: int, country_code: str) -> Optional[List[Holiday]]:
+def get_holidays_for_country(
+    year: int, country_code: str
+) -> Optional[Sequence[Holiday]]:
     """
-    指定された国の祝日一覧を取得
+    指定された国の祝日一覧を取得（holiday_serviceと同じキャッシュを使う）
 
     Args:
         year: 年
         country_code: 国コード
 
     Returns:
-        List[Holiday]: 祝日一覧、またはNone
+        Sequence[Holiday]: 祝日一覧（不変）、またはNone
 
     Raises:
         Exception: 祝日一覧の取得に失敗した場合
     """
-    try:
-        return repository.get_public_holidays(year, country_code)
-    except Exception as e:
-        raise e
+    return holiday_service.get_public_holidays(year, country_code)
 
 
 def generate_random_date(year: int) -> datetime:
@@ -62,6 +65,73 @@ def generate_random_date(year: int) -> datetime:
     return start_date + timedelta(days=random_days)
 
 
+@lru_cache(maxsize=NON_HOLIDAY_CACHE_SIZE)
+def get_non_holiday_days(year: int, holiday_dates: Tuple[str, ...]) -> array:
+    """
+    指定された年の非祝日（年初からの日数）の配列を生成
+
+    年内の日ごとのビットマップに祝日を立て、その補集合を配列にする。
+
+    Args:
+        year: 年
+        holiday_dates: 祝日の日付（YYYY-MM-DD形式）のタプル
+
+    Returns:
+        array: 非祝日の年初からの日数（0始まり）の配列
+    """
+    start_date = date(year, 1, 1)
+    days_in_year = (date(year + 1, 1, 1) - start_date).days
+
+    # 祝日のビットマップを作成
+    bitmap = bytearray(days_in_year)
+    for holiday_date in holiday_dates:
+        offset = (date.fromisoformat(holiday_date) - start_date).days
+        if 0 <= offset < days_in_year:
+            bitmap[offset] = 1
+
+    return array("H", (day for day in range(days_in_year) if not bitmap[day]))
+
+
+def generate_non_holiday_date(year: int, holidays: Sequence[Holiday]) -> Optional[str]:
+    """
+    指定された年の祝日ではない日付を1回の乱数で生成
+
+    Args:
+        year: 年
+        holidays: その年の祝日リスト
+
+    Returns:
+        str: YYYY-MM-DD形式の日付、または非祝日がない場合はNone
+    """
+    non_holiday_days = get_non_holiday_days(
+        year, tuple(sorted({h.date for h in holidays}))
+    )
+    if not non_holiday_days:
+        return None
+
+    offset = non_holiday_days[random.randrange(len(non_holiday_days))]
+    return (date(year, 1, 1) + timedelta(days=offset)).isoformat()
+
+
+def is_distinct_from_answer(holiday: Holiday, correct_holiday: Holiday) -> bool:
+    """
+    推測問題の選択肢にできる祝日か判定する
+
+    正解と同じ日付、または正規化した名前が同じ祝日は、それ自体も問題の
+    祝日名に当てはまる正解になってしまうため選択肢にしない。
+
+    Args:
+        holiday: 選択肢の候補の祝日
+        correct_holiday: 正解の祝日
+
+    Returns:
+        bool: 選択肢にできる場合True
+    """
+    return holiday.date != correct_holiday.date and normalize_holiday_name(
+        holiday.name
+    ) != normalize_holiday_name(correct_holiday.name)
+
+
 def generate_true_false_question() -> Optional[Dict]:
     """
     真偽問題を生成
@@ -79,7 +149,7 @@ def generate_true_false_question() -> Optional[Dict]:
     country_name = country["name"]
 
     # ランダムな年を選択（2020-2025）
-    year = random.randint(2020, 2025)
+    year = random.randint(TRUE_FALSE_QUIZ_YEAR_MIN, TRUE_FALSE_QUIZ_YEAR_MAX)
 
     # 50%の確率で祝日、50%の確率で非祝日を生成
     is_holiday = random.choice([True, False])
@@ -103,21 +173,16 @@ def generate_true_false_question() -> Optional[Dict]:
             is_holiday = False
 
     if not is_holiday:
-        # ランダムな日付を生成
-        random_date = generate_random_date(year)
-
-        # その国の祝日リストを取得
+        # その国の祝日リストから非祝日を直接選ぶ
         holidays = get_holidays_for_country(year, country_code) or []
-        holiday_dates = [h.date for h in holidays]
-
-        # 祝日と重複しないようにする
-        while random_date.strftime("%Y-%m-%d") in holiday_dates:
-            random_date = generate_random_date(year)
+        non_holiday_date = generate_non_holiday_date(year, holidays)
+        if non_holiday_date is None:
+            return None
 
         return {
             "country_name": country_name,
             "country_code": country_code,
-            "date": random_date.strftime("%Y-%m-%d"),
+            "date": non_holiday_date,
             "is_holiday": False,
             "holiday_name": None,
             "local_name": None,
@@ -146,7 +211,7 @@ def generate_guess_question() -> Optional[Dict]:
     correct_country_name = correct_country["name"]
 
     # ランダムな年を選択（2023-2025）
-    year = random.randint(2023, 2025)
+    year = random.randint(GUESS_QUIZ_YEAR_MIN, GUESS_QUIZ_YEAR_MAX)
 
     # 正解の国の祝日を取得
     holidays = get_holidays_for_country(year, correct_country_code)
@@ -169,13 +234,39 @@ def generate_guess_question() -> Optional[Dict]:
         }
     )
 
-    # 他の国の選択肢を3つ作成
+    # 名前が似ている他の国の祝日を優先して選択肢にする（API呼び出しなし）
+    similar_holidays = [
+        h
+        for h in holiday_index.similar_holidays(correct_holiday.name, year)
+        if h.country_code != correct_country_code
+        and is_distinct_from_answer(h, correct_holiday)
+    ]
+    for similar_holiday in random.sample(
+        similar_holidays, min(3, len(similar_holidays))
+    ):
+        options.append(
+            {
+                "date": similar_holiday.date,
+                "country_code": similar_holiday.country_code,
+                "country_name": holiday_index.get_country_name(
+                    similar_holiday.country_code
+                ),
+                "is_correct": False,
+            }
+        )
+
+    # 足りない分は他の国の祝日から選択肢を作成
+    used_country_codes = {opt["country_code"] for opt in options}
     for country in selected_countries:
-        if country["countryCode"] != correct_country_code:
+        if len(options) >= 4:
+            break
+        if country["countryCode"] not in used_country_codes:
             # その国の祝日を取得
-            other_holidays = (
-                get_holidays_for_country(year, country["countryCode"]) or []
-            )
+            other_holidays = [
+                h
+                for h in get_holidays_for_country(year, country["countryCode"]) or []
+                if is_distinct_from_answer(h, correct_holiday)
+            ]
 
             if other_holidays:
                 # ランダムな祝日を選択
@@ -221,6 +312,190 @@ def generate_guess_question() -> Optional[Dict]:
     }
 
 
+def generate_true_false_questions(
+    n: int, seed: Optional[int] = None, index: Optional[HolidayIndex] = None
+) -> List[Dict]:
+    """
+    真偽問題をまとめて生成（API呼び出しなし）
+
+    インデックスに登録済みの(国, 年)だけを使い、乱数は独立したRNGで
+    まとめて引くため、同じシードとインデックスからは同じ問題列が得られる。
+
+    Args:
+        n: 生成する問題数
+        seed: 乱数シード（省略時は毎回異なる問題）
+        index: 祝日インデックス（省略時はプロセス共通のインデックス）
+
+    Returns:
+        List[Dict]: 問題の辞書データのリスト（登録データがない場合は空）
+    """
+    index = index or holiday_index
+    keys = index.keys(TRUE_FALSE_QUIZ_YEAR_MIN, TRUE_FALSE_QUIZ_YEAR_MAX)
+    if n <= 0 or not keys:
+        return []
+
+    rng = np.random.default_rng(seed)
+    key_ids = rng.integers(len(keys), size=n)
+    want_holiday = rng.random(n) < 0.5
+    picks = rng.random(n)
+
+    questions = []
+    for key_id, is_holiday, pick in zip(key_ids, want_holiday, picks):
+        country_code, year = keys[key_id]
+        holidays = index.get_holidays(year, country_code)
+        question = {
+            "country_name": index.get_country_name(country_code),
+            "country_code": country_code,
+        }
+
+        if is_holiday and holidays:
+            holiday = holidays[int(pick * len(holidays))]
+            question.update(
+                {
+                    "date": holiday.date,
+                    "is_holiday": True,
+                    "holiday_name": holiday.name,
+                    "local_name": holiday.local_name,
+                }
+            )
+        else:
+            days = get_non_holiday_days(
+                year, tuple(sorted({h.date for h in holidays or ()}))
+            )
+            offset = int(days[int(pick * len(days))])
+            question.update(
+                {
+                    "date": (date(year, 1, 1) + timedelta(days=offset)).isoformat(),
+                    "is_holiday": False,
+                    "holiday_name": None,
+                    "local_name": None,
+                }
+            )
+        questions.append(question)
+
+    return questions
+
+
+def generate_guess_questions(
+    n: int, seed: Optional[int] = None, index: Optional[HolidayIndex] = None
+) -> List[Dict]:
+    """
+    推測問題をまとめて生成（API呼び出しなし）
+
+    正解と名前が似ている他の国の祝日を優先して選択肢にし、足りない分は同じ年の
+    他の国の祝日で補う。正解と同じ日付・同じ名前の祝日は選択肢にしない。それでも足りない場合はダミーの日付で選択肢を補う。
+
+    Args:
+        n: 生成する問題数
+        seed: 乱数シード（省略時は毎回異なる問題）
+        index: 祝日インデックス（省略時はプロセス共通のインデックス）
+
+    Returns:
+        List[Dict]: 問題の辞書データのリスト（登録データがない場合は空）
+    """
+    index = index or holiday_index
+    keys = [
+        key
+        for key in index.keys(GUESS_QUIZ_YEAR_MIN, GUESS_QUIZ_YEAR_MAX)
+        if index.get_holidays(key[1], key[0])
+    ]
+    if n <= 0 or not keys:
+        return []
+
+    # 年ごとに国をまとめておく
+    countries_by_year: Dict[int, List[str]] = {}
+    for country_code, year in keys:
+        countries_by_year.setdefault(year, []).append(country_code)
+
+    rng = np.random.default_rng(seed)
+    key_ids = rng.integers(len(keys), size=n)
+    picks = rng.random((n, 4))
+
+    questions = []
+    for key_id, pick in zip(key_ids, picks):
+        correct_country_code, year = keys[key_id]
+        holidays = index.get_holidays(year, correct_country_code)
+        correct_holiday = holidays[int(pick[0] * len(holidays))]
+
+        options = [
+            {
+                "date": correct_holiday.date,
+                "country_code": correct_country_code,
+                "country_name": index.get_country_name(correct_country_code),
+                "is_correct": True,
+            }
+        ]
+
+        # 名前が似ている他の国の祝日を優先し、足りない分は同じ年の他の国から選ぶ
+        similar = [
+            h
+            for h in index.similar_holidays(correct_holiday.name, year)
+            if h.country_code != correct_country_code
+            and is_distinct_from_answer(h, correct_holiday)
+        ]
+        distractors = [
+            similar[i]
+            for i in rng.choice(len(similar), size=min(3, len(similar)), replace=False)
+        ]
+        used = {correct_country_code} | {h.country_code for h in distractors}
+        others = [c for c in countries_by_year[year] if c not in used]
+        selected = rng.choice(
+            len(others), size=min(3 - len(distractors), len(others)), replace=False
+        )
+        for other_id, other_pick in zip(selected, pick[1:]):
+            other_holidays = [
+                h
+                for h in index.get_holidays(year, others[other_id])
+                if is_distinct_from_answer(h, correct_holiday)
+            ]
+            if other_holidays:
+                distractors.append(
+                    other_holidays[int(other_pick * len(other_holidays))]
+                )
+
+        for distractor in distractors:
+            options.append(
+                {
+                    "date": distractor.date,
+                    "country_code": distractor.country_code,
+                    "country_name": index.get_country_name(distractor.country_code),
+                    "is_correct": False,
+                }
+            )
+
+        # 選択肢が4つ未満の場合はダミーの日付を生成
+        while len(options) < 4:
+            month = int(rng.integers(1, 13))
+            day = int(rng.integers(1, 29))  # 月の最大は28日
+            fake_date = f"{year}-{month:02d}-{day:02d}"
+            if not any(opt["date"] == fake_date for opt in options):
+                fake_code = options[int(rng.integers(len(options)))]["country_code"]
+                options.append(
+                    {
+                        "date": fake_date,
+                        "country_code": fake_code,
+                        "country_name": index.get_country_name(fake_code),
+                        "is_correct": False,
+                    }
+                )
+
+        # 選択肢をシャッフル
+        options = [options[i] for i in rng.permutation(4)]
+
+        questions.append(
+            {
+                "holiday_name": correct_holiday.name,
+                "local_name": correct_holiday.local_name,
+                "options": options,
+                "correct_index": next(
+                    i for i, opt in enumerate(options) if opt["is_correct"]
+                ),
+            }
+        )
+
+    return questions
+
+
 def check_true_false_answer(question: Dict, user_answer: bool) -> bool:
     """
     真偽問題の回答をチェック
@@ -0,0 +1,287 @@
+"""
+起動時のキャッシュのウォームアップ（クイズと人気の検索で使う祝日一覧の事前取得）
+
+トップページの初回表示を遅らせないよう、API通信を行うサービス（requests等）は
+ワーカースレッドの中で読み込む。
+ウォームアップのリクエストは専用のトークンバケットの予算に合わせて間隔を空けて送り、
+ユーザーの検索とAPIのレート制限を取り合わないようにする。
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Sequence, Tuple
+from services.cache import api_cache
+from constants import (
+    TRUE_FALSE_QUIZ_YEAR_MIN,
+    TRUE_FALSE_QUIZ_YEAR_MAX,
+    GUESS_QUIZ_YEAR_MIN,
+    GUESS_QUIZ_YEAR_MAX,
+    WARMUP_ENABLED,
+    WARMUP_QUIZ_COUNTRIES,
+    WARMUP_POPULAR_KEYS,
+    WARMUP_MAX_WORKERS,
+    WARMUP_RATE,
+    WARMUP_BURST,
+)
+
+if TYPE_CHECKING:
+    from repository import TokenBucket
+
+# ウォームアップの単位（国コード, 年）
+WarmupKey = Tuple[str, int]
+
+
+def get_quiz_years() -> List[int]:
+    """
+    クイズで出題する年（マルバツクイズと祝日名当てクイズの範囲の和）
+
+    Returns:
+        List[int]: 昇順の年のリスト
+    """
+    return sorted(
+        set(range(TRUE_FALSE_QUIZ_YEAR_MIN, TRUE_FALSE_QUIZ_YEAR_MAX + 1))
+        | set(range(GUESS_QUIZ_YEAR_MIN, GUESS_QUIZ_YEAR_MAX + 1))
+    )
+
+
+def get_popular_keys(limit: int = WARMUP_POPULAR_KEYS) -> List[WarmupKey]:
+    """
+    よく検索される(国, 年)を推定する
+
+    お気に入りは検索結果から追加されるため、お気に入りの多い(国, 年)と、
+    その国の今年（検索の既定の年）をよく検索されるものとみなす。
+
+    Args:
+        limit: 取得する数
+
+    Returns:
+        List[WarmupKey]: よく検索される順の(国コード, 年)のリスト
+    """
+    from services import favorite_service
+
+    try:
+        favorites = favorite_service.load_favorites()
+    except Exception:
+        return []
+
+    counts = Counter((h.country_code, int(h.date[:4])) for h in favorites)
+    current_year = datetime.now().year
+    keys: List[WarmupKey] = []
+    for country_code, year in (key for key, _ in counts.most_common()):
+        keys.extend([(country_code, current_year), (country_code, year)])
+    return list(dict.fromkeys(keys))[:limit]
+
+
+class WarmupJob:
+    """
+    起動時にバックグラウンドでキャッシュを温めるジョブ
+
+    国一覧を取得してから、よく検索される(国, 年)とクイズの年の範囲の
+    祝日一覧を並行して取得する。予算が足りない間はトークンが補充されるまで待つ。
+    進捗と所要時間はmetrics()で取得できる。
+    """
+
+    IDLE = "idle"
+    LOADING_COUNTRIES = "loading_countries"
+    FETCHING = "fetching"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(
+        self,
+        quiz_countries: Optional[int] = WARMUP_QUIZ_COUNTRIES,
+        popular_keys: Callable[[], Sequence[WarmupKey]] = get_popular_keys,
+        max_workers: int = WARMUP_MAX_WORKERS,
+        budget: Optional["TokenBucket"] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            quiz_countries: クイズの年の範囲を取得しておく国数（Noneは全ての国）
+            popular_keys: よく検索される(国, 年)を返す関数
+            max_workers: 並行して取得するスレッド数
+            budget: ウォームアップのリクエストに使うトークンバケット
+                （Noneはワーカースレッドの中で既定の予算を作る）
+            clock: 所要時間の計測に使う時計
+        """
+        self.quiz_countries = quiz_countries
+        self.popular_keys = popular_keys
+        self.max_workers = max_workers
+        self.budget = budget
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._state = self.IDLE
+        self._total = 0
+        self._completed = 0
+        self._skipped = 0
+        self._failed = 0
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._error: Optional[Exception] = None
+
+    def start(self) -> bool:
+        """
+        ウォームアップをバックグラウンドで開始する（すぐに戻る）
+
+        Returns:
+            bool: 開始した場合True、開始済みの場合False
+        """
+        with self._lock:
+            if self._worker is not None:
+                return False
+            self._state = self.LOADING_COUNTRIES
+            self._started_at = self._clock()
+            self._worker = threading.Thread(
+                target=self._run, name="cache-warmup", daemon=True
+            )
+            self._worker.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """ウォームアップが終わるまで待つ（テスト用）"""
+        with self._lock:
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def metrics(self) -> dict:
+        """
+        ウォームアップの進捗を取得する
+
+        Returns:
+            dict: 以下のキーを持つ辞書
+                - state: 状態（idle, loading_countries, fetching, done, failed）
+                - total: 取得する(国, 年)の数
+                - completed: 取得が終わった数（キャッシュ済みで省略した分を含む）
+                - skipped: キャッシュ済みで省略した数
+                - failed: 取得に失敗した数
+                - progress: 進捗（0〜1）
+                - duration: 経過時間（終了後は所要時間、秒）
+                - error: 国一覧の取得に失敗した場合のエラーメッセージ
+        """
+        with self._lock:
+            if self._started_at is None:
+                duration = 0.0
+            else:
+                finished_at = (
+                    self._finished_at
+                    if self._finished_at is not None
+                    else self._clock()
+                )
+                duration = finished_at - self._started_at
+            done = self._completed + self._failed
+            return {
+                "state": self._state,
+                "total": self._total,
+                "completed": self._completed,
+                "skipped": self._skipped,
+                "failed": self._failed,
+                "progress": done / self._total if self._total else 0.0,
+                "duration": duration,
+                "error": str(self._error) if self._error is not None else None,
+            }
+
+    def plan(self, countries: Sequence[str]) -> List[WarmupKey]:
+        """
+        取得する(国, 年)を優先度順に決める
+
+        Args:
+            countries: 利用可能な国コードのリスト
+
+        Returns:
+            List[WarmupKey]: よく検索される(国, 年)、クイズの国・年の順のリスト
+        """
+        available = set(countries)
+        keys = [key for key in self.popular_keys() if key[0] in available]
+        quiz_countries = list(countries)
+        if self.quiz_countries is not None and self.quiz_countries < len(countries):
+            quiz_countries = random.sample(quiz_countries, self.quiz_countries)
+        keys.extend(
+            (country_code, year)
+            for year in get_quiz_years()
+            for country_code in quiz_countries
+        )
+        return list(dict.fromkeys(keys))
+
+    def _run(self) -> None:
+        """ワーカースレッドの本体"""
+        import repository
+        from services import holiday_service
+
+        if self.budget is None:
+            self.budget = repository.TokenBucket(WARMUP_RATE, WARMUP_BURST)
+
+        try:
+            countries = holiday_service.get_available_countries()
+        except Exception as e:
+            with self._lock:
+                self._state = self.FAILED
+                self._error = e
+                self._finished_at = self._clock()
+            return
+
+        keys = self.plan([country["countryCode"] for country in countries])
+        with self._lock:
+            self._state = self.FETCHING
+            self._total = len(keys)
+
+        missing = []
+        for country_code, year in keys:
+            if api_cache.contains(f"PublicHolidays/{year}/{country_code}"):
+                with self._lock:
+                    self._completed += 1
+                    self._skipped += 1
+            else:
+                missing.append((country_code, year))
+
+        if missing:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="cache-warmup"
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        self._fetch, holiday_service.get_public_holidays, key
+                    )
+                    for key in missing
+                ]
+                for future in as_completed(futures):
+                    future.result()
+
+        with self._lock:
+            self._state = self.DONE
+            self._finished_at = self._clock()
+
+    def _fetch(self, load: Callable[[int, str], Any], key: WarmupKey) -> None:
+        """予算のトークンを待ってから1つの(国, 年)を取得する"""
+        country_code, year = key
+        self.budget.acquire()
+        try:
+            load(year, country_code)
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            return
+        with self._lock:
+            self._completed += 1
+
+
+# プロセス共通のウォームアップ
+warmup_job = WarmupJob()
+
+
+def start_warmup() -> bool:
+    """
+    プロセス共通のウォームアップを開始する（設定で無効な場合や開始済みの場合は何もしない）
+
+    Returns:
+        bool: 開始した場合True
+    """
+    if not WARMUP_ENABLED:
+        return False
+    return warmup_job.start()
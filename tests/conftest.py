@@ -4,7 +4,48 @@ pytestの共通設定とフィクスチャ
 
 import pytest
 import pandas as pd
+import repository
 from models import Holiday
+from services.business_day_service import clear_calendar_cache
+from services.cache import api_cache
+from services.holiday_index import holiday_index
+from services.prefetch_service import prefetcher
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_caches():
+    """テスト間でプロセス共通のキャッシュやAPI呼び出しの状態が共有されないようにする"""
+    api_cache.clear()
+    holiday_index.clear()
+    clear_calendar_cache()
+    repository.circuit_breaker.reset()
+    repository.rate_limiter.reset()
+    repository.response_validators.clear()
+    prefetcher.clear()
+    prefetcher.budget.reset()
+    yield
+    prefetcher.clear()
+    api_cache.clear()
+    holiday_index.clear()
+    repository.circuit_breaker.reset()
+
+
+class FakeClock:
+    """テスト用の時計（stepを指定すると呼ばれるたびにその秒数だけ進む）"""
+
+    def __init__(self, step=0.0):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+@pytest.fixture
+def fake_clock():
+    """時刻を手動で進めるテスト用の時計"""
+    return FakeClock()
 
 
 @pytest.fixture
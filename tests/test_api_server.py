@@ -0,0 +1,213 @@
+"""
+api_server.pyのテスト
+"""
+
+import gzip
+import http.client
+import json
+import threading
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from models import Holiday
+from api_server import (
+    accepts_gzip,
+    create_server,
+    encode_response,
+    get_response,
+    response_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """テスト間でレスポンスのキャッシュが共有されないようにする"""
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
+@pytest.fixture
+def server():
+    """空いているポートでサーバーを起動する"""
+    server = create_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def many_holidays(year, country_code, **options):
+    """gzipで圧縮される大きさの祝日一覧を返す"""
+    return [
+        Holiday(f"{year}-01-{day:02d}", f"Holiday {day}", f"祝日 {day}", country_code)
+        for day in range(1, 29)
+    ]
+
+
+class TestGetResponse:
+    """get_response関数のテスト"""
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_holidays(self, mock_repo_get, sample_holidays):
+        """祝日一覧をJSONで返し、同じURLはキャッシュから返すテスト"""
+        # モックの設定
+        mock_repo_get.return_value = sample_holidays
+
+        response = get_response("/holidays/2025/JP")
+        cached = get_response("/holidays/2025/jp/")
+
+        assert response.status == 200
+        assert json.loads(response.body)[0] == {
+            "date": "2025-01-01",
+            "name": "New Year's Day",
+            "local_name": "元日",
+            "country_code": "JP",
+            "counties": None,
+        }
+        assert response.max_age > 0
+        assert cached is response
+        mock_repo_get.assert_called_once_with(2025, "JP")
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_is_holiday(self, mock_repo_get, sample_holidays):
+        """指定した日付が祝日かを返すテスト"""
+        # モックの設定
+        mock_repo_get.return_value = sample_holidays
+
+        response = get_response("/is-holiday/JP?date=2025-01-13")
+
+        assert json.loads(response.body) == {
+            "country_code": "JP",
+            "date": "2025-01-13",
+            "is_holiday": True,
+        }
+
+    @patch("services.favorite_service.load_favorites")
+    def test_favorites_stats(self, mock_load, sample_holidays):
+        """お気に入りの統計をJSONで返すテスト"""
+        # モックの設定
+        mock_load.return_value = sample_holidays
+
+        result = json.loads(get_response("/favorites/stats").body)
+
+        assert result["total_holidays"] == 3
+        assert result["countries"] == {"JP": 3}
+        assert result["months"] == {"1": 2, "2": 1}
+        assert result["most_month"] == 1
+
+    def test_cache_stats_not_cached(self):
+        """キャッシュの統計はキャッシュしないテスト"""
+        get_response("/cache/stats")
+        response = get_response("/cache/stats")
+
+        assert response.max_age == 0
+        assert json.loads(response.body)["response_cache"]["entries"] == 0
+
+    @pytest.mark.parametrize(
+        "target, status",
+        [
+            ("/unknown", 404),
+            ("/holidays/2025/JPN", 400),
+            ("/holidays/1800/JP", 400),
+            ("/is-holiday/JP?date=2025-13-01", 400),
+            ("/is-holiday/JP?offset=13", 400),
+        ],
+    )
+    def test_invalid_request(self, target, status):
+        """不正なリクエストのテスト"""
+        response = get_response(target)
+
+        assert response.status == status
+        assert "error" in json.loads(response.body)
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_api_errors(self, mock_repo_get):
+        """存在しない国はAPIと同じステータス、通信エラーは502を返すテスト"""
+        # モックの設定
+        mock_repo_get.side_effect = requests.HTTPError(
+            "404 Error", response=Mock(status_code=404)
+        )
+        assert get_response("/holidays/2025/XX").status == 404
+
+        mock_repo_get.side_effect = requests.ConnectionError("API Error")
+        assert get_response("/holidays/2025/JP").status == 502
+
+
+class TestEncoding:
+    """レスポンスのエンコードのテスト"""
+
+    def test_gzip_only_large_responses(self):
+        """大きいレスポンスだけをgzipで圧縮するテスト"""
+        small = encode_response(200, {"ok": True})
+        large = encode_response(200, ["祝日"] * 1000)
+
+        assert small.gzip_body is None
+        assert gzip.decompress(large.gzip_body) == large.body
+        assert len(large.gzip_body) < len(large.body)
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("gzip, deflate, br", True),
+            ("deflate;q=1.0, gzip;q=0.5", True),
+            ("gzip;q=0", False),
+            ("*", True),
+            ("identity", False),
+            (None, False),
+        ],
+    )
+    def test_accepts_gzip(self, header, expected):
+        """Accept-Encodingの判定テスト"""
+        assert accepts_gzip(header) == expected
+
+
+class TestServer:
+    """HTTPサーバーのテスト"""
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_gzip_and_not_modified(self, mock_repo_get, server):
+        """gzipで返し、ETagが一致する場合は304を返すテスト"""
+        # モックの設定
+        mock_repo_get.side_effect = many_holidays
+        connection = http.client.HTTPConnection(*server.server_address[:2])
+
+        connection.request(
+            "GET", "/holidays/2025/JP", headers={"Accept-Encoding": "gzip"}
+        )
+        response = connection.getresponse()
+        body = gzip.decompress(response.read())
+        etag = response.getheader("ETag")
+
+        assert response.status == 200
+        assert response.getheader("Content-Encoding") == "gzip"
+        assert response.getheader("Content-Type") == "application/json; charset=utf-8"
+        assert len(json.loads(body)) == 28
+
+        # 同じ接続を使い回して条件付きリクエストを送る
+        connection.request("GET", "/holidays/2025/JP", headers={"If-None-Match": etag})
+        response = connection.getresponse()
+        response.read()
+        connection.close()
+
+        assert response.status == 304
+        mock_repo_get.assert_called_once()
+
+    def test_concurrent_requests(self, server):
+        """並行したリクエストを処理するテスト"""
+        statuses = []
+
+        def request():
+            connection = http.client.HTTPConnection(*server.server_address[:2])
+            connection.request("GET", "/cache/stats")
+            statuses.append(connection.getresponse().status)
+            connection.close()
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert statuses == [200] * 8
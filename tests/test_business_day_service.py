@@ -0,0 +1,198 @@
+"""
+business_day_service.pyのテスト
+"""
+
+from datetime import date
+import numpy as np
+import pytest
+from unittest.mock import patch
+from models import Holiday
+from services import business_day_service
+from services.business_day_service import (
+    BusinessCalendar,
+    add_business_days,
+    business_days_between,
+    get_business_calendar,
+    get_business_day_bitmap,
+    next_business_day,
+)
+from constants import YEAR_MIN, YEAR_MAX
+
+
+@pytest.fixture
+def calendar():
+    """2025年の営業日カレンダー（元日と成人の日が祝日）"""
+    bitmap = get_business_day_bitmap(2025, (5, 6), ("2025-01-01", "2025-01-13"))
+    return BusinessCalendar(date(2025, 1, 1), bitmap)
+
+
+def make_year_holidays(year, country_code):
+    """年ごとの祝日一覧を作成（元日と大晦日）"""
+    return [
+        Holiday(f"{year}-01-01", "New Year's Day", "元日", country_code),
+        Holiday(f"{year}-12-31", "New Year's Eve", "大晦日", country_code),
+    ]
+
+
+class TestBusinessCalendar:
+    """BusinessCalendarクラスのテスト"""
+
+    def test_is_business_day(self, calendar):
+        """営業日の判定テスト"""
+        assert calendar.is_business_day(date(2025, 1, 2))
+        assert not calendar.is_business_day(date(2025, 1, 1))  # 祝日
+        assert not calendar.is_business_day(date(2025, 1, 4))  # 土曜日
+
+    def test_business_days_between(self, calendar):
+        """期間内の営業日数の計算テスト"""
+        assert calendar.business_days_between(date(2025, 1, 1), date(2025, 2, 1)) == 21
+        assert calendar.business_days_between(date(2025, 1, 6), date(2025, 1, 6)) == 0
+        assert calendar.business_days_between(date(2025, 2, 1), date(2025, 1, 1)) == -21
+
+    def test_business_days_between_until_end_of_calendar(self, calendar):
+        """カレンダーの最終日の翌日を終了日にできるテスト"""
+        result = calendar.business_days_between(date(2025, 12, 1), date(2026, 1, 1))
+
+        assert result == 23
+
+    def test_add_business_days(self, calendar):
+        """N営業日後・N営業日前の計算テスト"""
+        assert calendar.add_business_days(date(2025, 1, 10), 1) == date(2025, 1, 14)
+        assert calendar.add_business_days(date(2025, 1, 10), 5) == date(2025, 1, 20)
+        assert calendar.add_business_days(date(2025, 1, 14), -1) == date(2025, 1, 10)
+        assert calendar.add_business_days(date(2025, 1, 4), 0) == date(2025, 1, 4)
+
+    def test_next_and_previous_business_day(self, calendar):
+        """次の営業日・前の営業日の計算テスト"""
+        assert calendar.next_business_day(date(2025, 1, 11)) == date(2025, 1, 14)
+        assert calendar.previous_business_day(date(2025, 1, 4)) == date(2025, 1, 3)
+
+    def test_out_of_range(self, calendar):
+        """カレンダーの期間外の場合のテスト"""
+        with pytest.raises(ValueError):
+            calendar.is_business_day(date(2024, 12, 31))
+        with pytest.raises(ValueError):
+            calendar.add_business_days(date(2025, 12, 30), 5)
+        with pytest.raises(ValueError):
+            calendar.add_business_days(date(2025, 1, 2), -1)
+
+    def test_batch_matches_single_queries(self, calendar):
+        """一括計算の結果が1件ずつの計算と一致するテスト"""
+        rng = np.random.default_rng(0)
+        starts = np.datetime64("2025-01-10") + rng.integers(0, 250, 50)
+        ends = starts + rng.integers(0, 60, 50)
+        n = rng.integers(-3, 20, 50)
+
+        counts = calendar.business_days_between_many(starts, ends)
+        added = calendar.add_business_days_many(ends, n)
+
+        for start, end, k, count, result in zip(starts, ends, n, counts, added):
+            start, end = start.astype(date), end.astype(date)
+            assert count == calendar.business_days_between(start, end)
+            assert result.astype(date) == calendar.add_business_days(end, int(k))
+
+    def test_weekend_definition(self):
+        """週末の曜日を指定できるテスト（金曜・土曜が週末）"""
+        bitmap = get_business_day_bitmap(2025, (4, 5), ())
+        calendar = BusinessCalendar(date(2025, 1, 1), bitmap)
+
+        assert calendar.is_business_day(date(2025, 1, 5))  # 日曜日
+        assert not calendar.is_business_day(date(2025, 1, 3))  # 金曜日
+
+
+class TestBusinessDayService:
+    """営業日サービスの関数のテスト"""
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_business_days_between_across_years(self, mock_repo_get):
+        """年をまたぐ期間の営業日数の計算テスト"""
+        # モックの設定
+        mock_repo_get.side_effect = make_year_holidays
+
+        result = business_days_between("JP", date(2025, 12, 29), date(2026, 1, 6))
+
+        # 12/29, 12/30, 1/2, 1/5（12/31と1/1は祝日）
+        assert result == 4
+        assert mock_repo_get.call_count == 2
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_add_business_days_extends_calendar(self, mock_repo_get):
+        """結果が翌年になる場合もカレンダーを広げて計算するテスト"""
+        # モックの設定
+        mock_repo_get.side_effect = make_year_holidays
+
+        assert add_business_days("JP", date(2025, 12, 30), 1) == date(2026, 1, 2)
+        assert next_business_day("JP", date(2026, 1, 2)) == date(2026, 1, 5)
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_add_business_days_limited_to_year_range(self, mock_repo_get):
+        """結果が取得できる年の範囲外になる場合は範囲外の年を取得せずにエラーになるテスト"""
+        # モックの設定
+        mock_repo_get.return_value = []
+
+        with pytest.raises(ValueError):
+            add_business_days("JP", date(2025, 6, 1), 10**6)
+        with pytest.raises(ValueError):
+            add_business_days("JP", date(2025, 6, 1), -(10**6))
+
+        years = {call.args[0] for call in mock_repo_get.call_args_list}
+        assert min(years) >= YEAR_MIN
+        assert max(years) <= YEAR_MAX
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_calendar_reused(self, mock_repo_get, sample_holidays):
+        """同じ祝日一覧のカレンダーが使い回されるテスト"""
+        # モックの設定
+        mock_repo_get.return_value = sample_holidays
+
+        first = get_business_calendar("JP", 2025, 2025)
+        second = get_business_calendar("JP", 2025, 2025)
+
+        assert first is second
+        mock_repo_get.assert_called_once_with(2025, "JP")
+
+    @patch("services.holiday_service.get_public_holidays")
+    def test_cached_calendar_skips_holiday_lists(self, mock_get, sample_holidays):
+        """作成済みのカレンダーでは祝日一覧を読み直さないテスト"""
+        # モックの設定
+        mock_get.return_value = tuple(sample_holidays)
+        business_days_between("JP", date(2025, 1, 6), date(2025, 1, 20))
+        mock_get.reset_mock()
+
+        assert business_days_between("JP", date(2025, 1, 6), date(2025, 1, 20)) == 9
+        assert next_business_day("JP", date(2025, 1, 10)) == date(2025, 1, 14)
+        mock_get.assert_not_called()
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_calendar_dropped_on_cache_eviction(self, mock_repo_get, sample_holidays):
+        """祝日一覧がキャッシュから追い出されるとカレンダーを作り直すテスト"""
+        # モックの設定
+        mock_repo_get.return_value = sample_holidays
+        first = get_business_calendar("JP", 2024, 2025)
+
+        business_day_service._on_cache_eviction("PublicHolidays/2023/JP")
+        assert get_business_calendar("JP", 2024, 2025) is first
+
+        business_day_service._on_cache_eviction("PublicHolidays/2025/JP")
+        assert get_business_calendar("JP", 2024, 2025) is not first
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_subdivision(self, mock_repo_get):
+        """州・県の祝日は指定した場合だけ休みになるテスト"""
+        # モックの設定
+        mock_repo_get.return_value = [
+            Holiday("2025-01-06", "Epiphany", "Heilige Drei Könige", "DE", ("DE-BY",))
+        ]
+
+        national = get_business_calendar("DE", 2025, 2025)
+        bavaria = get_business_calendar("DE", 2025, 2025, subdivision="DE-BY")
+
+        assert national.is_business_day(date(2025, 1, 6))
+        assert not bavaria.is_business_day(date(2025, 1, 6))
+
+    def test_invalid_weekend(self):
+        """週末の指定が不正な場合のテスト"""
+        with pytest.raises(ValueError):
+            get_business_calendar("JP", 2025, 2025, weekend=range(7))
+        with pytest.raises(ValueError):
+            get_business_calendar("JP", 2025, 2025, weekend=(7,))
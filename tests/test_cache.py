@@ -0,0 +1,444 @@
+"""
+cache.pyのテスト
+"""
+
+import threading
+import time
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+from types import MappingProxyType
+from models import Holiday
+from services.cache import ApiCache, estimate_size
+from constants import YEAR_MIN, YEAR_MAX
+
+
+def make_year_holidays(year, country_code):
+    """スイープ用の1年分の祝日を作成"""
+    return tuple(
+        Holiday(
+            date=f"{year}-{month:02d}-01",
+            name=f"Holiday {month}",
+            local_name=f"祝日 {month}",
+            country_code=country_code,
+        )
+        for month in range(1, 13)
+    )
+
+
+class TestEstimateSize:
+    """estimate_size関数のテスト"""
+
+    def test_larger_value_is_larger(self):
+        """要素が多いほどサイズが大きいテスト"""
+        small = make_year_holidays(2025, "JP")[:1]
+        large = make_year_holidays(2025, "JP")
+
+        assert estimate_size(large) > estimate_size(small) > 0
+
+    def test_mapping_proxy(self):
+        """読み取り専用の辞書のサイズ概算テスト"""
+        country = {"countryCode": "JP", "name": "Japan"}
+
+        assert estimate_size(MappingProxyType(country)) > estimate_size(country)
+
+
+class TestApiCache:
+    """ApiCacheクラスのテスト"""
+
+    def test_get_or_load_caches_value(self):
+        """取得した値がキャッシュされるテスト"""
+        cache = ApiCache()
+        loader = MagicMock(return_value=["JP"])
+
+        result1 = cache.get_or_load("AvailableCountries", loader)
+        result2 = cache.get_or_load("AvailableCountries", loader)
+
+        assert result1 == ["JP"]
+        assert result2 is result1
+        loader.assert_called_once()
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_get_or_load_exception_not_cached(self):
+        """取得失敗時はキャッシュされないテスト"""
+        cache = ApiCache()
+        loader = MagicMock(side_effect=[Exception("API Error"), ["JP"]])
+
+        with pytest.raises(Exception, match="API Error"):
+            cache.get_or_load("AvailableCountries", loader)
+
+        assert cache.get_or_load("AvailableCountries", loader) == ["JP"]
+        assert loader.call_count == 2
+
+    def test_ttl_expiration(self, fake_clock):
+        """有効期限切れで再取得されるテスト"""
+        cache = ApiCache(ttl=10, clock=fake_clock)
+        loader = MagicMock(side_effect=["old", "new"])
+
+        assert cache.get_or_load("key", loader) == "old"
+        fake_clock.now = 9.9
+        assert cache.get_or_load("key", loader) == "old"
+        fake_clock.now = 10.0
+        assert cache.get_or_load("key", loader) == "new"
+        assert cache.stats()["expirations"] == 1
+
+    def test_lru_eviction(self):
+        """上限を超えると最も古く使われたエントリが削除されるテスト"""
+        cache = ApiCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # aを最近使ったことにする
+
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_contains(self, fake_clock):
+        """有効なエントリの判定がヒット数やLRUの順序を変えないテスト"""
+        cache = ApiCache(ttl=10, max_entries=2, clock=fake_clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        assert cache.contains("a")
+        assert not cache.contains("missing")
+        cache.set("c", 3)  # containsではaを最近使ったことにならない
+
+        assert not cache.contains("a")
+        assert cache.stats()["hits"] == 0
+        fake_clock.now = 10.0
+        assert not cache.contains("b")
+
+    def test_keys_with_prefix(self):
+        """接頭辞でのキー取得テスト"""
+        cache = ApiCache()
+        cache.set("AvailableCountries", [])
+        cache.set("PublicHolidays/2025/JP", [])
+        cache.set("PublicHolidays/2025/US", [])
+
+        assert sorted(cache.keys("PublicHolidays/")) == [
+            "PublicHolidays/2025/JP",
+            "PublicHolidays/2025/US",
+        ]
+
+    def test_invalidate_and_clear(self):
+        """エントリの削除テスト"""
+        cache = ApiCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.invalidate("a")
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+        cache.clear()
+        assert cache.stats()["entries"] == 0
+
+    def test_concurrent_loads_fetch_once(self):
+        """同じキーへの同時アクセスで1回だけ取得されるテスト"""
+        cache = ApiCache()
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_load("key", slow_loader))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["value"] * 8
+        assert len(calls) == 1
+
+    def test_key_lock_kept_while_threads_wait(self):
+        """取得に失敗した後も、待っているスレッドがいる間は同じロックで1つずつ取得するテスト"""
+        cache = ApiCache()
+        first_started = threading.Event()
+        release_first = threading.Event()
+        lock = threading.Lock()
+        calls = []
+        active = [0]
+        max_active = [0]
+
+        def loader():
+            with lock:
+                calls.append(1)
+                first = len(calls) == 1
+                active[0] += 1
+                max_active[0] = max(max_active[0], active[0])
+            try:
+                if first:
+                    first_started.set()
+                    release_first.wait(5)
+                    raise requests.ConnectionError("down")
+                time.sleep(0.1)
+                return "value"
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        def load(results):
+            try:
+                results.append(cache.get_or_load("key", loader))
+            except requests.ConnectionError:
+                results.append("error")
+
+        results_a, results_b, results_c = [], [], []
+        thread_a = threading.Thread(target=load, args=(results_a,))
+        thread_a.start()
+        first_started.wait(5)
+        thread_b = threading.Thread(target=load, args=(results_b,))
+        thread_b.start()
+        while cache._key_locks["key"].users < 2:
+            time.sleep(0.001)
+
+        # Aが失敗した後、Bが取得している間にCが来る
+        release_first.set()
+        while len(calls) < 2:
+            time.sleep(0.001)
+        thread_c = threading.Thread(target=load, args=(results_c,))
+        thread_c.start()
+        for thread in (thread_a, thread_b, thread_c):
+            thread.join(5)
+
+        assert results_a == ["error"]
+        assert results_b == results_c == ["value"]
+        assert len(calls) == 2
+        assert max_active[0] == 1
+        assert cache._key_locks == {}
+
+    def test_value_stored_before_key_lock_released(self):
+        """キーごとのロックを外す前に値を保存するテスト（後から来たスレッドが再取得しない）"""
+        cache = ApiCache()
+        locked_when_stored = []
+        original_set = cache.set
+
+        def recording_set(key, value):
+            locked_when_stored.append(key in cache._key_locks)
+            original_set(key, value)
+
+        with patch.object(cache, "set", side_effect=recording_set):
+            cache.get_or_load("key", lambda: "value")
+
+        assert locked_when_stored == [True]
+        assert cache._key_locks == {}
+
+    def test_rejects_value_larger_than_budget(self):
+        """メモリ上限より大きい値は保存されないテスト"""
+        cache = ApiCache(max_bytes=100, sizer=len)
+
+        cache.set("big", "x" * 101)
+
+        assert cache.get("big") is None
+        assert cache.stats()["rejections"] == 1
+        assert cache.stats()["bytes"] == 0
+
+    def test_byte_budget_eviction(self):
+        """メモリ上限を超えると古いエントリから削除されるテスト"""
+        cache = ApiCache(max_bytes=10, sizer=len)
+        cache.set("a", "xxxx")
+        cache.set("b", "xxxx")
+
+        cache.set("c", "xxxx")
+
+        stats = cache.stats()
+        assert cache.get("a") is None
+        assert stats["bytes"] == 8
+        assert stats["evictions"] == 1
+        assert stats["evicted_bytes"] == 4
+        assert stats["occupancy"] == 0.8
+
+    def test_eviction_listener(self):
+        """上限超過で削除されたキーが通知されるテスト"""
+        cache = ApiCache(max_entries=1)
+        evicted = []
+        cache.add_eviction_listener(evicted.append)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        assert evicted == ["a"]
+
+    def test_overwrite_updates_bytes(self):
+        """同じキーの上書きでメモリ使用量が二重に数えられないテスト"""
+        cache = ApiCache(max_bytes=10, sizer=len)
+        cache.set("a", "xxxx")
+        cache.set("a", "xx")
+
+        assert cache.stats()["bytes"] == 2
+
+        cache.invalidate("a")
+        assert cache.stats()["bytes"] == 0
+
+    def test_year_sweep_stays_within_budget(self):
+        """全年・複数国のスイープでメモリ上限を超えないテスト"""
+        entry_size = estimate_size(make_year_holidays(2025, "JP"))
+        budget = entry_size * 50
+        cache = ApiCache(max_bytes=budget)
+
+        max_bytes_seen = 0
+        for country_code in ("JP", "US", "DE"):
+            for year in range(YEAR_MIN, YEAR_MAX + 1):
+                cache.get_or_load(
+                    f"PublicHolidays/{year}/{country_code}",
+                    lambda: make_year_holidays(year, country_code),
+                )
+                max_bytes_seen = max(max_bytes_seen, cache.stats()["bytes"])
+
+        stats = cache.stats()
+        sweep_size = 3 * (YEAR_MAX - YEAR_MIN + 1)
+        assert max_bytes_seen <= budget
+        assert stats["misses"] == sweep_size
+        assert stats["entries"] < sweep_size
+        assert stats["evictions"] == sweep_size - stats["entries"]
+        assert stats["occupancy"] > 0.9
+        # 直近にアクセスしたキーは残っている
+        assert cache.get(f"PublicHolidays/{YEAR_MAX}/DE") is not None
+        assert cache.get(f"PublicHolidays/{YEAR_MIN}/JP") is None
+
+    def test_negative_caching(self, fake_clock):
+        """400/404の取得失敗が原因とともにキャッシュされるテスト"""
+        cache = ApiCache(negative_ttl=60, clock=fake_clock)
+        error = requests.HTTPError("404 Not Found", response=MagicMock(status_code=404))
+        loader = MagicMock(side_effect=[error, ["JP"]])
+
+        for _ in range(3):
+            with pytest.raises(requests.HTTPError, match="404"):
+                cache.get_or_load("PublicHolidays/2025/XX", loader)
+
+        loader.assert_called_once()
+        assert cache.get_negative_cause("PublicHolidays/2025/XX") == "not_found"
+        assert cache.get("PublicHolidays/2025/XX") is None
+        assert cache.keys() == []
+
+        stats = cache.stats()
+        assert stats["negative_hits"] == 2
+        assert stats["negative_entries"] == 1
+
+        # 期限が切れたら再取得する
+        fake_clock.now = 60
+        assert cache.get_or_load("PublicHolidays/2025/XX", loader) == ["JP"]
+        assert cache.get_negative_cause("PublicHolidays/2025/XX") is None
+
+    def test_negative_hit_raises_new_exception(self):
+        """ネガティブキャッシュのヒットごとに新しい例外を送出するテスト"""
+        cache = ApiCache()
+        error = requests.HTTPError("404 Not Found", response=MagicMock(status_code=404))
+        with pytest.raises(requests.HTTPError):
+            cache.get_or_load("PublicHolidays/2025/XX", MagicMock(side_effect=error))
+
+        raised = []
+        for _ in range(2):
+            with pytest.raises(requests.HTTPError) as exc_info:
+                cache.get_or_load("PublicHolidays/2025/XX", MagicMock())
+            raised.append(exc_info.value)
+
+        assert raised[0] is not raised[1]
+        assert all(e is not error and e.__cause__ is error for e in raised)
+        assert all(e.response.status_code == 404 for e in raised)
+        assert all(e.negative_cause == "not_found" for e in raised)
+        assert error.__traceback__ is not None  # 元の例外は書き換えない
+
+    def test_negative_caching_validation_error(self):
+        """400の取得失敗の原因が記録されるテスト"""
+        cache = ApiCache()
+        error = requests.HTTPError("400", response=MagicMock(status_code=400))
+
+        with pytest.raises(requests.HTTPError):
+            cache.get_or_load("PublicHolidays/99999/JP", MagicMock(side_effect=error))
+
+        assert cache.get_negative_cause("PublicHolidays/99999/JP") == "validation"
+
+    def test_other_errors_not_negatively_cached(self):
+        """サーバーエラーや通信エラーはネガティブキャッシュされないテスト"""
+        cache = ApiCache()
+        server_error = requests.HTTPError("503", response=MagicMock(status_code=503))
+        loader = MagicMock(
+            side_effect=[server_error, requests.ConnectionError("down"), ["JP"]]
+        )
+
+        with pytest.raises(requests.HTTPError):
+            cache.get_or_load("AvailableCountries", loader)
+        with pytest.raises(requests.ConnectionError):
+            cache.get_or_load("AvailableCountries", loader)
+
+        assert cache.get_or_load("AvailableCountries", loader) == ["JP"]
+        assert cache.stats()["negative_entries"] == 0
+
+    def test_stale_value_on_transient_error(self, fake_clock):
+        """一時的な取得失敗では期限切れの値を返すテスト"""
+        cache = ApiCache(ttl=10, clock=fake_clock)
+        loader = MagicMock(side_effect=[["JP"], requests.ConnectionError("down")])
+
+        cache.get_or_load("AvailableCountries", loader)
+        fake_clock.now = 10
+
+        result = cache.get_or_load("AvailableCountries", loader)
+
+        assert result == ["JP"]
+        assert cache.stats()["stale_hits"] == 1
+        assert cache.stats()["expirations"] == 1
+
+    def test_revalidation_not_modified_renews_ttl(self, fake_clock):
+        """再検証で変更がない場合は値を使い続けて有効期限を延ばすテスト"""
+        cache = ApiCache(ttl=10, clock=fake_clock)
+        value = ["JP"]
+        loader = MagicMock(return_value=value)
+        not_modified = requests.RequestException(response=MagicMock(status_code=304))
+        revalidator = MagicMock(side_effect=not_modified)
+
+        cache.get_or_load("AvailableCountries", loader, revalidator)
+        fake_clock.now = 10
+
+        result = cache.get_or_load("AvailableCountries", loader, revalidator)
+
+        assert result is value
+        loader.assert_called_once()
+        revalidator.assert_called_once()
+        assert cache.stats()["revalidations"] == 1
+
+        # 延長された有効期限内は再検証しない
+        fake_clock.now = 19
+        cache.get_or_load("AvailableCountries", loader, revalidator)
+        revalidator.assert_called_once()
+
+    def test_revalidation_modified_replaces_value(self, fake_clock):
+        """再検証で変更がある場合は新しい値に置き換えるテスト"""
+        cache = ApiCache(ttl=10, clock=fake_clock)
+        loader = MagicMock(return_value=["JP"])
+        revalidator = MagicMock(return_value=["JP", "US"])
+
+        cache.get_or_load("AvailableCountries", loader, revalidator)
+        fake_clock.now = 10
+
+        result = cache.get_or_load("AvailableCountries", loader, revalidator)
+
+        assert result == ["JP", "US"]
+        assert cache.get("AvailableCountries") == ["JP", "US"]
+        assert cache.stats()["revalidations"] == 0
+
+    def test_revalidator_not_used_without_stale_value(self):
+        """期限切れの値がない場合は再検証せずに取得するテスト"""
+        cache = ApiCache()
+        loader = MagicMock(return_value=["JP"])
+        revalidator = MagicMock()
+
+        cache.get_or_load("AvailableCountries", loader, revalidator)
+
+        loader.assert_called_once()
+        revalidator.assert_not_called()
@@ -0,0 +1,169 @@
+"""
+export_service.pyのテスト
+"""
+
+import csv
+import pandas as pd
+import pytest
+import requests
+from unittest.mock import patch
+from models import Holiday
+from services.export_service import (
+    export_public_holidays,
+    partition_path,
+    write_partition,
+)
+
+
+def fake_holidays(year, country_code, **options):
+    """(国, 年)ごとに2件の祝日を返す"""
+    return [
+        Holiday(
+            f"{year}-01-01", "New Year's Day", f"New Year {country_code}", country_code
+        ),
+        Holiday(
+            f"{year}-12-25", "Christmas Day", f"Christmas {country_code}", country_code
+        ),
+    ]
+
+
+class TestWritePartition:
+    """write_partition関数のテスト"""
+
+    def test_partition_path(self, tmp_path):
+        """Hive形式のパスのテスト"""
+        path = partition_path(tmp_path, "JP", 2025, "csv")
+
+        assert path == tmp_path / "country_code=JP" / "year=2025" / "part.csv"
+
+    def test_write_csv(self, tmp_path, sample_holidays):
+        """CSVを書き出し、一時ファイルを残さないテスト"""
+        path = partition_path(tmp_path, "JP", 2025, "csv")
+
+        size = write_partition(path, sample_holidays, "csv")
+
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["date", "name", "local_name", "counties"]
+        assert rows[1] == ["2025-01-01", "New Year's Day", "元日", ""]
+        assert len(rows) == 4
+        assert size == path.stat().st_size
+        assert list(path.parent.iterdir()) == [path]
+
+    def test_write_empty_parquet(self, tmp_path):
+        """祝日がない場合も空のファイルを書き出すテスト"""
+        path = partition_path(tmp_path, "JP", 2025, "parquet")
+
+        write_partition(path, [], "parquet")
+
+        df = pd.read_parquet(path)
+        assert df.empty
+        assert list(df.columns) == ["date", "name", "local_name", "counties"]
+
+    def test_write_counties(self, tmp_path):
+        """地域の祝日の対象の州・県を書き出すテスト"""
+        holidays = [
+            Holiday("2025-01-01", "New Year's Day", "New Year's Day", "US"),
+            Holiday(
+                "2025-03-31",
+                "César Chávez Day",
+                "César Chávez Day",
+                "US",
+                counties=("US-CA", "US-CO", "US-TX"),
+            ),
+        ]
+        parquet_path = partition_path(tmp_path, "US", 2025, "parquet")
+        csv_path = partition_path(tmp_path, "US", 2025, "csv")
+
+        write_partition(parquet_path, holidays, "parquet")
+        write_partition(csv_path, holidays, "csv")
+
+        df = pd.read_parquet(parquet_path)
+        assert df["counties"][0] is None
+        assert list(df["counties"][1]) == ["US-CA", "US-CO", "US-TX"]
+        with open(csv_path, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[1][3] == ""
+        assert rows[2][3] == "US-CA;US-CO;US-TX"
+
+
+class TestExportPublicHolidays:
+    """export_public_holidays関数のテスト"""
+
+    @patch("services.export_service.repository.get_public_holidays")
+    def test_export_parquet(self, mock_repo_get, tmp_path, fake_clock):
+        """国×年ごとのParquetをディレクトリごと読み込めるテスト"""
+        # モックの設定
+        mock_repo_get.side_effect = fake_holidays
+        fake_clock.step = 1.0
+
+        metrics = export_public_holidays(
+            ["JP", "US"], 2024, 2025, tmp_path, clock=fake_clock
+        )
+
+        df = pd.read_parquet(tmp_path)
+        assert len(df) == 8
+        assert set(df["country_code"].astype(str)) == {"JP", "US"}
+        assert sorted(df["year"].astype(int).unique()) == [2024, 2025]
+        assert metrics["partitions"] == 4
+        assert metrics["written"] == 4
+        assert metrics["rows"] == 8
+        assert metrics["bytes"] > 0
+        assert metrics["rows_per_second"] == metrics["rows"] / metrics["duration"]
+
+    @patch("services.export_service.repository.get_public_holidays")
+    def test_resume(self, mock_repo_get, tmp_path):
+        """書き出し済みの(国, 年)は取得せずに省略するテスト"""
+        # モックの設定
+        mock_repo_get.side_effect = fake_holidays
+        export_public_holidays(["JP"], 2024, 2024, tmp_path, file_format="csv")
+        mock_repo_get.reset_mock()
+
+        metrics = export_public_holidays(
+            ["JP"], 2024, 2025, tmp_path, file_format="csv"
+        )
+
+        mock_repo_get.assert_called_once_with(2025, "JP", store_validators=False)
+        assert metrics["skipped"] == 1
+        assert metrics["written"] == 1
+
+    @patch("services.export_service.repository.get_public_holidays")
+    def test_failed_partition_retried(self, mock_repo_get, tmp_path):
+        """取得に失敗した(国, 年)はファイルを書かず、再実行で取得するテスト"""
+
+        # モックの設定
+        def flaky(year, country_code, **options):
+            if country_code == "DE":
+                raise requests.ConnectionError("API Error")
+            return fake_holidays(year, country_code)
+
+        mock_repo_get.side_effect = flaky
+        progress = []
+
+        metrics = export_public_holidays(
+            ["JP", "DE"],
+            2025,
+            2025,
+            tmp_path,
+            file_format="csv",
+            progress=progress.append,
+        )
+
+        assert metrics["failed"] == 1
+        assert metrics["errors"] == [("DE", 2025, "API Error")]
+        assert not partition_path(tmp_path, "DE", 2025, "csv").exists()
+        assert len(progress) == 2
+
+        mock_repo_get.side_effect = fake_holidays
+        metrics = export_public_holidays(
+            ["JP", "DE"], 2025, 2025, tmp_path, file_format="csv"
+        )
+        assert metrics["skipped"] == 1
+        assert metrics["written"] == 1
+
+    def test_invalid_arguments(self, tmp_path):
+        """ファイル形式と年の範囲の検証テスト"""
+        with pytest.raises(ValueError):
+            export_public_holidays(["JP"], 2025, 2025, tmp_path, file_format="json")
+        with pytest.raises(ValueError):
+            export_public_holidays(["JP"], 2025, 2024, tmp_path)
@@ -173,7 +173,7 @@ class TestFavoriteService:
         ]
 
         result = update_favorites_from_search(
-            existing_favorites, sample_search_dataframe, sample_holidays, "JP"
+            existing_favorites, sample_search_dataframe, sample_holidays
         )
 
         # 既存のUSの祝日は保持される
@@ -205,7 +205,7 @@ class TestFavoriteService:
         )
 
         result = update_favorites_from_search(
-            existing_favorites, search_df, sample_holidays[:1], "JP"
+            existing_favorites, search_df, sample_holidays[:1]
         )
 
         # 重複は追加されない
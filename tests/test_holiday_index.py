@@ -0,0 +1,383 @@
+"""
+holiday_index.pyのテスト
+"""
+
+from datetime import date
+from models import Holiday
+from services.holiday_index import (
+    HolidayIndex,
+    name_trigrams,
+    normalize_holiday_name,
+)
+
+
+def make_holiday(date, name, country_code):
+    """テスト用の祝日を作成"""
+    return Holiday(date=date, name=name, local_name=name, country_code=country_code)
+
+
+class TestHolidayIndex:
+    """HolidayIndexクラスのテスト"""
+
+    def test_add_and_get_holidays(self, sample_holidays):
+        """祝日の登録と取得のテスト"""
+        index = HolidayIndex()
+        index.add_holidays(2025, "JP", list(reversed(sample_holidays)))
+
+        result = index.get_holidays(2025, "JP")
+
+        # 日付順に並ぶ
+        assert [h.date for h in result] == [h.date for h in sample_holidays]
+
+    def test_get_holidays_not_registered(self):
+        """未登録の(国, 年)の取得テスト"""
+        index = HolidayIndex()
+
+        assert index.get_holidays(2025, "JP") is None
+
+    def test_country_name(self, sample_countries):
+        """国名の取得テスト"""
+        index = HolidayIndex()
+        index.add_countries(sample_countries)
+
+        assert index.get_country_name("JP") == "Japan"
+        assert index.get_country_name("XX") == "XX"
+
+    def test_keys_with_year_range(self, sample_holidays):
+        """年の範囲指定での(国, 年)取得テスト"""
+        index = HolidayIndex()
+        index.add_holidays(2025, "JP", sample_holidays)
+        index.add_holidays(2019, "JP", [])
+        index.add_holidays(2023, "DE", [])
+
+        assert index.keys() == [("DE", 2023), ("JP", 2019), ("JP", 2025)]
+        assert index.keys(2020, 2025) == [("DE", 2023), ("JP", 2025)]
+
+    def test_holidays_between_across_years(self):
+        """年をまたぐ期間の祝日が日付順に取得されるテスト"""
+        index = HolidayIndex()
+        index.add_holidays(
+            2025,
+            "JP",
+            [
+                make_holiday("2025-12-31", "New Year's Eve", "JP"),
+                make_holiday("2025-01-01", "New Year's Day", "JP"),
+                make_holiday("2025-06-01", "Summer Day", "JP"),
+            ],
+        )
+        index.add_holidays(
+            2026,
+            "JP",
+            [
+                make_holiday("2026-01-01", "New Year's Day", "JP"),
+                make_holiday("2026-06-01", "Summer Day", "JP"),
+            ],
+        )
+
+        result = index.holidays_between("JP", date(2025, 6, 1), date(2026, 6, 1))
+
+        assert [h.date for h in result] == ["2025-06-01", "2025-12-31", "2026-01-01"]
+
+    def test_holidays_between_missing_year(self, sample_holidays):
+        """期間内の年が未登録の場合はNoneを返すテスト"""
+        index = HolidayIndex()
+        index.add_holidays(2025, "JP", sample_holidays)
+
+        assert index.holidays_between("JP", date(2025, 6, 1), date(2026, 6, 1)) is None
+
+    def test_holidays_on(self, sample_holidays):
+        """指定された日の祝日が取得されるテスト"""
+        index = HolidayIndex()
+        index.add_holidays(2025, "JP", sample_holidays)
+
+        assert index.holidays_on("JP", date(2025, 1, 13)) == (sample_holidays[1],)
+        assert index.holidays_on("JP", date(2025, 1, 14)) == ()
+        assert index.holidays_on("JP", date(2024, 1, 1)) is None
+
+    def test_normalize_holiday_name(self):
+        """祝日名の正規化テスト"""
+        assert normalize_holiday_name("Independence Day") == ("independence",)
+        assert normalize_holiday_name("New Year's Day") == ("new", "year")
+        assert normalize_holiday_name("ＣＨＲＩＳＴＭＡＳ Day") == ("christmas",)
+        assert normalize_holiday_name("") == ()
+
+    def test_similar_holidays(self):
+        """名前が似ている祝日の検索テスト"""
+        index = HolidayIndex()
+        index.add_holidays(
+            2025, "US", [make_holiday("2025-07-04", "Independence Day", "US")]
+        )
+        index.add_holidays(
+            2025, "IN", [make_holiday("2025-08-15", "Independence Day", "IN")]
+        )
+        index.add_holidays(
+            2025, "JP", [make_holiday("2025-01-01", "New Year's Day", "JP")]
+        )
+
+        result = index.similar_holidays("Independence Day", 2025)
+
+        assert {h.country_code for h in result} == {"US", "IN"}
+        assert index.similar_holidays("Independence Day", 2024) == ()
+        # 1か国しか使っていない名前は類似とみなさない
+        assert index.similar_holidays("New Year's Day", 2025) == ()
+
+    def test_similar_holidays_prefers_rarest_token(self):
+        """最も固有性の高いトークンが使われるテスト"""
+        index = HolidayIndex()
+        index.add_holidays(
+            2025, "US", [make_holiday("2025-07-04", "Independence Day", "US")]
+        )
+        index.add_holidays(
+            2025, "IN", [make_holiday("2025-01-26", "Republic Day", "IN")]
+        )
+        index.add_holidays(
+            2025, "BR", [make_holiday("2025-11-15", "Republic Proclamation Day", "BR")]
+        )
+        index.add_holidays(
+            2025, "TR", [make_holiday("2025-10-29", "Republic Independence Day", "TR")]
+        )
+        index.add_holidays(
+            2025, "IT", [make_holiday("2025-06-02", "Republic Day", "IT")]
+        )
+
+        result = index.similar_holidays("Republic Independence Day", 2025)
+
+        assert {h.country_code for h in result} == {"US", "TR"}
+
+    def test_similar_holidays_updated_on_replace(self):
+        """祝日の再登録で転置インデックスが更新されるテスト"""
+        index = HolidayIndex()
+        index.add_holidays(
+            2025, "US", [make_holiday("2025-07-04", "Independence Day", "US")]
+        )
+        index.add_holidays(
+            2025, "IN", [make_holiday("2025-08-15", "Independence Day", "IN")]
+        )
+
+        index.add_holidays(
+            2025, "IN", [make_holiday("2025-01-26", "Republic Day", "IN")]
+        )
+
+        assert index.similar_holidays("Independence Day", 2025) == ()
+
+    def test_remove_holidays(self):
+        """祝日一覧の登録削除テスト"""
+        index = HolidayIndex()
+        index.add_holidays(
+            2025, "US", [make_holiday("2025-07-04", "Independence Day", "US")]
+        )
+        index.add_holidays(
+            2025, "IN", [make_holiday("2025-08-15", "Independence Day", "IN")]
+        )
+
+        index.remove_holidays(2025, "IN")
+
+        assert index.get_holidays(2025, "IN") is None
+        assert index.keys() == [("US", 2025)]
+        assert index.similar_holidays("Independence Day", 2025) == ()
+
+    def test_holidays_on_date(self):
+        """日付から全ての国の祝日を逆引きするテスト"""
+        index = HolidayIndex()
+        index.add_holidays(2025, "US", [make_holiday("2025-01-01", "New Year", "US")])
+        index.add_holidays(2025, "JP", [make_holiday("2025-01-01", "元日", "JP")])
+        index.add_holidays(2024, "JP", [make_holiday("2024-01-01", "元日", "JP")])
+
+        result = index.holidays_on_date("2025-01-01")
+
+        assert [h.country_code for h in result] == ["JP", "US"]
+        assert index.holidays_on_date("2025-01-02") == ()
+
+    def test_holidays_on_month_day(self):
+        """月日から全ての年・国の祝日を逆引きするテスト"""
+        index = HolidayIndex()
+        for year in (2023, 2024, 2025):
+            index.add_holidays(
+                year, "US", [make_holiday(f"{year}-07-04", "Independence Day", "US")]
+            )
+        index.add_holidays(2024, "PH", [make_holiday("2024-07-04", "Friendship", "PH")])
+
+        result = index.holidays_on_month_day(7, 4)
+        filtered = index.holidays_on_month_day(7, 4, year_min=2024, year_max=2024)
+
+        assert [(h.date, h.country_code) for h in result] == [
+            ("2023-07-04", "US"),
+            ("2024-07-04", "PH"),
+            ("2024-07-04", "US"),
+            ("2025-07-04", "US"),
+        ]
+        assert [h.country_code for h in filtered] == ["PH", "US"]
+
+    def test_date_lookup_follows_updates(self):
+        """祝日一覧の差し替え・削除が日付の逆引きに反映されるテスト"""
+        index = HolidayIndex()
+        index.add_holidays(2025, "US", [make_holiday("2025-07-04", "Old Day", "US")])
+        index.add_holidays(2024, "US", [make_holiday("2024-07-04", "Old Day", "US")])
+
+        index.add_holidays(2025, "US", [make_holiday("2025-07-05", "New Day", "US")])
+
+        assert index.holidays_on_date("2025-07-04") == ()
+        assert [h.name for h in index.holidays_on_date("2025-07-05")] == ["New Day"]
+        assert [h.date for h in index.holidays_on_month_day(7, 4)] == ["2024-07-04"]
+
+        index.remove_holidays(2025, "US")
+
+        assert index.holidays_on_date("2025-07-05") == ()
+        assert len(index.holidays_on_month_day(7, 4)) == 1
+
+    def test_name_trigrams(self):
+        """トライグラムへの分割テスト"""
+        assert name_trigrams("建国") == {" 建国", "建国 "}
+        assert name_trigrams("Ｄay") == {" da", "day", "ay "}
+        assert name_trigrams("") == frozenset()
+
+    def test_search_names(self):
+        """英語名・現地名のあいまい検索テスト"""
+        index = HolidayIndex()
+        index.add_holidays(
+            2025,
+            "US",
+            [
+                make_holiday("2025-07-04", "Independence Day", "US"),
+                make_holiday("2025-12-25", "Christmas Day", "US"),
+            ],
+        )
+        index.add_holidays(
+            2025,
+            "JP",
+            [Holiday("2025-02-11", "Foundation Day", "建国記念の日", "JP")],
+        )
+
+        exact = index.search_names("Independence")
+        typo = index.search_names("Indepnedence")
+        local = index.search_names("建国")
+
+        assert [(h.country_code, score) for h, score in exact] == [("US", 1.0)]
+        assert [h.name for h, _ in typo] == ["Independence Day"]
+        assert [h.local_name for h, _ in local] == ["建国記念の日"]
+        assert index.search_names("Xyzzy") == []
+        assert index.search_names("  ") == []
+
+    def test_search_names_ranking_and_years(self):
+        """一致度・名前の短さの順に並び、年で絞り込めるテスト"""
+        index = HolidayIndex()
+        for year in (2024, 2025):
+            index.add_holidays(
+                year,
+                "XX",
+                [
+                    make_holiday(f"{year}-01-01", "Independence Day", "XX"),
+                    make_holiday(f"{year}-01-02", "Independence Movement Day", "XX"),
+                ],
+            )
+
+        result = index.search_names("Independence Day", year_min=2025)
+
+        assert [h.date for h, _ in result] == ["2025-01-01", "2025-01-02"]
+        assert result[0][1] == result[1][1] == 1.0
+
+    def test_search_names_follows_updates(self):
+        """祝日一覧の差し替え・削除があいまい検索に反映されるテスト"""
+        index = HolidayIndex()
+        index.add_holidays(2025, "US", [make_holiday("2025-07-04", "Old Name", "US")])
+
+        index.add_holidays(2025, "US", [make_holiday("2025-07-04", "New Name", "US")])
+
+        assert [h.name for h, _ in index.search_names("Name")] == ["New Name"]
+
+        index.remove_holidays(2025, "US")
+
+        assert index.search_names("Name") == []
+
+    def test_search_names_same_date_holidays(self):
+        """同じ日の祝日を別々に検索・差し替え・削除できるテスト"""
+        index = HolidayIndex()
+        mlk = make_holiday("2025-01-20", "Martin Luther King, Jr. Day", "US")
+        inauguration = make_holiday("2025-01-20", "Inauguration Day", "US")
+        index.add_holidays(2025, "US", [mlk, inauguration])
+
+        assert [h.name for h, _ in index.search_names("Inauguration")] == [
+            "Inauguration Day"
+        ]
+        assert [h.name for h, _ in index.search_names("Martin Luther")] == [
+            "Martin Luther King, Jr. Day"
+        ]
+
+        index.add_holidays(2025, "US", [mlk])
+
+        assert index.search_names("Inauguration") == []
+        assert len(index.search_names("Martin Luther")) == 1
+
+        index.add_holidays(2025, "US", [mlk, inauguration])
+        index.remove_holidays(2025, "US")
+
+        assert index.search_names("Inauguration") == []
+        assert index.search_names("Martin Luther") == []
+
+    def test_holidays_in_range(self):
+        """複数の国の期間内の祝日を列で取得するテスト"""
+        index = HolidayIndex()
+        index.add_holidays(
+            2025,
+            "DE",
+            [
+                make_holiday("2025-05-01", "Labour Day", "DE"),
+                make_holiday("2025-05-29", "Ascension Day", "DE"),
+            ],
+        )
+        index.add_holidays(2025, "FR", [make_holiday("2025-05-01", "Fête", "FR")])
+        index.add_holidays(2025, "JP", [make_holiday("2025-04-29", "昭和の日", "JP")])
+
+        result = index.holidays_in_range(
+            date(2025, 4, 25), date(2025, 5, 10), ["FR", "DE", "XX"]
+        )
+        everything = index.holidays_in_range(date(2025, 1, 1), date(2026, 1, 1))
+
+        assert len(result) == 2
+        assert list(result.country_codes) == ["DE", "FR"]
+        assert list(result.dates.astype(str)) == ["2025-05-01", "2025-05-01"]
+        assert list(result.names) == ["Labour Day", "Fête"]
+        assert result.holidays[0] == make_holiday("2025-05-01", "Labour Day", "DE")
+        assert list(everything.country_codes) == ["JP", "DE", "FR", "DE"]
+
+    def test_holidays_in_range_across_years(self):
+        """年をまたぐ期間と終了日を含まないことのテスト"""
+        index = HolidayIndex()
+        for year in (2024, 2025):
+            index.add_holidays(
+                year,
+                "JP",
+                [
+                    make_holiday(f"{year}-01-01", "元日", "JP"),
+                    make_holiday(f"{year}-12-31", "大晦日", "JP"),
+                ],
+            )
+
+        result = index.holidays_in_range(date(2024, 12, 31), date(2025, 12, 31))
+
+        assert list(result.dates.astype(str)) == ["2024-12-31", "2025-01-01"]
+        assert len(index.holidays_in_range(date(2025, 1, 2), date(2025, 1, 1))) == 0
+
+    def test_holidays_in_range_follows_updates(self):
+        """祝日一覧の差し替え・削除が期間検索に反映されるテスト"""
+        index = HolidayIndex()
+        index.add_holidays(2025, "US", [make_holiday("2025-07-04", "Old", "US")])
+        start, end = date(2025, 1, 1), date(2026, 1, 1)
+        assert list(index.holidays_in_range(start, end).names) == ["Old"]
+
+        index.add_holidays(2025, "US", [make_holiday("2025-07-05", "New", "US")])
+        assert list(index.holidays_in_range(start, end).names) == ["New"]
+
+        index.remove_holidays(2025, "US")
+        assert len(index.holidays_in_range(start, end)) == 0
+
+    def test_clear(self, sample_holidays, sample_countries):
+        """登録データの削除テスト"""
+        index = HolidayIndex()
+        index.add_countries(sample_countries)
+        index.add_holidays(2025, "JP", sample_holidays)
+
+        index.clear()
+
+        assert index.keys() == []
+        assert index.get_country_name("JP") == "JP"
@@ -2,14 +2,35 @@
 holiday_service.pyのテスト
 """
 
+import json
+import threading
 import pytest
+from datetime import date, datetime, timezone
+from dataclasses import FrozenInstanceError
 import pandas as pd
-from unittest.mock import patch
+import requests
+from unittest.mock import MagicMock, patch
+from models import Holiday
+from repository import NotModifiedError
+from services.cache import api_cache
+from services.holiday_index import holiday_index
 from services.holiday_service import (
     get_available_countries,
     get_public_holidays,
     get_next_public_holidays,
     get_country_options,
+    get_neighbor_country_codes,
+    get_holidays_in_range,
+    get_holidays_on_date,
+    get_holidays_on_month_day,
+    get_loaded_country_codes,
+    is_today_public_holiday,
+    is_public_holiday,
+    load_snapshot_corpus,
+    merge_search_results,
+    search_holiday_names,
+    search_public_holidays,
+    SearchResult,
     holidays_to_search_dataframe,
 )
 
@@ -25,7 +46,7 @@ class TestHolidayService:
 
         result = get_available_countries()
 
-        assert result == sample_countries
+        assert list(result) == sample_countries
         mock_repo_get.assert_called_once()
 
     @patch("services.holiday_service.repository.get_available_countries")
@@ -34,9 +55,6 @@ class TestHolidayService:
         # モックの設定
         mock_repo_get.side_effect = Exception("Repository Error")
 
-        # Streamlitのキャッシュをクリア
-        get_available_countries.clear()
-
         with pytest.raises(Exception, match="Repository Error"):
             get_available_countries()
 
@@ -48,9 +66,113 @@ class TestHolidayService:
 
         result = get_public_holidays(2025, "JP")
 
-        assert result == sample_holidays
+        assert result == tuple(sample_holidays)
+        mock_repo_get.assert_called_once_with(2025, "JP")
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_get_public_holidays_cached(self, mock_repo_get, sample_holidays):
+        """同じ年と国の祝日一覧が1回だけ取得されるテスト"""
+        # モックの設定
+        mock_repo_get.return_value = sample_holidays
+
+        get_public_holidays(2025, "JP")
+        result = get_public_holidays(2025, "JP")
+
+        assert result == tuple(sample_holidays)
         mock_repo_get.assert_called_once_with(2025, "JP")
 
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_get_public_holidays_returns_shared_immutable_result(
+        self, mock_repo_get, sample_holidays
+    ):
+        """キャッシュヒット時にコピーせず不変の結果を返すテスト"""
+        # モックの設定
+        mock_repo_get.return_value = sample_holidays
+
+        result1 = get_public_holidays(2025, "JP")
+        result2 = get_public_holidays(2025, "JP")
+
+        assert result2 is result1
+        assert isinstance(result1, tuple)
+        with pytest.raises(FrozenInstanceError):
+            result1[0].name = "Changed"
+
+    @patch("services.holiday_service.repository.get_available_countries")
+    def test_get_available_countries_read_only(self, mock_repo_get, sample_countries):
+        """国一覧が読み取り専用で返されるテスト"""
+        # モックの設定
+        mock_repo_get.return_value = sample_countries
+
+        result = get_available_countries()
+
+        assert get_available_countries() is result
+        with pytest.raises(TypeError):
+            result[0]["name"] = "Changed"
+        # 元のデータは変更されない
+        assert sample_countries[0]["name"] == "Japan"
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_evicted_holidays_removed_from_index(self, mock_repo_get, sample_holidays):
+        """キャッシュから追い出された祝日がインデックスからも削除されるテスト"""
+        # モックの設定
+        mock_repo_get.return_value = sample_holidays
+
+        get_public_holidays(2025, "JP")
+        assert holiday_index.get_holidays(2025, "JP") is not None
+
+        with patch.object(api_cache, "max_entries", 1):
+            get_public_holidays(2024, "JP")
+
+        assert holiday_index.get_holidays(2025, "JP") is None
+        assert holiday_index.get_holidays(2024, "JP") is not None
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_expired_holidays_revalidated(self, mock_repo_get, sample_holidays):
+        """期限切れの祝日一覧が条件付きリクエストで再検証されるテスト"""
+        # モックの設定
+        not_modified = NotModifiedError(response=MagicMock(status_code=304))
+        mock_repo_get.side_effect = [sample_holidays, not_modified]
+
+        first = get_public_holidays(2025, "JP")
+        with patch.object(api_cache, "ttl", 0):
+            api_cache.set("PublicHolidays/2025/JP", first)
+        second = get_public_holidays(2025, "JP")
+
+        assert second is first
+        mock_repo_get.assert_called_with(2025, "JP", revalidate=True)
+        assert api_cache.stats()["revalidations"] == 1
+
+    @patch("services.holiday_service.repository.get_available_countries")
+    def test_available_countries_shared_with_quiz(
+        self, mock_repo_get, sample_countries
+    ):
+        """クイズ用の国一覧と同じキャッシュを使うテスト"""
+        from services.quiz_service import get_countries_for_quiz
+
+        # モックの設定
+        mock_repo_get.return_value = sample_countries
+
+        get_available_countries()
+        result = get_countries_for_quiz()
+
+        assert list(result) == sample_countries
+        mock_repo_get.assert_called_once()
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_get_public_holidays_unknown_country_cached(self, mock_repo_get):
+        """存在しない国の取得失敗がネガティブキャッシュされるテスト"""
+        # モックの設定
+        mock_repo_get.side_effect = requests.HTTPError(
+            "404 Client Error", response=MagicMock(status_code=404)
+        )
+
+        for _ in range(3):
+            with pytest.raises(requests.HTTPError):
+                get_public_holidays(2025, "XX")
+
+        mock_repo_get.assert_called_once_with(2025, "XX")
+        assert api_cache.get_negative_cause("PublicHolidays/2025/XX") == "not_found"
+
     @patch("services.holiday_service.repository.get_next_public_holidays")
     def test_get_next_public_holidays_success(self, mock_repo_get, sample_holidays):
         """今後の祝日取得成功テスト"""
@@ -59,9 +181,292 @@ class TestHolidayService:
 
         result = get_next_public_holidays("JP")
 
-        assert result == sample_holidays
+        assert result == tuple(sample_holidays)
         mock_repo_get.assert_called_once_with("JP")
 
+    @patch("services.holiday_service.repository.get_next_public_holidays")
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_get_next_public_holidays_from_cached_years(
+        self, mock_repo_get_holidays, mock_repo_get_next
+    ):
+        """キャッシュ済みの年ごとの祝日一覧から今後の祝日を計算するテスト"""
+        # モックの設定
+        mock_repo_get_holidays.side_effect = lambda year, country_code: [
+            Holiday(f"{year}-01-01", "New Year's Day", "元日", country_code),
+            Holiday(f"{year}-11-03", "Culture Day", "文化の日", country_code),
+        ]
+        get_public_holidays(2025, "JP")
+        get_public_holidays(2026, "JP")
+
+        result = get_next_public_holidays("JP", today=date(2025, 11, 3))
+
+        assert [h.date for h in result] == ["2025-11-03", "2026-01-01"]
+        mock_repo_get_next.assert_not_called()
+        # キャッシュの有無の判定はヒット数に数えない
+        assert api_cache.stats()["hits"] == 0
+
+    @patch("services.holiday_service.repository.get_next_public_holidays")
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_get_next_public_holidays_falls_back_to_api(
+        self, mock_repo_get_holidays, mock_repo_get_next, sample_holidays
+    ):
+        """期間内の年がキャッシュにない場合はAPIから取得するテスト"""
+        # モックの設定
+        mock_repo_get_holidays.return_value = sample_holidays
+        mock_repo_get_next.return_value = sample_holidays
+        get_public_holidays(2025, "JP")
+
+        result = get_next_public_holidays("JP", today=date(2025, 11, 3))
+
+        assert result == tuple(sample_holidays)
+        mock_repo_get_next.assert_called_once_with("JP")
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_is_today_public_holiday_with_offset(self, mock_repo_get, sample_holidays):
+        """UTCオフセットで日付を判定するテスト"""
+        # モックの設定
+        mock_repo_get.return_value = sample_holidays
+        now = datetime(2025, 1, 12, 20, 0, tzinfo=timezone.utc)
+
+        assert not is_today_public_holiday("JP", now=now)
+        assert is_today_public_holiday("JP", offset=9, now=now)
+        mock_repo_get.assert_called_once_with(2025, "JP")
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_is_today_public_holiday_offset_changes_year(
+        self, mock_repo_get, sample_holidays
+    ):
+        """オフセットで年が変わる場合はその年の祝日一覧で判定するテスト"""
+        # モックの設定
+        mock_repo_get.return_value = sample_holidays
+        now = datetime(2024, 12, 31, 18, 0, tzinfo=timezone.utc)
+
+        assert is_today_public_holiday("JP", offset=9, now=now)
+        mock_repo_get.assert_called_once_with(2025, "JP")
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_is_today_public_holiday_subdivision(self, mock_repo_get):
+        """州・県ごとの祝日はその州・県を指定した場合だけ祝日になるテスト"""
+        # モックの設定
+        mock_repo_get.return_value = [
+            Holiday("2025-01-06", "Epiphany", "Heilige Drei Könige", "DE", ("DE-BY",))
+        ]
+        now = datetime(2025, 1, 6, 12, 0)
+
+        assert not is_today_public_holiday("DE", now=now)
+        assert not is_today_public_holiday("DE", subdivision="DE-NW", now=now)
+        assert is_today_public_holiday("DE", subdivision="DE-BY", now=now)
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_is_public_holiday(self, mock_repo_get, sample_holidays):
+        """指定した日付が祝日かの判定テスト"""
+        # モックの設定
+        mock_repo_get.return_value = sample_holidays
+
+        assert is_public_holiday("JP", date(2025, 1, 13))
+        assert not is_public_holiday("JP", date(2025, 1, 14))
+        mock_repo_get.assert_called_once_with(2025, "JP")
+
+    def test_is_today_public_holiday_invalid_offset(self):
+        """オフセットが範囲外の場合のテスト"""
+        with pytest.raises(ValueError):
+            is_today_public_holiday("JP", offset=13)
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_search_public_holidays(self, mock_repo_get):
+        """複数の国と年の祝日一覧がすべて取得されるテスト"""
+        # モックの設定
+        mock_repo_get.side_effect = lambda year, country_code: [
+            Holiday(f"{year}-01-01", "New Year's Day", "元日", country_code)
+        ]
+        get_public_holidays(2025, "JP")
+
+        results = list(search_public_holidays(["JP", "US"], 2024, 2025))
+
+        assert sorted((r.country_code, r.year) for r in results) == [
+            ("JP", 2024),
+            ("JP", 2025),
+            ("US", 2024),
+            ("US", 2025),
+        ]
+        # キャッシュ済みの(国, 年)が先に返り、再取得されない
+        assert (results[0].country_code, results[0].year) == ("JP", 2025)
+        assert mock_repo_get.call_count == 4
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_search_public_holidays_fetches_concurrently(self, mock_repo_get):
+        """取得が並行して行われ、速いものから返るテスト"""
+        # モックの設定
+        release = threading.Event()
+
+        def fetch(year, country_code):
+            if country_code == "US":
+                # 遅い国はJPの結果が返るまで待つ
+                assert release.wait(5)
+            return [Holiday(f"{year}-01-01", "New Year's Day", "元日", country_code)]
+
+        mock_repo_get.side_effect = fetch
+
+        results = []
+        for result in search_public_holidays(["US", "JP"], 2025, 2025):
+            results.append(result)
+            release.set()
+
+        assert [r.country_code for r in results] == ["JP", "US"]
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_search_public_holidays_error(self, mock_repo_get, sample_holidays):
+        """一部の取得に失敗しても残りの結果が返るテスト"""
+
+        # モックの設定
+        def fetch(year, country_code):
+            if country_code == "US":
+                raise requests.ConnectionError("down")
+            return sample_holidays
+
+        mock_repo_get.side_effect = fetch
+
+        results = {
+            r.country_code: r for r in search_public_holidays(["JP", "US"], 2025, 2025)
+        }
+
+        assert results["JP"].holidays == tuple(sample_holidays)
+        assert results["JP"].error is None
+        assert results["US"].holidays == ()
+        assert isinstance(results["US"].error, requests.ConnectionError)
+
+    def test_merge_search_results(self):
+        """検索結果が日付・国コード順にまとめられるテスト"""
+        jp = (Holiday("2025-05-03", "Constitution Day", "憲法記念日", "JP"),)
+        us = (
+            Holiday("2025-01-01", "New Year's Day", "New Year's Day", "US"),
+            Holiday("2025-05-03", "Test Day", "Test Day", "DE"),
+        )
+
+        result = merge_search_results(
+            [SearchResult("JP", 2025, jp), SearchResult("US", 2025, us)]
+        )
+
+        assert [(h.date, h.country_code) for h in result] == [
+            ("2025-01-01", "US"),
+            ("2025-05-03", "DE"),
+            ("2025-05-03", "JP"),
+        ]
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_get_holidays_on_date(self, mock_repo_get):
+        """日付から祝日のある国を逆引きするテスト"""
+        # モックの設定
+        mock_repo_get.side_effect = lambda year, country_code: [
+            Holiday(f"{year}-01-01", "New Year's Day", "New Year's Day", country_code)
+        ]
+
+        list(search_public_holidays(["US", "JP"], 2024, 2025))
+
+        result = get_holidays_on_date(date(2025, 1, 1))
+        assert [h.country_code for h in result] == ["JP", "US"]
+        assert get_holidays_on_date(date(2025, 1, 2)) == ()
+        assert len(get_holidays_on_month_day(1, 1)) == 4
+        assert len(get_holidays_on_month_day(1, 1, year_min=2025)) == 2
+        assert get_loaded_country_codes(2025) == ["JP", "US"]
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_get_holidays_in_range(self, mock_repo_get):
+        """期間にかかる年を取得してから期間内の祝日を返すテスト"""
+        # モックの設定
+        mock_repo_get.side_effect = lambda year, country_code: [
+            Holiday(f"{year}-01-01", "New Year's Day", "New Year's Day", country_code)
+        ]
+
+        result = get_holidays_in_range(
+            ["US", "JP"], date(2024, 12, 1), date(2025, 1, 2)
+        )
+
+        assert list(result.country_codes) == ["JP", "US"]
+        assert list(result.dates.astype(str)) == ["2025-01-01", "2025-01-01"]
+        assert mock_repo_get.call_count == 4
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_get_holidays_in_range_error(self, mock_repo_get):
+        """祝日一覧の取得に失敗した場合は例外を送出するテスト"""
+        # モックの設定
+        mock_repo_get.side_effect = requests.ConnectionError("API Error")
+
+        with pytest.raises(requests.ConnectionError):
+            get_holidays_in_range(["JP"], date(2025, 1, 1), date(2025, 2, 1))
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_search_holiday_names(self, mock_repo_get, sample_holidays):
+        """取得済みの祝日を名前であいまい検索するテスト"""
+        # モックの設定
+        mock_repo_get.return_value = sample_holidays
+
+        get_public_holidays(2025, "JP")
+
+        result = search_holiday_names("成人")
+        assert [h.local_name for h, _ in result] == ["成人の日"]
+        assert search_holiday_names("成人", year_min=2026) == []
+
+    def test_load_snapshot_corpus(self, tmp_path, sample_api_response):
+        """スナップショットの祝日一覧がインデックスに登録されるテスト"""
+        for year, country_code in [(2025, "JP"), (2025, "US")]:
+            snapshot_path = tmp_path / "PublicHolidays" / str(year)
+            snapshot_path.mkdir(parents=True, exist_ok=True)
+            (snapshot_path / f"{country_code}.json").write_text(
+                json.dumps(sample_api_response), encoding="utf-8"
+            )
+        api_holidays = [Holiday("2025-03-01", "API Day", "API Day", "US")]
+        holiday_index.add_holidays(2025, "US", api_holidays)
+
+        with patch("repository.API_SNAPSHOT_DIR", str(tmp_path)):
+            count = load_snapshot_corpus()
+
+        # APIから取得済みの国はスナップショットで上書きしない
+        assert count == 1
+        assert holiday_index.get_holidays(2025, "US") == tuple(api_holidays)
+        assert [h.country_code for h in get_holidays_on_date(date(2025, 1, 13))] == [
+            "JP"
+        ]
+
+    def test_load_snapshot_corpus_skips_loaded_files(
+        self, tmp_path, sample_api_response
+    ):
+        """登録済みの(国, 年)のスナップショットはファイルを読まないテスト"""
+        snapshot_path = tmp_path / "PublicHolidays" / "2025"
+        snapshot_path.mkdir(parents=True)
+        (snapshot_path / "JP.json").write_text(
+            json.dumps(sample_api_response), encoding="utf-8"
+        )
+
+        with patch("repository.API_SNAPSHOT_DIR", str(tmp_path)):
+            assert load_snapshot_corpus() == 1
+            with patch("repository.json.load") as mock_json_load:
+                assert load_snapshot_corpus() == 0
+
+        mock_json_load.assert_not_called()
+
+    @patch("services.holiday_service.repository.get_country_info")
+    def test_get_neighbor_country_codes(self, mock_country_info):
+        """国境を接する国の国コードの取得テスト（キャッシュあり）"""
+        # モックの設定
+        mock_country_info.return_value = {
+            "commonName": "Germany",
+            "countryCode": "DE",
+            "borders": [{"countryCode": "AT"}, {"countryCode": "FR"}],
+        }
+
+        assert get_neighbor_country_codes("DE") == ("AT", "FR")
+        assert get_neighbor_country_codes("DE") == ("AT", "FR")
+        mock_country_info.assert_called_once_with("DE")
+
+    @patch("services.holiday_service.repository.get_country_info")
+    def test_get_neighbor_country_codes_island(self, mock_country_info):
+        """国境を接する国がない場合のテスト"""
+        # モックの設定
+        mock_country_info.return_value = {"countryCode": "JP", "borders": None}
+
+        assert get_neighbor_country_codes("JP") == ()
+
     @patch("services.holiday_service.get_available_countries")
     def test_get_country_options_success(self, mock_get_countries, sample_countries):
         """国選択用オプション辞書生成成功テスト"""
@@ -0,0 +1,214 @@
+"""
+long_weekend_service.pyのテスト
+"""
+
+import pytest
+from unittest.mock import patch
+from models import Holiday
+from services.long_weekend_service import (
+    calculate_long_weekends,
+    get_long_weekends,
+    get_long_weekends_for_countries,
+)
+from utils import (
+    convert_api_response_to_holidays,
+    convert_api_response_to_long_weekends,
+)
+
+
+def make_api_holiday(date, name, counties=None):
+    """PublicHolidays APIと同じ形式のドイツの祝日を作成"""
+    return {
+        "date": date,
+        "localName": name,
+        "name": name,
+        "countryCode": "DE",
+        "global": counties is None,
+        "counties": counties,
+        "types": ["Public"],
+    }
+
+
+@pytest.fixture
+def de_holidays_response():
+    """ドイツの2025年の祝日（PublicHolidays APIのレスポンス形式）"""
+    return [
+        make_api_holiday("2025-01-01", "New Year's Day"),
+        make_api_holiday("2025-01-06", "Epiphany", ["DE-BW", "DE-BY", "DE-ST"]),
+        make_api_holiday("2025-04-18", "Good Friday"),
+        make_api_holiday("2025-04-21", "Easter Monday"),
+        make_api_holiday("2025-05-01", "Labour Day"),
+        make_api_holiday("2025-05-29", "Ascension Day"),
+        make_api_holiday("2025-06-09", "Whit Monday"),
+        make_api_holiday("2025-06-19", "Corpus Christi", ["DE-BW", "DE-BY"]),
+        make_api_holiday("2025-10-03", "German Unity Day"),
+        make_api_holiday("2025-11-01", "All Saints' Day", ["DE-BW", "DE-BY"]),
+        make_api_holiday("2025-12-25", "Christmas Day"),
+        make_api_holiday("2025-12-26", "St. Stephen's Day"),
+    ]
+
+
+@pytest.fixture
+def de_long_weekends_response():
+    """ドイツの2025年の連休（LongWeekend APIのレスポンス形式、ブリッジ休日1日）"""
+    return [
+        {
+            "startDate": "2025-04-18",
+            "endDate": "2025-04-21",
+            "dayCount": 4,
+            "needBridgeDay": False,
+            "bridgeDays": [],
+        },
+        {
+            "startDate": "2025-05-01",
+            "endDate": "2025-05-04",
+            "dayCount": 4,
+            "needBridgeDay": True,
+            "bridgeDays": ["2025-05-02"],
+        },
+        {
+            "startDate": "2025-05-29",
+            "endDate": "2025-06-01",
+            "dayCount": 4,
+            "needBridgeDay": True,
+            "bridgeDays": ["2025-05-30"],
+        },
+        {
+            "startDate": "2025-06-07",
+            "endDate": "2025-06-09",
+            "dayCount": 3,
+            "needBridgeDay": False,
+            "bridgeDays": [],
+        },
+        {
+            "startDate": "2025-10-03",
+            "endDate": "2025-10-05",
+            "dayCount": 3,
+            "needBridgeDay": False,
+            "bridgeDays": [],
+        },
+        {
+            "startDate": "2025-12-25",
+            "endDate": "2025-12-28",
+            "dayCount": 4,
+            "needBridgeDay": False,
+            "bridgeDays": [],
+        },
+    ]
+
+
+class TestCalculateLongWeekends:
+    """calculate_long_weekends関数のテスト"""
+
+    def test_matches_api_response(
+        self, de_holidays_response, de_long_weekends_response
+    ):
+        """APIのレスポンスと同じ連休が計算されるテスト"""
+        holidays = convert_api_response_to_holidays(de_holidays_response)
+
+        result = calculate_long_weekends({"DE": holidays}, 2025)
+
+        assert list(result["DE"]) == convert_api_response_to_long_weekends(
+            de_long_weekends_response
+        )
+
+    def test_subdivision(self, de_holidays_response):
+        """州を指定した場合はその州の祝日も含めて計算されるテスト"""
+        holidays = convert_api_response_to_holidays(de_holidays_response)
+
+        result = calculate_long_weekends({"DE": holidays}, 2025, subdivision="DE-BY")
+
+        start_dates = [weekend.start_date for weekend in result["DE"]]
+        assert "2025-01-04" in start_dates
+        assert "2025-06-19" in start_dates
+        assert len(result["DE"]) == 8
+
+    def test_no_bridge_days(self, de_holidays_response):
+        """ブリッジ休日を使わない場合は平日をつながないテスト"""
+        holidays = convert_api_response_to_holidays(de_holidays_response)
+
+        result = calculate_long_weekends(
+            {"DE": holidays}, 2025, available_bridge_days=0
+        )
+
+        assert all(not weekend.need_bridge_day for weekend in result["DE"])
+        assert [weekend.start_date for weekend in result["DE"]] == [
+            "2025-04-18",
+            "2025-06-07",
+            "2025-10-03",
+            "2025-12-25",
+        ]
+
+    def test_bridge_days_limited_per_long_weekend(self):
+        """1つの連休で使うブリッジ休日が上限を超えないテスト"""
+        # 火曜日と木曜日が祝日の週
+        holidays = [
+            Holiday("2025-03-04", "Tuesday Holiday", "火曜の祝日", "XX"),
+            Holiday("2025-03-06", "Thursday Holiday", "木曜の祝日", "XX"),
+        ]
+
+        result = calculate_long_weekends({"XX": holidays}, 2025)
+
+        assert [(w.start_date, w.end_date, w.bridge_days) for w in result["XX"]] == [
+            ("2025-03-01", "2025-03-04", ("2025-03-03",)),
+            ("2025-03-06", "2025-03-09", ("2025-03-07",)),
+        ]
+
+    def test_across_year_end(self):
+        """年末の祝日から翌年の週末まで続く連休のテスト"""
+        holidays = [Holiday("2027-12-31", "New Year's Eve", "大晦日", "XX")]
+
+        result = calculate_long_weekends({"XX": holidays}, 2027)
+
+        assert result["XX"][0].start_date == "2027-12-31"
+        assert result["XX"][0].end_date == "2028-01-02"
+
+    def test_multiple_countries_in_one_pass(self, de_holidays_response):
+        """複数の国をまとめて計算しても国ごとの計算と同じになるテスト"""
+        de_holidays = convert_api_response_to_holidays(de_holidays_response)
+        jp_holidays = [
+            Holiday("2025-01-13", "Coming of Age Day", "成人の日", "JP"),
+            Holiday("2025-02-11", "National Foundation Day", "建国記念の日", "JP"),
+        ]
+
+        result = calculate_long_weekends(
+            {"DE": de_holidays, "JP": jp_holidays, "XX": []}, 2025
+        )
+
+        assert result["DE"] == calculate_long_weekends({"DE": de_holidays}, 2025)["DE"]
+        assert result["JP"] == calculate_long_weekends({"JP": jp_holidays}, 2025)["JP"]
+        assert result["XX"] == ()
+
+    def test_invalid_bridge_days(self):
+        """ブリッジ休日の数が負の場合のテスト"""
+        with pytest.raises(ValueError):
+            calculate_long_weekends({}, 2025, available_bridge_days=-1)
+
+
+class TestGetLongWeekends:
+    """連休取得関数のテスト"""
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_get_long_weekends(self, mock_repo_get, de_holidays_response):
+        """キャッシュ経由で取得した祝日から連休が計算されるテスト"""
+        # モックの設定
+        mock_repo_get.return_value = convert_api_response_to_holidays(
+            de_holidays_response
+        )
+
+        result = get_long_weekends(2025, "DE")
+        get_long_weekends(2025, "DE", subdivision="DE-BY")
+
+        assert len(result) == 6
+        mock_repo_get.assert_called_once_with(2025, "DE")
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_get_long_weekends_for_countries(self, mock_repo_get, sample_holidays):
+        """複数の国の連休をまとめて取得するテスト"""
+        # モックの設定
+        mock_repo_get.return_value = sample_holidays
+
+        result = get_long_weekends_for_countries(2025, ["JP", "US"])
+
+        assert set(result) == {"JP", "US"}
+        assert mock_repo_get.call_count == 2
@@ -2,6 +2,8 @@
 models.pyのテスト
 """
 
+import pytest
+from dataclasses import FrozenInstanceError
 from models import Holiday
 
 
@@ -145,3 +147,37 @@ class TestHoliday:
         holiday_set = {holiday1, holiday2, holiday3}
         # holiday1とholiday2は同じ日付と国コードなので、セットでは1つとして扱われる
         assert len(holiday_set) == 2
+
+    def test_holiday_is_immutable(self):
+        """祝日オブジェクトが変更できないテスト"""
+        holiday = Holiday(
+            date="2025-01-01",
+            name="New Year's Day",
+            local_name="元日",
+            country_code="JP",
+        )
+
+        with pytest.raises(FrozenInstanceError):
+            holiday.name = "Changed"
+
+    def test_holiday_applies_to(self):
+        """祝日の対象地域の判定テスト"""
+        national = Holiday(
+            date="2025-01-01",
+            name="New Year's Day",
+            local_name="Neujahr",
+            country_code="DE",
+        )
+        regional = Holiday(
+            date="2025-01-06",
+            name="Epiphany",
+            local_name="Heilige Drei Könige",
+            country_code="DE",
+            counties=("DE-BW", "DE-BY"),
+        )
+
+        assert national.applies_to()
+        assert national.applies_to("DE-NW")
+        assert not regional.applies_to()
+        assert not regional.applies_to("DE-NW")
+        assert regional.applies_to("DE-BY")
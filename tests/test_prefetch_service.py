@@ -0,0 +1,187 @@
+"""
+prefetch_service.pyのテスト
+"""
+
+import threading
+import pytest
+from unittest.mock import patch
+from repository import TokenBucket
+from services.cache import api_cache
+from services.prefetch_service import Prefetcher, prefetcher
+
+
+class FakeApi:
+    """テスト用の祝日一覧の取得とキャッシュ"""
+
+    def __init__(self, neighbors=None, failing=()):
+        self.neighbors = neighbors or {}
+        self.failing = set(failing)
+        self.cached = set()
+        self.loaded = []
+        self._lock = threading.Lock()
+
+    def load(self, year, country_code):
+        with self._lock:
+            self.loaded.append((country_code, year))
+        if (country_code, year) in self.failing:
+            raise ConnectionError("API Error")
+        with self._lock:
+            self.cached.add((country_code, year))
+
+    def is_cached(self, year, country_code):
+        with self._lock:
+            return (country_code, year) in self.cached
+
+    def get_neighbors(self, country_code):
+        return self.neighbors.get(country_code, ())
+
+
+def make_prefetcher(api, capacity=100, neighbors_cached=True):
+    """時間が進まないトークンバケットを使った先読みを作成"""
+    budget = TokenBucket(1, capacity, clock=lambda: 0.0)
+    return Prefetcher(
+        api.load,
+        api.is_cached,
+        api.get_neighbors,
+        budget,
+        neighbors_cached=lambda country_code: neighbors_cached,
+    )
+
+
+class TestPrefetcher:
+    """Prefetcherクラスのテスト"""
+
+    def test_prefetches_adjacent_years_and_neighbors(self):
+        """前後の年と国境を接する国の同じ年を先読みするテスト"""
+        api = FakeApi(neighbors={"DE": ("AT", "FR")})
+        target = make_prefetcher(api)
+        api.cached.add(("DE", 2025))
+
+        target.after_search(["DE"], 2025, 2025)
+        target.wait()
+
+        assert sorted(api.loaded) == [
+            ("AT", 2025),
+            ("DE", 2024),
+            ("DE", 2026),
+            ("FR", 2025),
+        ]
+        assert target.metrics()["completed"] == 4
+
+    def test_skips_cached_and_out_of_range_years(self):
+        """キャッシュ済みの(国, 年)と範囲外の年は先読みしないテスト"""
+        api = FakeApi()
+        target = make_prefetcher(api)
+        api.cached.add(("JP", 2099))
+
+        target.after_search(["JP"], 2100, 2100)
+        target.wait()
+
+        assert api.loaded == []
+        assert target.metrics()["scheduled"] == 0
+
+    def test_budget_limits_requests(self):
+        """予算を超える先読みはしないテスト"""
+        api = FakeApi(neighbors={"DE": ("AT", "CH", "FR", "NL")})
+        target = make_prefetcher(api, capacity=3)
+
+        target.after_search(["DE"], 2025, 2025)
+        target.wait()
+
+        metrics = target.metrics()
+        # 前後の年を優先して先読みする
+        assert sorted(api.loaded) == [("AT", 2025), ("DE", 2024), ("DE", 2026)]
+        assert metrics["scheduled"] == 3
+        assert metrics["over_budget"] == 3
+
+    def test_neighbor_lookup_uses_budget(self):
+        """国情報がキャッシュにない場合は国境を接する国の取得にも予算を使うテスト"""
+        api = FakeApi(neighbors={"DE": ("AT",)})
+        looked_up = []
+        target = make_prefetcher(api, capacity=2, neighbors_cached=False)
+        target._neighbors = lambda country_code: looked_up.append(country_code) or ()
+
+        target.after_search(["DE"], 2025, 2025)
+        target.wait()
+
+        # 前後の年で予算を使い切ったため、国情報は取得しない
+        assert sorted(api.loaded) == [("DE", 2024), ("DE", 2026)]
+        assert looked_up == []
+        assert target.metrics()["over_budget"] == 1
+
+        api.cached.clear()
+        api.loaded.clear()
+        target = make_prefetcher(api, capacity=3, neighbors_cached=False)
+
+        target.after_search(["DE"], 2025, 2025)
+        target.wait()
+
+        # 国情報の取得に1つ使い、隣の国の祝日一覧の分は残らない
+        assert sorted(api.loaded) == [("DE", 2024), ("DE", 2026)]
+        assert target.metrics()["over_budget"] == 1
+
+    def test_hit_rate(self):
+        """先読みした(国, 年)が検索されるとヒットとして数えるテスト"""
+        api = FakeApi(failing={("DE", 2024)})
+        target = make_prefetcher(api)
+
+        target.after_search(["DE"], 2025, 2025)
+        target.wait()
+        hits = target.record_search(["DE"], 2024, 2026)
+        target.record_search(["DE"], 2026, 2026)
+
+        metrics = target.metrics()
+        assert hits == 1
+        assert metrics["completed"] == 1
+        assert metrics["failed"] == 1
+        assert metrics["hits"] == 1
+        assert metrics["requests"] == 4
+        assert metrics["hit_rate"] == 1.0
+        assert metrics["request_hit_rate"] == pytest.approx(0.25)
+
+    def test_neighbor_error_ignored(self):
+        """国境を接する国が取得できなくても前後の年は先読みするテスト"""
+        api = FakeApi()
+        target = make_prefetcher(api)
+        target._neighbors = lambda country_code: 1 / 0
+
+        target.after_search(["JP"], 2025, 2025)
+        target.wait()
+
+        assert sorted(api.loaded) == [("JP", 2024), ("JP", 2026)]
+
+    def test_clear(self):
+        """記録とメトリクスのリセットテスト"""
+        api = FakeApi()
+        target = make_prefetcher(api)
+        target.after_search(["JP"], 2025, 2025)
+
+        target.clear()
+
+        assert target.metrics()["completed"] == 0
+        assert target.record_search(["JP"], 2024, 2024) == 0
+
+
+class TestSharedPrefetcher:
+    """プロセス共通の先読みのテスト"""
+
+    @patch("services.holiday_service.repository.get_country_info")
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_warms_shared_cache(self, mock_repo_get, mock_country_info):
+        """先読みした祝日一覧が共通のキャッシュに入るテスト"""
+        # モックの設定
+        mock_repo_get.return_value = []
+        mock_country_info.return_value = {
+            "countryCode": "DE",
+            "borders": [{"countryCode": "AT"}],
+        }
+
+        try:
+            prefetcher.after_search(["DE"], 2025, 2025)
+            prefetcher.wait()
+
+            assert api_cache.contains("PublicHolidays/2024/DE")
+            assert api_cache.contains("PublicHolidays/2025/AT")
+            assert prefetcher.record_search(["AT"], 2025, 2025) == 1
+        finally:
+            prefetcher.clear()
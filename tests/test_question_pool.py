@@ -0,0 +1,140 @@
+"""
+question_pool.pyのテスト
+"""
+
+import itertools
+import subprocess
+import sys
+import time
+import pytest
+from services import question_pool
+from services.question_pool import QuestionPool
+
+
+def make_counter_generator():
+    """連番の問題を返すジェネレータ関数を作成"""
+    counter = itertools.count()
+    return lambda: {"id": next(counter)}
+
+
+class TestQuestionPool:
+    """QuestionPoolクラスのテスト"""
+
+    def test_invalid_size(self):
+        """プールサイズが0以下の場合のテスト"""
+        with pytest.raises(ValueError):
+            QuestionPool(make_counter_generator(), size=0)
+
+    def test_fill_until_full(self):
+        """fillでプールが満杯になるテスト"""
+        pool = QuestionPool(make_counter_generator(), size=3)
+
+        added = pool.fill()
+
+        assert added == 3
+        assert pool.depth() == 3
+
+    def test_get_from_pool_in_order(self):
+        """プールから生成順に取り出されるテスト"""
+        pool = QuestionPool(make_counter_generator(), size=3)
+        pool.fill()
+
+        assert pool.get() == {"id": 0}
+        assert pool.get() == {"id": 1}
+        assert pool.depth() == 1
+
+        metrics = pool.metrics()
+        assert metrics["served"] == 2
+        assert metrics["misses"] == 0
+
+    def test_get_from_empty_pool_generates_synchronously(self):
+        """空のプールからの取り出しで同期生成されるテスト"""
+        pool = QuestionPool(make_counter_generator(), size=3)
+
+        result = pool.get()
+
+        assert result == {"id": 0}
+        assert pool.metrics()["misses"] == 1
+
+    def test_generator_returns_none(self):
+        """生成関数がNoneを返す場合はプールに追加されないテスト"""
+        pool = QuestionPool(lambda: None, size=3)
+
+        added = pool.fill()
+
+        assert added == 0
+        assert pool.depth() == 0
+
+    def test_generator_error_counted(self):
+        """生成関数の例外がメトリクスに記録されるテスト"""
+
+        def failing_generator():
+            raise Exception("API Error")
+
+        pool = QuestionPool(failing_generator, size=3)
+
+        added = pool.fill()
+
+        assert added == 0
+        assert pool.metrics()["errors"] == 1
+
+    def test_metrics_refill_rate(self):
+        """補充レートが計算されるテスト"""
+        pool = QuestionPool(make_counter_generator(), size=5)
+        pool.fill()
+
+        metrics = pool.metrics()
+
+        assert metrics["depth"] == 5
+        assert metrics["size"] == 5
+        assert metrics["generated"] == 5
+        assert metrics["refill_rate"] >= 0.0
+
+    def test_background_worker_refills(self):
+        """ワーカースレッドが取り出し後に補充するテスト"""
+        pool = QuestionPool(make_counter_generator(), size=3)
+        pool.fill()
+        pool.start()
+        try:
+            pool.get()
+            deadline = time.monotonic() + 5
+            while pool.metrics()["generated"] < 4 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            pool.stop(timeout=5)
+
+        assert pool.metrics()["generated"] == 4
+        assert pool.depth() == 3
+
+
+class TestSharedPool:
+    """プロセス共通の問題プールのテスト"""
+
+    def test_created_once(self):
+        """同じ名前の問題プールは1回だけ作成して起動するテスト"""
+        try:
+            first = question_pool._get_shared_pool("test", make_counter_generator())
+            second = question_pool._get_shared_pool("test", make_counter_generator())
+
+            assert first is second
+            assert first.get() == {"id": 0}
+        finally:
+            question_pool._shared_pools.pop("test").stop(timeout=1)
+
+
+class TestHeadlessImport:
+    """Streamlitなしでサービスを使えることのテスト"""
+
+    def test_services_do_not_import_streamlit(self):
+        """サービスとリポジトリを読み込んでもstreamlitを読み込まないテスト"""
+        code = (
+            "import sys, pkgutil, importlib, services, repository; "
+            "[importlib.import_module(f'services.{m.name}')"
+            " for m in pkgutil.iter_modules(services.__path__)]; "
+            "print('streamlit' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "False"
@@ -10,18 +10,52 @@ from services.quiz_service import (
     get_countries_for_quiz,
     get_holidays_for_country,
     generate_random_date,
+    get_non_holiday_days,
+    generate_non_holiday_date,
     generate_true_false_question,
     generate_guess_question,
+    generate_true_false_questions,
+    generate_guess_questions,
     check_true_false_answer,
     check_guess_answer,
     calculate_accuracy,
 )
+from services.holiday_index import HolidayIndex
+
+
+@pytest.fixture
+def quiz_index(sample_countries):
+    """クイズの一括生成用の祝日インデックス"""
+    index = HolidayIndex()
+    index.add_countries(sample_countries)
+    for i, country in enumerate(sample_countries):
+        code = country["countryCode"]
+        for year in (2024, 2025):
+            index.add_holidays(
+                year,
+                code,
+                [
+                    Holiday(
+                        date=f"{year}-01-01",
+                        name="New Year's Day",
+                        local_name="New Year's Day",
+                        country_code=code,
+                    ),
+                    Holiday(
+                        date=f"{year}-0{i + 3}-1{i}",
+                        name=f"{country['name']} Day",
+                        local_name=f"{country['name']} Day",
+                        country_code=code,
+                    ),
+                ],
+            )
+    return index
 
 
 class TestQuizService:
     """quiz_service.pyの関数のテスト"""
 
-    @patch("services.quiz_service.repository.get_available_countries")
+    @patch("services.holiday_service.repository.get_available_countries")
     def test_get_countries_for_quiz_success(self, mock_repo_get, sample_countries):
         """クイズ用の国一覧取得成功テスト"""
         # モックの設定
@@ -29,22 +63,19 @@ class TestQuizService:
 
         result = get_countries_for_quiz()
 
-        assert result == sample_countries
+        assert list(result) == sample_countries
         mock_repo_get.assert_called_once()
 
-    @patch("services.quiz_service.repository.get_available_countries")
+    @patch("services.holiday_service.repository.get_available_countries")
     def test_get_countries_for_quiz_exception(self, mock_repo_get):
         """クイズ用の国一覧取得失敗テスト（例外発生）"""
         # モックの設定
         mock_repo_get.side_effect = Exception("Some error")
 
-        # Streamlitのキャッシュをクリア
-        get_countries_for_quiz.clear()
-
         with pytest.raises(Exception, match="Some error"):
             get_countries_for_quiz()
 
-    @patch("services.quiz_service.repository.get_public_holidays")
+    @patch("services.holiday_service.repository.get_public_holidays")
     def test_get_holidays_for_country_success(self, mock_repo_get, sample_holidays):
         """指定された国の祝日一覧取得成功テスト"""
         # モックの設定
@@ -52,18 +83,15 @@ class TestQuizService:
 
         result = get_holidays_for_country(2025, "JP")
 
-        assert result == sample_holidays
+        assert result == tuple(sample_holidays)
         mock_repo_get.assert_called_once_with(2025, "JP")
 
-    @patch("services.quiz_service.repository.get_public_holidays")
+    @patch("services.holiday_service.repository.get_public_holidays")
     def test_get_holidays_for_country_exception(self, mock_repo_get):
         """指定された国の祝日一覧取得失敗テスト（例外発生）"""
         # モックの設定
         mock_repo_get.side_effect = Exception("Some error")
 
-        # Streamlitのキャッシュをクリア
-        get_holidays_for_country.clear()
-
         with pytest.raises(Exception, match="Some error"):
             get_holidays_for_country(2025, "JP")
 
@@ -90,8 +118,50 @@ class TestQuizService:
         assert result1.year == year1
         assert result2.year == year2
 
-    @patch("services.quiz_service.repository.get_available_countries")
-    @patch("services.quiz_service.repository.get_public_holidays")
+    def test_get_non_holiday_days_excludes_holidays(self):
+        """非祝日の配列から祝日が除外されるテスト"""
+        result = get_non_holiday_days(2025, ("2025-01-01", "2025-01-13"))
+
+        assert len(result) == 365 - 2
+        assert 0 not in result  # 1月1日
+        assert 12 not in result  # 1月13日
+        assert 1 in result  # 1月2日
+
+    def test_get_non_holiday_days_leap_year(self):
+        """うるう年の非祝日の配列テスト"""
+        result = get_non_holiday_days(2024, ())
+
+        assert len(result) == 366
+        assert result[-1] == 365
+
+    def test_get_non_holiday_days_ignores_other_years(self):
+        """他の年の日付が無視されるテスト"""
+        result = get_non_holiday_days(2025, ("2024-12-31", "2026-01-01"))
+
+        assert len(result) == 365
+
+    def test_generate_non_holiday_date_single_draw(self, sample_holidays):
+        """非祝日の日付生成が1回の乱数で行われるテスト"""
+        with patch("random.randrange") as mock_randrange:
+            mock_randrange.return_value = 0
+
+            result = generate_non_holiday_date(2025, sample_holidays)
+
+            # 1月1日は祝日なので、最初の非祝日は1月2日
+            assert result == "2025-01-02"
+            mock_randrange.assert_called_once_with(365 - 3)
+
+    def test_generate_non_holiday_date_never_holiday(self, sample_holidays):
+        """生成された日付が祝日と重複しないテスト"""
+        holiday_dates = {h.date for h in sample_holidays}
+
+        for _ in range(200):
+            result = generate_non_holiday_date(2025, sample_holidays)
+            assert result not in holiday_dates
+            assert result.startswith("2025-")
+
+    @patch("services.holiday_service.repository.get_available_countries")
+    @patch("services.holiday_service.repository.get_public_holidays")
     def test_generate_true_false_question_holiday_true(
         self, mock_repo_get_holidays, mock_repo_get_countries, sample_countries
     ):
@@ -129,8 +199,8 @@ class TestQuizService:
             assert result["date"] == "2025-01-01"
             assert result["holiday_name"] == "New Year's Day"
 
-    @patch("services.quiz_service.repository.get_available_countries")
-    @patch("services.quiz_service.repository.get_public_holidays")
+    @patch("services.holiday_service.repository.get_available_countries")
+    @patch("services.holiday_service.repository.get_public_holidays")
     def test_generate_true_false_question_holiday_false(
         self, mock_repo_get_holidays, mock_repo_get_countries, sample_countries
     ):
@@ -154,19 +224,81 @@ class TestQuizService:
             assert result["country_code"] == "JP"
             assert result["holiday_name"] is None
 
-    @patch("services.quiz_service.repository.get_available_countries")
+    @patch("services.holiday_service.repository.get_available_countries")
     def test_generate_true_false_question_no_countries(self, mock_repo_get):
         """真偽問題生成テスト（国一覧が取得できない場合）"""
         # モックの設定
         mock_repo_get.side_effect = Exception("Some error")
 
-        # Streamlitのキャッシュをクリア
-        get_countries_for_quiz.clear()
-
         with pytest.raises(Exception, match="Some error"):
             generate_true_false_question()
 
-    @patch("services.quiz_service.repository.get_available_countries")
+    @patch("services.quiz_service.holiday_index")
+    @patch("services.holiday_service.repository.get_available_countries")
+    @patch("services.holiday_service.repository.get_public_holidays")
+    def test_generate_guess_question_similar_distractors(
+        self, mock_repo_get_holidays, mock_repo_get_countries, mock_index
+    ):
+        """推測問題生成テスト（名前が似ている祝日が選択肢になる場合）"""
+        # モックの設定
+        countries = [
+            {"countryCode": code, "name": code} for code in ("US", "IN", "MX", "JP")
+        ]
+        mock_repo_get_countries.return_value = countries
+        mock_repo_get_holidays.return_value = [
+            Holiday(
+                date="2025-07-04",
+                name="Independence Day",
+                local_name="Independence Day",
+                country_code="US",
+            )
+        ]
+        mock_index.similar_holidays.return_value = (
+            Holiday(
+                date="2025-07-04",
+                name="Independence Day",
+                local_name="Independence Day",
+                country_code="US",
+            ),
+            Holiday(
+                date="2025-08-15",
+                name="Indian Independence Day",
+                local_name="स्वतंत्रता दिवस",
+                country_code="IN",
+            ),
+            Holiday(
+                date="2025-09-16",
+                name="Mexican Independence Day",
+                local_name="Día de la Independencia",
+                country_code="MX",
+            ),
+            Holiday(
+                date="2025-10-01",
+                name="Nigerian Independence Day",
+                local_name="Independence Day",
+                country_code="NG",
+            ),
+        )
+        mock_index.get_country_name.side_effect = lambda code: code
+
+        with (
+            patch("random.sample") as mock_random_sample,
+            patch("random.choice") as mock_random_choice,
+            patch("random.randint") as mock_random_randint,
+        ):
+            mock_random_sample.side_effect = lambda seq, k: list(seq)[:k]
+            mock_random_choice.side_effect = lambda seq: seq[0]
+            mock_random_randint.return_value = 2025
+
+            result = generate_guess_question()
+
+        assert result is not None
+        codes = {opt["country_code"] for opt in result["options"]}
+        assert codes == {"US", "IN", "MX", "NG"}
+        # 正解の国以外の祝日は取得しない
+        mock_repo_get_holidays.assert_called_once_with(2025, "US")
+
+    @patch("services.holiday_service.repository.get_available_countries")
     def test_generate_guess_question_insufficient_countries(self, mock_repo_get):
         """推測問題生成テスト（国が不足している場合）"""
         # モックの設定
@@ -179,8 +311,8 @@ class TestQuizService:
 
         assert result is None
 
-    @patch("services.quiz_service.repository.get_available_countries")
-    @patch("services.quiz_service.repository.get_public_holidays")
+    @patch("services.holiday_service.repository.get_available_countries")
+    @patch("services.holiday_service.repository.get_public_holidays")
     def test_generate_guess_question_no_holidays(
         self, mock_repo_get_holidays, mock_repo_get_countries, sample_countries
     ):
@@ -205,6 +337,117 @@ class TestQuizService:
 
             assert result is None
 
+    def test_generate_true_false_questions_count(self, quiz_index):
+        """真偽問題の一括生成数のテスト"""
+        result = generate_true_false_questions(50, seed=1, index=quiz_index)
+
+        assert len(result) == 50
+        for question in result:
+            holidays = quiz_index.get_holidays(
+                int(question["date"][:4]), question["country_code"]
+            )
+            holiday_dates = {h.date for h in holidays}
+            assert (question["date"] in holiday_dates) == question["is_holiday"]
+
+    def test_generate_true_false_questions_after_re_add(self, sample_holidays):
+        """祝日の再登録後は新しい祝日一覧から非祝日を選ぶテスト"""
+        index = HolidayIndex()
+        index.add_holidays(2025, "JP", [])
+        generate_true_false_questions(50, seed=1, index=index)
+
+        index.add_holidays(2025, "JP", sample_holidays)
+        result = generate_true_false_questions(200, seed=1, index=index)
+
+        holiday_dates = {h.date for h in sample_holidays}
+        for question in result:
+            assert (question["date"] in holiday_dates) == question["is_holiday"]
+
+    def test_generate_true_false_questions_deterministic(self, quiz_index):
+        """同じシードで同じ問題列が生成されるテスト"""
+        result1 = generate_true_false_questions(20, seed=42, index=quiz_index)
+        result2 = generate_true_false_questions(20, seed=42, index=quiz_index)
+        result3 = generate_true_false_questions(20, seed=43, index=quiz_index)
+
+        assert result1 == result2
+        assert result1 != result3
+
+    def test_generate_true_false_questions_does_not_touch_global_random(
+        self, quiz_index
+    ):
+        """一括生成がグローバルなrandomを使わないテスト"""
+        with patch("random.choice") as mock_random_choice:
+            generate_true_false_questions(10, seed=1, index=quiz_index)
+
+            mock_random_choice.assert_not_called()
+
+    def test_generate_true_false_questions_empty_index(self):
+        """空のインデックスでの真偽問題の一括生成テスト"""
+        assert generate_true_false_questions(10, seed=1, index=HolidayIndex()) == []
+
+    def test_generate_guess_questions(self, quiz_index):
+        """推測問題の一括生成テスト"""
+        result = generate_guess_questions(30, seed=7, index=quiz_index)
+
+        assert len(result) == 30
+        for question in result:
+            assert len(question["options"]) == 4
+            correct = question["options"][question["correct_index"]]
+            assert correct["is_correct"] is True
+            assert sum(opt["is_correct"] for opt in question["options"]) == 1
+
+    def test_generate_guess_questions_excludes_same_holiday(self, quiz_index):
+        """推測問題の一括生成で正解と同じ日付・同じ名前の祝日が選択肢にならないテスト"""
+        result = generate_guess_questions(20, seed=5, index=quiz_index)
+
+        assert any(q["holiday_name"] == "New Year's Day" for q in result)
+        for question in result:
+            if question["holiday_name"] == "New Year's Day":
+                # 他の国の元日も問題の祝日名に当てはまるため選択肢にしない
+                assert (
+                    sum(opt["date"].endswith("-01-01") for opt in question["options"])
+                    == 1
+                )
+
+    def test_generate_guess_questions_common_holiday_single_answer(self):
+        """多くの国で同じ日・同じ名前の祝日でも正解が1つだけになるテスト"""
+        index = HolidayIndex()
+        for i, code in enumerate(("US", "GB", "DE", "FR", "AU")):
+            index.add_holidays(
+                2024,
+                code,
+                [
+                    Holiday(
+                        f"2024-0{i + 3}-1{i}",
+                        f"{code} Day",
+                        f"{code} Day",
+                        code,
+                    ),
+                    Holiday("2024-12-25", "Christmas Day", "Christmas Day", code),
+                ],
+            )
+        christmas = [
+            q
+            for seed in range(20)
+            for q in generate_guess_questions(1, seed=seed, index=index)
+            if q["holiday_name"] == "Christmas Day"
+        ]
+
+        assert christmas
+        for question in christmas:
+            assert [opt["date"] for opt in question["options"]].count("2024-12-25") == 1
+            assert sum(opt["is_correct"] for opt in question["options"]) == 1
+
+    def test_generate_guess_questions_deterministic(self, quiz_index):
+        """同じシードで同じ推測問題列が生成されるテスト"""
+        result1 = generate_guess_questions(10, seed=3, index=quiz_index)
+        result2 = generate_guess_questions(10, seed=3, index=quiz_index)
+
+        assert result1 == result2
+
+    def test_generate_guess_questions_empty_index(self):
+        """空のインデックスでの推測問題の一括生成テスト"""
+        assert generate_guess_questions(10, seed=1, index=HolidayIndex()) == []
+
     def test_check_true_false_answer_correct(self):
         """真偽問題の正解チェックテスト"""
         question = {"is_holiday": True}
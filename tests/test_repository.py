@@ -2,16 +2,98 @@
 repository.pyのテスト
 """
 
+import json
+import threading
 import pytest
 import pandas as pd
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock
+import repository
 from repository import (
+    CircuitBreaker,
+    CircuitOpenError,
+    NotModifiedError,
+    RequestHedger,
+    TokenBucket,
+    fetch_json,
     get_available_countries,
+    get_country_info,
     get_public_holidays,
     load_favorites,
+    load_snapshot_public_holidays,
     save_favorites,
     get_next_public_holidays,
 )
+from constants import API_TIMEOUT
+
+
+class StubApiServer:
+    """
+    テスト用のローカルAPIスタブサーバー
+
+    responsesに積んだ(ステータスコード, JSON, 遅延秒数[, レスポンスヘッダー])を
+    順番に返し、使い切った後は最後の応答を返し続ける。
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+        self.request_headers = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(self.path)
+                stub.request_headers.append(dict(self.headers))
+                index = min(len(stub.requests), len(stub.responses)) - 1
+                status, body, delay, *extra = stub.responses[index]
+                if delay:
+                    threading.Event().wait(delay)
+                payload = b"" if status == 304 else json.dumps(body).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    for name, value in (extra[0] if extra else {}).items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # タイムアウトやキャンセルでクライアントが切断した場合
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.01,), daemon=True
+        )
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_api():
+    """スタブサーバーに向けたリポジトリの設定"""
+    with StubApiServer() as stub:
+        with (
+            patch("repository.API_BASE_URL", stub.url),
+            patch("repository.API_TIMEOUT", (1, 0.2)),
+            patch("repository.API_RETRY_BACKOFF_BASE", 0),
+            patch("repository.API_SNAPSHOT_DIR", "/nonexistent"),
+            patch.object(repository, "circuit_breaker", CircuitBreaker(2, 60)),
+            patch.object(repository, "rate_limiter", TokenBucket(1000, 1000)),
+        ):
+            yield stub
 
 
 class TestRepository:
@@ -30,7 +112,7 @@ class TestRepository:
 
         assert result == sample_countries
         mock_get.assert_called_once_with(
-            "https://date.nager.at/api/v3/AvailableCountries"
+            "https://date.nager.at/api/v3/AvailableCountries", timeout=API_TIMEOUT
         )
 
     @patch("repository.requests.get")
@@ -62,7 +144,7 @@ class TestRepository:
         assert result[0].name == "New Year's Day"
         assert result[0].country_code == "JP"
         mock_get.assert_called_once_with(
-            "https://date.nager.at/api/v3/PublicHolidays/2025/JP"
+            "https://date.nager.at/api/v3/PublicHolidays/2025/JP", timeout=API_TIMEOUT
         )
 
     @patch("repository.requests.get")
@@ -89,9 +171,66 @@ class TestRepository:
 
         assert len(result) == 2
         mock_get.assert_called_once_with(
-            "https://date.nager.at/api/v3/NextPublicHolidays/JP"
+            "https://date.nager.at/api/v3/NextPublicHolidays/JP", timeout=API_TIMEOUT
+        )
+
+    @patch("repository.requests.get")
+    def test_get_country_info_success(self, mock_get):
+        """国の情報の取得成功テスト"""
+        # モックの設定
+        country_info = {
+            "commonName": "Germany",
+            "officialName": "Federal Republic of Germany",
+            "countryCode": "DE",
+            "region": "Europe",
+            "borders": [{"commonName": "Austria", "countryCode": "AT"}],
+        }
+        mock_response = MagicMock()
+        mock_response.json.return_value = country_info
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+
+        result = get_country_info("DE")
+
+        assert result == country_info
+        mock_get.assert_called_once_with(
+            "https://date.nager.at/api/v3/CountryInfo/DE", timeout=API_TIMEOUT
         )
 
+    def test_load_snapshot_public_holidays(self, tmp_path, sample_api_response):
+        """スナップショットの祝日一覧の読み込みテスト"""
+        snapshot_path = tmp_path / "PublicHolidays" / "2025"
+        snapshot_path.mkdir(parents=True)
+        (snapshot_path / "JP.json").write_text(
+            json.dumps(sample_api_response), encoding="utf-8"
+        )
+
+        with patch("repository.API_SNAPSHOT_DIR", str(tmp_path)):
+            result = load_snapshot_public_holidays()
+
+        assert [(year, code, len(holidays)) for year, code, holidays in result] == [
+            (2025, "JP", 2)
+        ]
+
+    def test_load_snapshot_public_holidays_exclude(self, tmp_path, sample_api_response):
+        """除外した(国, 年)のスナップショットは読み込まないテスト"""
+        snapshot_path = tmp_path / "PublicHolidays" / "2025"
+        snapshot_path.mkdir(parents=True)
+        for country_code in ("JP", "US"):
+            (snapshot_path / f"{country_code}.json").write_text(
+                json.dumps(sample_api_response), encoding="utf-8"
+            )
+
+        with patch("repository.API_SNAPSHOT_DIR", str(tmp_path)):
+            result = load_snapshot_public_holidays(exclude={("JP", 2025)})
+
+        assert [(year, code) for year, code, _ in result] == [(2025, "US")]
+
+    def test_load_snapshot_public_holidays_no_snapshot(self, tmp_path):
+        """スナップショットがない場合は空のリストを返すテスト"""
+        with patch("repository.API_SNAPSHOT_DIR", str(tmp_path)):
+            assert load_snapshot_public_holidays() == []
+
     @patch("repository.requests.get")
     def test_get_next_public_holidays_api_error(self, mock_get):
         """今後の祝日取得失敗テスト（APIエラー）"""
@@ -103,7 +242,7 @@ class TestRepository:
         with pytest.raises(Exception, match="API Error"):
             get_next_public_holidays("JP")
 
-    @patch("repository.pd.read_csv")
+    @patch("pandas.read_csv")
     @patch("repository.Path")
     def test_load_favorites_existing_file(
         self, mock_path, mock_read_csv, sample_holidays
@@ -151,7 +290,7 @@ class TestRepository:
 
         assert result == []
 
-    @patch("repository.pd.read_csv")
+    @patch("pandas.read_csv")
     @patch("repository.Path")
     def test_load_favorites_empty_file(self, mock_path, mock_read_csv):
         """空のCSVファイルからのお気に入り読み込みテスト"""
@@ -167,7 +306,7 @@ class TestRepository:
 
         assert result == []
 
-    @patch("repository.pd.DataFrame")
+    @patch("pandas.DataFrame")
     @patch("repository.Path")
     def test_save_favorites_success(self, mock_path, mock_dataframe, sample_holidays):
         """お気に入りの保存成功テスト"""
@@ -189,7 +328,7 @@ class TestRepository:
         mock_dataframe.assert_called_once()
         mock_df_instance.to_csv.assert_called_once_with(mock_path_instance, index=False)
 
-    @patch("repository.pd.DataFrame")
+    @patch("pandas.DataFrame")
     @patch("repository.Path")
     def test_save_favorites_empty_list(self, mock_path, mock_dataframe):
         """空のお気に入りリストの保存テスト"""
@@ -206,3 +345,311 @@ class TestRepository:
         # 空のリストでも保存処理が実行されることを確認
         mock_dataframe.assert_called_once_with([])
         mock_df_instance.to_csv.assert_called_once_with(mock_path_instance, index=False)
+
+
+class TestResilience:
+    """API呼び出しのリトライ・タイムアウト・サーキットブレーカーのテスト"""
+
+    def test_fetch_json_success(self, stub_api, sample_countries):
+        """正常なレスポンスの取得テスト"""
+        stub_api.responses = [(200, sample_countries, 0)]
+
+        result = fetch_json("AvailableCountries")
+
+        assert result == sample_countries
+        assert stub_api.requests == ["/AvailableCountries"]
+
+    def test_retry_on_server_error(self, stub_api, sample_countries):
+        """5xxの場合にリトライして成功するテスト"""
+        stub_api.responses = [(503, {}, 0), (502, {}, 0), (200, sample_countries, 0)]
+
+        result = fetch_json("AvailableCountries")
+
+        assert result == sample_countries
+        assert len(stub_api.requests) == 3
+        assert repository.circuit_breaker.state == CircuitBreaker.CLOSED
+
+    def test_retry_on_timeout(self, stub_api, sample_countries):
+        """タイムアウトの場合にリトライして成功するテスト"""
+        stub_api.responses = [(200, [], 1.0), (200, sample_countries, 0)]
+
+        result = fetch_json("AvailableCountries")
+
+        assert result == sample_countries
+        assert len(stub_api.requests) == 2
+
+    def test_retries_exhausted(self, stub_api):
+        """リトライ回数を使い切った場合に例外が送出されるテスト"""
+        stub_api.responses = [(503, {}, 0)]
+
+        with pytest.raises(requests.HTTPError, match="503"):
+            fetch_json("AvailableCountries")
+
+        assert len(stub_api.requests) == repository.API_MAX_RETRIES + 1
+
+    def test_client_error_not_retried(self, stub_api):
+        """404の場合はリトライしないテスト"""
+        stub_api.responses = [(404, {}, 0)]
+
+        with pytest.raises(requests.HTTPError) as exc_info:
+            fetch_json("PublicHolidays/2025/XX")
+
+        assert exc_info.value.response.status_code == 404
+        assert len(stub_api.requests) == 1
+        assert repository.circuit_breaker.state == CircuitBreaker.CLOSED
+
+    def test_circuit_opens_and_fails_fast(self, stub_api):
+        """連続した失敗でサーキットブレーカーが開き、APIを呼ばなくなるテスト"""
+        stub_api.responses = [(503, {}, 0)]
+
+        for _ in range(2):
+            with pytest.raises(requests.HTTPError):
+                fetch_json("AvailableCountries")
+        request_count = len(stub_api.requests)
+
+        with pytest.raises(CircuitOpenError):
+            fetch_json("AvailableCountries")
+
+        assert repository.circuit_breaker.state == CircuitBreaker.OPEN
+        assert len(stub_api.requests) == request_count
+
+    def test_circuit_open_uses_snapshot(self, stub_api, tmp_path, sample_countries):
+        """サーキットブレーカーが開いている場合にスナップショットを返すテスト"""
+        (tmp_path / "AvailableCountries.json").write_text(
+            json.dumps(sample_countries), encoding="utf-8"
+        )
+        repository.circuit_breaker.record_failure()
+        repository.circuit_breaker.record_failure()
+
+        with patch("repository.API_SNAPSHOT_DIR", str(tmp_path)):
+            result = fetch_json("AvailableCountries")
+
+        assert result == sample_countries
+        assert stub_api.requests == []
+
+
+class TestRequestHedger:
+    """RequestHedgerクラスのテスト"""
+
+    def test_hedge_wins_when_primary_is_slow(self, stub_api):
+        """最初のリクエストが遅い場合にヘッジリクエストが使われるテスト"""
+        stub_api.responses = [(200, "slow", 0.5), (200, "fast", 0)]
+        hedger = RequestHedger(budget=1.0, default_delay=0.05)
+
+        response = hedger.get(f"{stub_api.url}/AvailableCountries", timeout=2)
+
+        assert response.json() == "fast"
+        metrics = hedger.metrics()
+        assert metrics["requests"] == 1
+        assert metrics["hedged"] == 1
+        assert metrics["hedge_wins"] == 1
+
+    def test_no_hedge_when_primary_is_fast(self, stub_api):
+        """最初のリクエストが速い場合はヘッジしないテスト"""
+        stub_api.responses = [(200, "fast", 0)]
+        hedger = RequestHedger(budget=1.0, default_delay=1.0)
+
+        response = hedger.get(f"{stub_api.url}/AvailableCountries", timeout=2)
+
+        assert response.json() == "fast"
+        assert hedger.metrics()["hedged"] == 0
+        assert len(stub_api.requests) == 1
+
+    def test_budget_limits_hedging(self, stub_api):
+        """予算を超える場合はヘッジしないテスト"""
+        stub_api.responses = [(200, "slow", 0.2)]
+        hedger = RequestHedger(budget=0, default_delay=0.01)
+
+        response = hedger.get(f"{stub_api.url}/AvailableCountries", timeout=2)
+
+        assert response.json() == "slow"
+        assert hedger.metrics()["hedged"] == 0
+        assert len(stub_api.requests) == 1
+
+    def test_rate_limit_blocks_hedging(self, stub_api):
+        """レート制限のトークンがない場合はヘッジしないテスト"""
+        stub_api.responses = [(200, "slow", 0.2)]
+        hedger = RequestHedger(budget=1.0, default_delay=0.01)
+        limiter = TokenBucket(1, 1, clock=lambda: 0.0)
+        limiter.acquire()
+
+        with patch.object(repository, "rate_limiter", limiter):
+            response = hedger.get(f"{stub_api.url}/AvailableCountries", timeout=2)
+
+        assert response.json() == "slow"
+        assert hedger.metrics()["hedged"] == 0
+        assert len(stub_api.requests) == 1
+
+    def test_hedge_delay_uses_percentile(self, stub_api):
+        """十分なレイテンシが集まるとパーセンタイル値を使うテスト"""
+        stub_api.responses = [(200, [], 0)]
+        hedger = RequestHedger(min_samples=5, default_delay=10)
+        assert hedger.hedge_delay() == 10
+
+        for _ in range(5):
+            hedger.get(f"{stub_api.url}/AvailableCountries", timeout=2)
+
+        assert hedger.hedge_delay() < 1
+
+    def test_fetch_json_uses_hedger_when_enabled(self, stub_api):
+        """ヘッジが有効な場合にfetch_jsonがヘッジリクエストを使うテスト"""
+        stub_api.responses = [(200, "slow", 0.5), (200, "fast", 0)]
+        hedger = RequestHedger(budget=1.0, default_delay=0.05)
+
+        with (
+            patch("repository.API_HEDGE_ENABLED", True),
+            patch.object(repository, "request_hedger", hedger),
+            patch("repository.API_TIMEOUT", (1, 2)),
+        ):
+            result = fetch_json("AvailableCountries")
+
+        assert result == "fast"
+        assert hedger.metrics()["hedge_wins"] == 1
+
+
+class TestConditionalRequests:
+    """ETag / Last-Modifiedによる条件付きリクエストのテスト"""
+
+    def test_revalidate_not_modified(self, stub_api, sample_countries):
+        """変更がない場合に304で NotModifiedError が送出されるテスト"""
+        stub_api.responses = [
+            (200, sample_countries, 0, {"ETag": '"v1"'}),
+            (304, None, 0, {"ETag": '"v1"'}),
+        ]
+
+        assert fetch_json("AvailableCountries") == sample_countries
+        with pytest.raises(NotModifiedError):
+            fetch_json("AvailableCountries", revalidate=True)
+
+        assert stub_api.request_headers[1]["If-None-Match"] == '"v1"'
+        assert repository.circuit_breaker.state == CircuitBreaker.CLOSED
+
+    def test_revalidate_modified(self, stub_api, sample_countries):
+        """変更がある場合は新しいJSONと検証用の値に更新されるテスト"""
+        last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+        stub_api.responses = [
+            (200, [], 0, {"Last-Modified": last_modified}),
+            (200, sample_countries, 0, {"ETag": '"v2"'}),
+        ]
+
+        fetch_json("AvailableCountries")
+        result = fetch_json("AvailableCountries", revalidate=True)
+
+        assert result == sample_countries
+        assert stub_api.request_headers[1]["If-Modified-Since"] == last_modified
+        assert repository.response_validators.conditional_headers(
+            "AvailableCountries"
+        ) == {"If-None-Match": '"v2"'}
+
+    def test_no_conditional_headers_without_revalidate(
+        self, stub_api, sample_countries
+    ):
+        """revalidateを指定しない場合は条件付きリクエストを送らないテスト"""
+        stub_api.responses = [(200, sample_countries, 0, {"ETag": '"v1"'})]
+
+        fetch_json("AvailableCountries")
+        fetch_json("AvailableCountries")
+
+        assert "If-None-Match" not in stub_api.request_headers[1]
+
+    def test_skip_storing_validators(self, stub_api, sample_countries):
+        """store_validatorsにFalseを指定すると検証用の値を保存しないテスト"""
+        stub_api.responses = [(200, sample_countries, 0, {"ETag": '"v1"'})]
+
+        result = fetch_json("AvailableCountries", store_validators=False)
+
+        assert result == sample_countries
+        assert (
+            repository.response_validators.conditional_headers("AvailableCountries")
+            == {}
+        )
+
+    def test_revalidate_without_validators(self, stub_api, sample_countries):
+        """検証用の値がない場合は通常のリクエストになるテスト"""
+        stub_api.responses = [(200, sample_countries, 0)]
+
+        result = fetch_json("AvailableCountries", revalidate=True)
+
+        assert result == sample_countries
+        assert "If-None-Match" not in stub_api.request_headers[0]
+
+
+class TestCircuitBreaker:
+    """CircuitBreakerクラスのテスト"""
+
+    def test_half_open_after_timeout(self):
+        """一定時間後に1回だけ試行を許可するテスト"""
+        now = [0.0]
+        breaker = CircuitBreaker(1, 10, clock=lambda: now[0])
+        breaker.record_failure()
+        assert breaker.allow_request() is False
+
+        now[0] = 10.0
+        assert breaker.allow_request() is True
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request() is False
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request() is True
+
+    def test_half_open_failure_reopens(self):
+        """試行が失敗すると再び開くテスト"""
+        now = [0.0]
+        breaker = CircuitBreaker(3, 10, clock=lambda: now[0])
+        for _ in range(3):
+            breaker.record_failure()
+
+        now[0] = 10.0
+        breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
+
+
+class TestTokenBucket:
+    """TokenBucketクラスのテスト"""
+
+    def test_waits_when_empty(self):
+        """トークンがない場合に補充を待つテスト"""
+        now = [0.0]
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(2, 2, clock=lambda: now[0], sleep=fake_sleep)
+
+        for _ in range(4):
+            bucket.acquire()
+
+        assert sum(sleeps) == pytest.approx(1.0)
+
+    def test_shared_across_threads(self):
+        """複数スレッドで取得してもバースト上限を超えないテスト"""
+        bucket = TokenBucket(1000, 5)
+        acquired = []
+
+        def worker():
+            bucket.acquire()
+            acquired.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(acquired) == 10
+
+    def test_try_acquire_does_not_wait(self):
+        """トークンがない場合は待たずにFalseを返すテスト"""
+        now = [0.0]
+        bucket = TokenBucket(1, 2, clock=lambda: now[0], sleep=pytest.fail)
+
+        assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
+
+        now[0] += 1.0
+        assert bucket.try_acquire()
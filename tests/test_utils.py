@@ -80,6 +80,32 @@ class TestUtils:
         assert holidays[1].local_name == "成人の日"
         assert holidays[1].country_code == "JP"
 
+    def test_convert_api_response_to_holidays_with_counties(self):
+        """州・県ごとの祝日の対象地域が変換されるテスト"""
+        api_response = [
+            {
+                "date": "2025-01-06",
+                "name": "Epiphany",
+                "localName": "Heilige Drei Könige",
+                "countryCode": "DE",
+                "global": False,
+                "counties": ["DE-BW", "DE-BY", "DE-ST"],
+            },
+            {
+                "date": "2025-01-01",
+                "name": "New Year's Day",
+                "localName": "Neujahr",
+                "countryCode": "DE",
+                "global": True,
+                "counties": None,
+            },
+        ]
+
+        result = convert_api_response_to_holidays(api_response)
+
+        assert result[0].counties == ("DE-BW", "DE-BY", "DE-ST")
+        assert result[1].counties is None
+
     def test_convert_api_response_to_holidays_empty_list(self):
         """空のAPIレスポンスの変換テスト"""
         api_response = []
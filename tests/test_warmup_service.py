@@ -0,0 +1,178 @@
+"""
+warmup_service.pyのテスト
+"""
+
+import subprocess
+import sys
+import threading
+import requests
+from datetime import datetime
+from unittest.mock import patch
+from models import Holiday
+from repository import TokenBucket
+from services.cache import api_cache
+from services.warmup_service import (
+    WarmupJob,
+    get_popular_keys,
+    get_quiz_years,
+)
+
+
+class TestWarmupHelpers:
+    """ウォームアップの対象を決める関数のテスト"""
+
+    def test_get_quiz_years(self):
+        """両方のクイズの年の範囲をまとめるテスト"""
+        assert get_quiz_years() == [2020, 2021, 2022, 2023, 2024, 2025]
+
+    @patch("services.favorite_service.load_favorites")
+    def test_get_popular_keys(self, mock_load):
+        """お気に入りの多い(国, 年)と、その国の今年を優先するテスト"""
+        # モックの設定
+        mock_load.return_value = [
+            Holiday("2024-07-04", "Independence Day", "Independence Day", "US"),
+            Holiday("2024-12-25", "Christmas Day", "Christmas Day", "US"),
+            Holiday("2025-01-01", "New Year's Day", "元日", "JP"),
+        ]
+        current_year = datetime.now().year
+
+        result = get_popular_keys(limit=3)
+
+        assert result == [("US", current_year), ("US", 2024), ("JP", current_year)]
+
+    @patch("services.favorite_service.load_favorites")
+    def test_get_popular_keys_error(self, mock_load):
+        """お気に入りが読めない場合は空のリストを返すテスト"""
+        # モックの設定
+        mock_load.side_effect = Exception("読み込み失敗")
+
+        assert get_popular_keys() == []
+
+
+class TestWarmupJob:
+    """WarmupJobクラスのテスト"""
+
+    def test_plan(self):
+        """よく検索される(国, 年)を先に、クイズの国・年を後に並べるテスト"""
+        job = WarmupJob(quiz_countries=None, popular_keys=lambda: [("US", 2030)])
+
+        keys = job.plan(["JP", "US"])
+
+        assert keys[0] == ("US", 2030)
+        assert len(keys) == 1 + 2 * len(get_quiz_years())
+
+    def test_plan_samples_quiz_countries(self):
+        """クイズの国数を制限し、利用できない国は除くテスト"""
+        job = WarmupJob(quiz_countries=2, popular_keys=lambda: [("XX", 2025)])
+
+        keys = job.plan(["JP", "US", "DE", "FR"])
+
+        assert len({country_code for country_code, _ in keys}) == 2
+        assert ("XX", 2025) not in keys
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    @patch("services.holiday_service.repository.get_available_countries")
+    def test_run(self, mock_get_countries, mock_repo_get, sample_countries, fake_clock):
+        """国一覧を取得してから祝日一覧を並行して取得するテスト"""
+        # モックの設定
+        mock_get_countries.return_value = sample_countries
+        fetched_in = set()
+
+        def fake_get(year, country_code):
+            fetched_in.add(threading.current_thread().name)
+            if country_code == "DE":
+                raise requests.ConnectionError("API Error")
+            return []
+
+        mock_repo_get.side_effect = fake_get
+        api_cache.set("PublicHolidays/2020/JP", ())
+        job = WarmupJob(quiz_countries=None, popular_keys=lambda: [], clock=fake_clock)
+
+        assert job.start()
+        assert not job.start()  # 2回目は開始しない
+        job.wait(5)
+        metrics = job.metrics()
+
+        years = len(get_quiz_years())
+        assert metrics["state"] == WarmupJob.DONE
+        assert metrics["total"] == 3 * years
+        assert metrics["skipped"] == 1
+        assert metrics["completed"] == 2 * years
+        assert metrics["failed"] == years
+        assert metrics["progress"] == 1.0
+        assert api_cache.contains("PublicHolidays/2025/US")
+        assert all(name.startswith("cache-warmup") for name in fetched_in)
+
+    @patch("services.holiday_service.repository.get_public_holidays")
+    @patch("services.holiday_service.repository.get_available_countries")
+    def test_budget_paces_fetches(
+        self, mock_get_countries, mock_repo_get, sample_countries, fake_clock
+    ):
+        """ウォームアップ専用の予算を超える分はトークンを待って全て取得するテスト"""
+        # モックの設定
+        mock_get_countries.return_value = sample_countries
+        mock_repo_get.return_value = []
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            fake_clock.now += seconds
+
+        budget = TokenBucket(1, 2, clock=fake_clock, sleep=fake_sleep)
+        job = WarmupJob(
+            quiz_countries=None, popular_keys=lambda: [], max_workers=1, budget=budget
+        )
+
+        job.start()
+        job.wait(5)
+        metrics = job.metrics()
+
+        years = len(get_quiz_years())
+        assert mock_repo_get.call_count == 3 * years
+        assert metrics["completed"] == 3 * years
+        assert metrics["progress"] == 1.0
+        assert sleeps  # 予算が足りない間は待つ
+        assert fake_clock.now == 3 * years - 2
+
+    @patch("services.holiday_service.repository.get_available_countries")
+    def test_countries_error(self, mock_get_countries):
+        """国一覧の取得に失敗した場合のテスト"""
+        # モックの設定
+        mock_get_countries.side_effect = requests.ConnectionError("API Error")
+        job = WarmupJob(popular_keys=lambda: [])
+
+        job.start()
+        job.wait(5)
+
+        metrics = job.metrics()
+        assert metrics["state"] == WarmupJob.FAILED
+        assert metrics["error"] == "API Error"
+
+    def test_duration(self, fake_clock):
+        """所要時間の計測テスト"""
+        job = WarmupJob(clock=fake_clock)
+        assert job.metrics()["duration"] == 0.0
+
+        with patch.object(job, "_run"):
+            job.start()
+        fake_clock.now = 2.5
+
+        assert job.metrics()["duration"] == 2.5
+        assert job.metrics()["state"] == WarmupJob.LOADING_COUNTRIES
+
+
+class TestLazyImport:
+    """起動時に重いモジュールを読み込まないことのテスト"""
+
+    def test_does_not_import_requests(self):
+        """ウォームアップの開始前にrequestsとAPIのサービスを読み込まないテスト"""
+        code = (
+            "import sys, services.warmup_service; "
+            "print(sorted({'requests', 'repository', 'services.holiday_service'}"
+            " & set(sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "[]"
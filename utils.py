@@ -1,9 +1,11 @@
-import pandas as pd
-from typing import List
-from models import Holiday
+from typing import TYPE_CHECKING, List
+from models import Holiday, LongWeekend
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def create_holiday_from_row(row: pd.Series) -> Holiday:
+
+def create_holiday_from_row(row: "pd.Series") -> Holiday:
     """
     データフレームの行からHolidayオブジェクトを作成する
 
@@ -38,6 +40,33 @@ def convert_api_response_to_holidays(api_response: List[dict]) -> List[Holiday]:
             name=holiday_data["name"],
             local_name=holiday_data["localName"],
             country_code=holiday_data["countryCode"],
+            counties=tuple(holiday_data["counties"])
+            if holiday_data.get("counties")
+            else None,
         )
         holidays.append(holiday)
     return holidays
+
+
+def convert_api_response_to_long_weekends(
+    api_response: List[dict],
+) -> List[LongWeekend]:
+    """
+    LongWeekend APIのレスポンスをLongWeekendオブジェクトのリストに変換する
+
+    Args:
+        api_response: APIからのレスポンス（辞書のリスト）
+
+    Returns:
+        List[LongWeekend]: LongWeekendオブジェクトのリスト
+    """
+    return [
+        LongWeekend(
+            start_date=data["startDate"],
+            end_date=data["endDate"],
+            day_count=data["dayCount"],
+            need_bridge_day=data["needBridgeDay"],
+            bridge_days=tuple(data.get("bridgeDays") or ()),
+        )
+        for data in api_response
+    ]